@@ -2,23 +2,27 @@
 Backtest Router - Strategy backtesting endpoints
 """
 from fastapi import APIRouter
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional, Union
 
 from ..services.backtest_service import (
     run_backtest,
     get_default_params,
     get_available_strategies
 )
+from ..services.sweep_service import run_parameter_sweep
+from ..services.universe_backtest_service import run_universe_backtest
+from ..services.walkforward_service import run_walk_forward
+from ..config import (
+    WALK_FORWARD_TRAIN_BARS, WALK_FORWARD_TEST_BARS,
+    BACKTEST_EQUITY_POINTS, BACKTEST_TRADES_PAGE
+)
+from ..utils.async_utils import run_blocking
 
 router = APIRouter(prefix="/api", tags=["backtest"])
 
 
-class BacktestRequest(BaseModel):
-    symbol: str
-    period: str = "1y"
-    strategy: str = "rsi_sma"
-    initial_capital: float = 100000
+class StrategyParams(BaseModel):
     # RSI+SMA params
     rsi_oversold: int = 30
     rsi_overbought: int = 70
@@ -33,34 +37,148 @@ class BacktestRequest(BaseModel):
     ma_fast: int = 10
     ma_slow: int = 50
 
+    def strategy_params(self) -> dict:
+        return {name: getattr(self, name) for name in get_default_params()}
+
+
+class BacktestRequest(StrategyParams):
+    symbol: str
+    period: str = "1y"
+    strategy: str = "rsi_sma"
+    initial_capital: float = 100000
+    points: int = BACKTEST_EQUITY_POINTS          # equity curve points (0 = every bar)
+    trades_offset: Optional[int] = None           # first trade of the page (default: last page)
+    trades_limit: int = BACKTEST_TRADES_PAGE
+
+
+class UniverseBacktestRequest(StrategyParams):
+    period: str = "1y"
+    strategy: str = "rsi_sma"
+    initial_capital: float = 100000
+    halal_only: bool = False
+    position_size: Optional[float] = None  # max fraction of equity per position
+    points: int = BACKTEST_EQUITY_POINTS   # equity curve points (0 = every bar)
+
+
+class ParamRange(BaseModel):
+    start: float = Field(ge=0, le=1000)
+    stop: float = Field(ge=0, le=1000)
+    step: float = Field(1, gt=0, le=1000)
+
+
+class BacktestSweepRequest(BaseModel):
+    symbol: str
+    period: str = "1y"
+    strategy: str = "rsi_sma"
+    initial_capital: float = 100000
+    # Param name -> explicit values or an inclusive range, e.g.
+    # {"rsi_oversold": {"start": 20, "stop": 40, "step": 5}, "rsi_overbought": [65, 70, 75]}
+    ranges: Dict[str, Union[ParamRange, List[float]]]
+    rank_by: str = "totalReturn"
+    top: int = 50
+    heatmap_x: Optional[str] = None
+    heatmap_y: Optional[str] = None
+
+
+class WalkForwardRequest(BaseModel):
+    symbol: Optional[str] = None  # None = whole active stock list
+    period: str = "5y"
+    strategy: str = "rsi_sma"
+    initial_capital: float = 100000
+    ranges: Optional[Dict[str, Union[ParamRange, List[float]]]] = None
+    train_bars: int = WALK_FORWARD_TRAIN_BARS
+    test_bars: int = WALK_FORWARD_TEST_BARS
+    rank_by: str = "totalReturn"
+    halal_only: bool = False
+
+
+def _ranges(ranges: Optional[dict]) -> Optional[dict]:
+    if ranges is None:
+        return None
+    return {
+        name: spec.model_dump() if isinstance(spec, ParamRange) else spec
+        for name, spec in ranges.items()
+    }
+
 
 @router.post("/backtest")
 def backtest_strategy(request: BacktestRequest):
     """Run a backtest for a specific stock with selected strategy"""
-    params = {
-        "rsi_oversold": request.rsi_oversold,
-        "rsi_overbought": request.rsi_overbought,
-        "macd_fast": request.macd_fast,
-        "macd_slow": request.macd_slow,
-        "macd_signal": request.macd_signal,
-        "bb_period": request.bb_period,
-        "bb_std": request.bb_std,
-        "ma_fast": request.ma_fast,
-        "ma_slow": request.ma_slow
-    }
     return run_backtest(
         request.symbol,
         request.period,
         request.strategy,
         request.initial_capital,
-        params
+        request.strategy_params(),
+        request.points,
+        request.trades_offset,
+        request.trades_limit
+    )
+
+
+@router.post("/backtest/universe")
+async def backtest_universe(request: UniverseBacktestRequest):
+    """Run a strategy across the active stock list with shared capital"""
+    return await run_blocking(
+        run_universe_backtest,
+        request.period,
+        request.strategy,
+        request.initial_capital,
+        request.strategy_params(),
+        request.halal_only,
+        request.position_size,
+        request.points
+    )
+
+
+@router.post("/backtest/sweep")
+async def sweep_strategy(request: BacktestSweepRequest):
+    """Backtest a grid of parameters on one history; returns a ranked table and heatmap"""
+    return await run_blocking(
+        run_parameter_sweep,
+        request.symbol,
+        request.period,
+        request.strategy,
+        request.initial_capital,
+        _ranges(request.ranges),
+        request.rank_by,
+        request.top,
+        request.heatmap_x,
+        request.heatmap_y
+    )
+
+
+@router.post("/backtest/walkforward")
+async def walk_forward(request: WalkForwardRequest):
+    """Optimise on rolling train windows and score each following test window"""
+    return await run_blocking(
+        run_walk_forward,
+        request.symbol,
+        request.period,
+        request.strategy,
+        request.initial_capital,
+        _ranges(request.ranges),
+        request.train_bars,
+        request.test_bars,
+        request.rank_by,
+        request.halal_only
     )
 
 
 @router.get("/backtest/{symbol}")
-def quick_backtest(symbol: str, period: str = "1y", strategy: str = "rsi_sma"):
+def quick_backtest(
+    symbol: str,
+    period: str = "1y",
+    strategy: str = "rsi_sma",
+    points: int = BACKTEST_EQUITY_POINTS,
+    trades_offset: Optional[int] = None,
+    trades_limit: int = BACKTEST_TRADES_PAGE
+):
     """Quick backtest with default parameters"""
-    return run_backtest(symbol, period, strategy, 100000, get_default_params())
+    return run_backtest(
+        symbol, period, strategy, 100000, get_default_params(),
+        points, trades_offset, trades_limit
+    )
 
 
 @router.get("/strategies")
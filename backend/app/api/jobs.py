@@ -0,0 +1,215 @@
+"""
+Jobs Router - Submit long-running scans and analytics, then poll or stream
+their progress and fetch partial or final results
+"""
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from ..config import JOB_EVENT_INTERVAL, JOB_EVENT_KEEPALIVE
+from ..services import job_service
+from ..services.background_tasks import scan_and_publish
+from ..services.stock_service import get_universe_key
+from ..services.sweep_service import run_parameter_sweep
+from ..services.universe_backtest_service import run_universe_backtest
+from ..services.walkforward_service import run_walk_forward
+from ..utils.serialization import dumps
+from .backtest import BacktestSweepRequest, UniverseBacktestRequest, WalkForwardRequest, _ranges
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def _job_or_404(job_id: str) -> job_service.Job:
+    job = job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+def _scan_job() -> dict:
+    snapshot = scan_and_publish()
+    return {
+        "success": True,
+        "version": snapshot.version,
+        "generatedAt": snapshot.generated_at,
+        "count": len(snapshot.results),
+        "results": list(snapshot.results),
+    }
+
+
+def _sse(event: str, data, event_id: Optional[int] = None) -> bytes:
+    """One server-sent event with a JSON data line"""
+    head = f"event: {event}\n" + (f"id: {event_id}\n" if event_id is not None else "")
+    return head.encode() + b"data: " + dumps(data) + b"\n\n"
+
+
+async def _job_events(job: job_service.Job, offset: int):
+    """
+    rows events carry partial results past `offset` (the event id is the new
+    offset, so a reconnecting EventSource resumes where it left off),
+    progress events follow status changes, and end carries the final status.
+    """
+    last_progress = None
+    last_sent = time.monotonic()
+    while True:
+        # Read before draining rows, so rows added just before finishing are sent
+        finished = job.status in job_service.FINISHED
+        sent = False
+        if offset < len(job.partial):
+            rows = job.partial[offset:]
+            yield _sse("rows", {"offset": offset, "rows": rows}, offset + len(rows))
+            offset += len(rows)
+            sent = True
+
+        if finished:
+            yield _sse("end", job.to_dict())
+            return
+
+        progress = (job.status, job.tasks_done, job.tasks_total)
+        if progress != last_progress:
+            yield _sse("progress", job.to_dict())
+            last_progress, sent = progress, True
+
+        now = time.monotonic()
+        if sent:
+            last_sent = now
+        elif now - last_sent >= JOB_EVENT_KEEPALIVE:
+            # Comment line: keeps proxies from closing an idle stream
+            yield b": keepalive\n\n"
+            last_sent = now
+        await asyncio.sleep(JOB_EVENT_INTERVAL)
+
+
+@router.post("/scan", status_code=status.HTTP_202_ACCEPTED)
+def submit_scan():
+    """
+    Queue a full rescan of the active list, published as the scan snapshot
+    when done. Rows arrive on /api/jobs/{id}/events as chunks complete.
+    Joins a scan job already queued or running, and shares a scheduled or
+    /api/scan scan in progress rather than starting a second provider scan
+    (the job then reports no partial rows, only the result).
+    """
+    job = job_service.find_active_job("scan") or job_service.submit_job(
+        "scan", _scan_job, params={"universe": get_universe_key()}
+    )
+    return job.to_dict()
+
+
+@router.post("/backtest/sweep", status_code=status.HTTP_202_ACCEPTED)
+def submit_sweep(request: BacktestSweepRequest):
+    """Queue a parameter sweep; poll /api/jobs/{id} for progress"""
+    job = job_service.submit_job(
+        "sweep",
+        run_parameter_sweep,
+        request.symbol,
+        request.period,
+        request.strategy,
+        request.initial_capital,
+        _ranges(request.ranges),
+        request.rank_by,
+        request.top,
+        request.heatmap_x,
+        request.heatmap_y,
+        params=request.model_dump()
+    )
+    return job.to_dict()
+
+
+@router.post("/backtest/universe", status_code=status.HTTP_202_ACCEPTED)
+def submit_universe(request: UniverseBacktestRequest):
+    """Queue a universe backtest"""
+    job = job_service.submit_job(
+        "universe",
+        run_universe_backtest,
+        request.period,
+        request.strategy,
+        request.initial_capital,
+        request.strategy_params(),
+        request.halal_only,
+        request.position_size,
+        request.points,
+        params=request.model_dump()
+    )
+    return job.to_dict()
+
+
+@router.post("/backtest/walkforward", status_code=status.HTTP_202_ACCEPTED)
+def submit_walk_forward(request: WalkForwardRequest):
+    """Queue a walk-forward validation"""
+    job = job_service.submit_job(
+        "walkforward",
+        run_walk_forward,
+        request.symbol,
+        request.period,
+        request.strategy,
+        request.initial_capital,
+        _ranges(request.ranges),
+        request.train_bars,
+        request.test_bars,
+        request.rank_by,
+        request.halal_only,
+        params=request.model_dump()
+    )
+    return job.to_dict()
+
+
+@router.get("")
+def list_jobs():
+    """Recent jobs, newest first"""
+    return {"jobs": job_service.list_jobs()}
+
+
+@router.get("/stats")
+def job_stats():
+    """Job counts, pool queue depth and worker utilisation"""
+    return job_service.get_job_stats()
+
+
+@router.get("/{job_id}")
+def job_status(job_id: str):
+    """Status and progress of a job"""
+    return _job_or_404(job_id).to_dict()
+
+
+@router.get("/{job_id}/partial")
+def job_partial(job_id: str, offset: int = Query(0, ge=0), limit: Optional[int] = Query(None, ge=1)):
+    """Results reported so far (scan rows as chunks complete), from `offset`"""
+    job = _job_or_404(job_id)
+    end = offset + limit if limit else None
+    return {**job.to_dict(), "offset": offset, "results": job.partial[offset:end]}
+
+
+@router.get("/{job_id}/events")
+def job_events(job_id: str, request: Request, offset: int = Query(0, ge=0)):
+    """
+    Server-sent events with progress (symbols done, ETA) and partial rows
+    until the job finishes. Honours Last-Event-ID on reconnect.
+    """
+    job = _job_or_404(job_id)
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        offset = int(last_event_id)
+    return StreamingResponse(
+        _job_events(job, offset),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/{job_id}/result")
+def job_result(job_id: str):
+    """Result of a finished job; 409 while it is still queued or running"""
+    job = _job_or_404(job_id)
+    if job.status not in job_service.FINISHED:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+    return {**job.to_dict(), "result": job.result}
+
+
+@router.delete("/{job_id}")
+def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    _job_or_404(job_id)
+    return job_service.cancel_job(job_id).to_dict()
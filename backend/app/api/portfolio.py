@@ -1,5 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
+from collections import ChainMap
 from typing import List, Optional
 from datetime import datetime
 from sqlmodel import Session
@@ -37,19 +38,17 @@ async def analyze_portfolio_route(session: Session = Depends(get_session)):
     
     # Identify symbols missing from our live price cache
     missing = [s for s in portfolio_symbols if s not in live_prices]
+    fetched = {}
     if missing:
         try:
             formatted_missing = [s if s.endswith('.NS') else f"{s}.NS" for s in missing]
-            await fetch_live_prices(formatted_missing)
+            fetched = await fetch_live_prices(formatted_missing)
         except Exception as e:
             print(f"Error fetching missing portfolio prices: {e}")
             
-    # Combine live_prices with scan results
+    # Prices fetched just now, then live prices (read in place), then scan results
     stocks = get_all_stocks()
-    price_map = live_prices.copy()
-    for s in stocks:
-        if s["symbol"] not in price_map:
-            price_map[s["symbol"]] = s["price"]
+    price_map = ChainMap(fetched, live_prices, {s["symbol"]: s["price"] for s in stocks})
             
     current_portfolio = portfolio_service.get_portfolio(price_map, session)
     
@@ -67,21 +66,19 @@ async def get_portfolio(session: Session = Depends(get_session)):
     
     # Identify symbols missing from our live price cache
     missing = [s for s in portfolio_symbols if s not in live_prices]
+    fetched = {}
     if missing:
         # Fetch prices for missing symbols explicitly
         # Note: fetch_live_prices expects symbols with .NS suffix or handles it
         try:
             formatted_missing = [s if s.endswith('.NS') else f"{s}.NS" for s in missing]
-            await fetch_live_prices(formatted_missing)
+            fetched = await fetch_live_prices(formatted_missing)
         except Exception as e:
             print(f"Error fetching missing portfolio prices: {e}")
             
-    # Combine live_prices with scan results
+    # Prices fetched just now, then live prices (read in place), then scan results
     stocks = get_all_stocks()
-    price_map = live_prices.copy()
-    for s in stocks:
-        if s["symbol"] not in price_map:
-            price_map[s["symbol"]] = s["price"]
+    price_map = ChainMap(fetched, live_prices, {s["symbol"]: s["price"] for s in stocks})
     
     return portfolio_service.get_portfolio(price_map, session)
 
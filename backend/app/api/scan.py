@@ -1,18 +1,23 @@
 """
 Scan Router - Stock scanning endpoints
 """
-from fastapi import APIRouter, Request, HTTPException, status
+from fastapi import APIRouter, Request, Response, HTTPException, status
 
-from ..services.stock_service import scan_stocks, cached_stock_data
+from ..services.stock_service import cached_stock_data, get_universe_key
+from ..services.scan_snapshot import get_snapshot
+from ..services.background_tasks import run_scan_and_publish
 from ..middleware import scan_rate_limiter
+from ..utils.serialization import payload_response
 
 router = APIRouter(prefix="/api", tags=["scan"])
 
 
 @router.get("/scan")
-def scan_market(request: Request):
+async def scan_market(request: Request):
     """
     Scan all stocks in active list for trading signals.
+    Served from the latest background scan snapshot; supports
+    If-None-Match for 304 responses.
     Rate limited to 30 requests per minute per IP.
     """
     # Check specific rate limit for scan endpoint
@@ -28,8 +33,22 @@ def scan_market(request: Request):
             headers={"Retry-After": str(retry_after)}
         )
     
-    results = scan_stocks()
-    return results
+    # The scheduler keeps the snapshot fresh; only scan inline before the
+    # first snapshot exists or after the active stock list changed
+    snapshot = get_snapshot()
+    if snapshot is None or snapshot.universe != get_universe_key():
+        snapshot = await run_scan_and_publish()
+    
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "no-cache",
+        "X-Scan-Version": str(snapshot.version),
+        "X-Scan-Generated-At": snapshot.generated_at
+    }
+    if request.headers.get("if-none-match") == snapshot.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    return payload_response(request, snapshot.payload, headers)
 
 
 @router.get("/stock/{symbol}")
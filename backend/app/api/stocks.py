@@ -2,19 +2,20 @@
 Stocks Router - Stock list management endpoints
 """
 import pandas as pd
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, Request, Query
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from ..services.stock_service import (
     get_stock_list_info,
     set_stock_list,
     reset_stock_list,
-    get_stock_history,
+    get_stock_history_payload,
     stock_metadata,
     active_stock_list
 )
 from ..config import DEFAULT_STOCKS
+from ..utils.serialization import payload_response
 
 router = APIRouter(prefix="/api/stocks", tags=["stocks"])
 
@@ -30,12 +31,23 @@ def get_stock_list():
     return get_stock_list_info()
 
 @router.get("/history/{symbol}")
-def get_stock_history_endpoint(symbol: str, period: str = "1y"):
-    """Get historical OHLC data for a stock"""
-    data = get_stock_history(symbol, period)
-    if not data:
+def get_stock_history_endpoint(
+    request: Request,
+    symbol: str,
+    period: str = "1y",
+    format: Literal["rows", "columnar"] = "rows",
+    points: Optional[int] = Query(None, ge=1)
+):
+    """
+    Get historical OHLC data for a stock (served from pre-encoded cache).
+    format=columnar returns parallel arrays with a base timestamp and step
+    instead of one object per bar. points caps the bar count by merging
+    consecutive bars into candles.
+    """
+    payload = get_stock_history_payload(symbol, period, format, points)
+    if payload is None:
         return {"error": "Data not found"}
-    return data
+    return payload_response(request, payload)
 
 
 @router.post("/upload")
@@ -11,6 +11,13 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / "data"
 CSV_FILE = DATA_DIR / "nse_stocks.csv"
 
+# ====================================================================
+# OHLCV STORE SETTINGS
+# ====================================================================
+OHLCV_STORE_ENABLED = os.getenv("OHLCV_STORE_ENABLED", "true").lower() == "true"
+OHLCV_STORE_DIR = Path(os.getenv("OHLCV_STORE_DIR", str(DATA_DIR / "ohlcv")))
+OHLCV_REFRESH_SECONDS = 300  # min seconds between delta requests per symbol
+
 # ====================================================================
 # API SETTINGS
 # ====================================================================
@@ -28,6 +35,12 @@ CORS_ORIGINS = [
     "https://trading-bot-002.vercel.app",
 ] + [origin.strip() for origin in _extra_origins if origin.strip()]
 
+# ====================================================================
+# RESPONSE ENCODING
+# ====================================================================
+GZIP_MIN_SIZE = 1000   # bytes; smaller bodies are sent uncompressed
+GZIP_LEVEL = 6         # level for pre-compressed cached payloads
+
 # ====================================================================
 # SECURITY SETTINGS
 # ====================================================================
@@ -38,8 +51,91 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # ====================================================================
 # WEBSOCKET SETTINGS
 # ====================================================================
-WS_UPDATE_INTERVAL = 30  # seconds between price updates
+WS_UPDATE_INTERVAL = 30  # seconds between price updates of symbols nobody watches (market open)
 WS_BATCH_SIZE = 25       # stocks per batch to avoid rate limiting
+WS_CLIENT_QUEUE_SIZE = 32  # messages queued per client before the oldest is dropped
+WS_SEND_TIMEOUT = 10       # seconds a send may take before the client is disconnected
+
+# ====================================================================
+# PRICE BUS (live prices shared between workers)
+# ====================================================================
+PRICE_BUS = os.getenv("PRICE_BUS", "local").lower()  # local (one process) or unix (workers on one host)
+PRICE_BUS_PATH = os.getenv("PRICE_BUS_PATH", str(DATA_DIR / "price_bus.sock"))
+PRICE_BUS_RETRY = 2.0          # seconds between reconnect/election attempts of a follower
+PRICE_BUS_MAX_BUFFER = 1 << 20  # bytes buffered for a follower before it is dropped
+# Live price table in shared memory, written by the producer and read by every worker
+PRICE_TABLE_SHARED = os.getenv("PRICE_TABLE_SHARED", str(PRICE_BUS == "unix")).lower() == "true"
+PRICE_TABLE_NAME = os.getenv("PRICE_TABLE_NAME", "halaltrade_prices")
+PRICE_TABLE_SLOTS = 4096       # symbols the table can hold
+
+# ====================================================================
+# PRICE POLLING
+# ====================================================================
+# Seconds between polls of a symbol by market status: "hot" symbols are
+# watchlisted, alerted on or subscribed to over the websocket, "cold" the
+# rest of the active list
+PRICE_POLL_INTERVALS = {
+    "open": {"hot": int(os.getenv("PRICE_POLL_HOT_INTERVAL", "5")), "cold": WS_UPDATE_INTERVAL},
+    "pre-market": {"hot": 60, "cold": 600},
+    "closed": {"hot": 3600, "cold": 6 * 3600},
+}
+PRICE_POLL_MIN_SLEEP = 1.0     # shortest pause between scheduler ticks
+PRICE_POLL_HOT_REFRESH = 60    # seconds between reloads of watchlist and alert symbols
+
+# ====================================================================
+# SCAN ENGINE SETTINGS
+# ====================================================================
+SCAN_CONCURRENCY = int(os.getenv("SCAN_CONCURRENCY", "8"))                # parallel history fetches
+SCAN_SYMBOL_TIMEOUT = float(os.getenv("SCAN_SYMBOL_TIMEOUT", "20"))       # seconds per symbol
+SCAN_BATCH_TIMEOUT = float(os.getenv("SCAN_BATCH_TIMEOUT", "60"))         # seconds per grouped download
+SCAN_MAX_HUNG = int(os.getenv("SCAN_MAX_HUNG", "4"))                       # timed out tasks a run tolerates before giving up the rest
+HISTORY_BATCH_SIZE = 50                                                   # symbols per grouped history download
+BLOCKING_POOL_SIZE = int(os.getenv("BLOCKING_POOL_SIZE", "16"))          # threads for blocking provider/LLM calls
+
+# Background rescan cadence by market status (seconds)
+SCAN_INTERVALS = {
+    "open": int(os.getenv("SCAN_INTERVAL_OPEN", "120")),
+    "pre-market": 600,
+    "closed": 3600,
+}
+
+# Provider request budgets (requests per second, burst size)
+PROVIDER_RATE_LIMITS = {
+    "yfinance": (5.0, 10),
+    "kite": (3.0, 3),
+    "mock": (1000.0, 1000),
+}
+
+# ====================================================================
+# BACKTEST SWEEP SETTINGS
+# ====================================================================
+COMPUTE_POOL_SIZE = int(os.getenv("COMPUTE_POOL_SIZE", str(os.cpu_count() or 2)))  # worker processes
+SWEEP_MAX_COMBINATIONS = 5000   # largest parameter grid accepted per sweep
+SWEEP_INLINE_MAX = 64           # grids this small skip the process pool
+UNIVERSE_INLINE_MAX = 20        # universe backtests this small skip the process pool
+WALK_FORWARD_TRAIN_BARS = 252   # ~1 trading year to optimise on
+WALK_FORWARD_TEST_BARS = 63     # ~1 quarter scored out of sample
+BACKTEST_CACHE_MAX_BYTES = int(os.getenv("BACKTEST_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # encoded results kept
+BACKTEST_EQUITY_POINTS = 100   # equity curve points returned by default (0 = full resolution)
+BACKTEST_TRADES_PAGE = 20       # trades returned per page
+
+# ====================================================================
+# BACKGROUND JOBS
+# ====================================================================
+JOB_MAX_CONCURRENT = int(os.getenv("JOB_MAX_CONCURRENT", "2"))  # jobs driving the compute pool at once
+JOB_RESULT_TTL = 900            # seconds a finished job's result is kept
+JOB_MAX_RETAINED = 100          # finished jobs kept at most
+SCAN_POOL_MIN_SYMBOLS = 40      # scan chunks this large compute indicators in the pool
+JOB_EVENT_INTERVAL = 0.5        # seconds between job progress checks on an event stream
+JOB_EVENT_KEEPALIVE = 15        # seconds of silence before an event stream sends a keepalive
+
+# ====================================================================
+# PERFORMANCE METRICS
+# ====================================================================
+TRADING_DAYS_PER_YEAR = 252
+RISK_FREE_RATE = float(os.getenv("RISK_FREE_RATE", "0.0"))  # annual, e.g. 0.065 for 6.5%
+ROLLING_RETURN_WINDOWS = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252}  # label -> bars
+BENCHMARK_SYMBOL = "^NSEI"      # market index for portfolio beta
 
 # ====================================================================
 # SHARIAH COMPLIANCE THRESHOLDS
@@ -14,10 +14,11 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from .core.config import API_HOST, API_PORT, CORS_ORIGINS
+from .core.config import API_HOST, API_PORT, CORS_ORIGINS, GZIP_MIN_SIZE
 from .services.stock_service import load_csv_stocks
-from .api import scan, stocks, backtest, telegram, portfolio, alerts, news, ai, watchlist, dashboard, market, ipo, analytics, auth
+from .api import scan, stocks, backtest, telegram, portfolio, alerts, news, ai, watchlist, dashboard, market, ipo, analytics, auth, jobs
 from .core.database import create_db_and_tables
+from .utils.async_utils import loop_lag_monitor
 
 # Configure logging
 logging.basicConfig(
@@ -42,7 +43,11 @@ from .services.websocket_manager import manager
 # ====================================================================
 # BACKGROUND PRICE UPDATER
 # ====================================================================
-from .services.background_tasks import price_updater
+from .services.background_tasks import price_updater, scan_scheduler
+from .services.compute_pool import shutdown_compute_pool
+from .services.job_service import shutdown_jobs
+from .services.price_bus import price_bus
+from .services.price_scheduler import poll_scheduler
 
 
 # ====================================================================
@@ -58,6 +63,8 @@ async def lifespan(app: FastAPI):
         create_db_and_tables()
         load_csv_stocks()
         updater_task = asyncio.create_task(price_updater())
+        lag_task = asyncio.create_task(loop_lag_monitor.run())
+        scan_task = asyncio.create_task(scan_scheduler())
         
         print(f"✅ Server ready at http://{API_HOST}:{API_PORT}")
         print("=" * 60)
@@ -71,6 +78,12 @@ async def lifespan(app: FastAPI):
     finally:
         if 'updater_task' in locals() and not updater_task.done():
             updater_task.cancel()
+        if 'lag_task' in locals() and not lag_task.done():
+            lag_task.cancel()
+        if 'scan_task' in locals() and not scan_task.done():
+            scan_task.cancel()
+        shutdown_jobs()
+        shutdown_compute_pool()
         
     print("\n👋 HalalTrade Pro API Shutting down...")
 
@@ -99,7 +112,7 @@ app.add_middleware(
 )
 
 # GZip Compression
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)
 
 # Simple Request Logging (replaces 121-line performance_service.py)
 @app.middleware("http")
@@ -129,6 +142,7 @@ app.include_router(dashboard.router)
 app.include_router(market.router)
 app.include_router(ipo.router)
 app.include_router(analytics.router)
+app.include_router(jobs.router)
 
 
 # ====================================================================
@@ -153,7 +167,11 @@ def health_check():
         "timestamp": datetime.utcnow().isoformat(),
         "version": "2.1.0",
         "uptime_seconds": int(time.time() - start_time),
-        "websocket_connections": len(manager.active_connections)
+        "websocket_connections": len(manager.active_connections),
+        "websocket": manager.stats(),
+        "price_bus": price_bus.stats(),
+        "price_polling": poll_scheduler.stats(),
+        "event_loop_lag": loop_lag_monitor.stats()
     }
 
 
@@ -165,7 +183,8 @@ async def websocket_prices(websocket: WebSocket):
     await manager.connect(websocket)
     try:
         while True:
-            await websocket.receive_text()
+            # Subscription messages: {"action": "subscribe", "symbols": [...]}
+            await manager.handle_message(websocket, await websocket.receive_text())
     except WebSocketDisconnect:
         manager.disconnect(websocket)
     except Exception:
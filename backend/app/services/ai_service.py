@@ -3,11 +3,12 @@ import logging
 import random
 from typing import Dict
 from .stock_service import cached_stock_data, get_full_stock_data
-import yfinance as yf
 import google.generativeai as genai
 from dotenv import load_dotenv
 import json
 from ..utils.cache import ai_cache
+from ..utils.async_utils import run_blocking
+from ..utils.singleflight import AsyncSingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,8 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 
+_analysis_flight = AsyncSingleFlight()
+
 async def analyze_stock(symbol: str) -> Dict:
     """
     Generate an AI-style analysis of the stock.
@@ -31,12 +34,18 @@ async def analyze_stock(symbol: str) -> Dict:
         logger.debug(f"AI analysis cache hit for {symbol}")
         return cached_result
     
+    # Concurrent misses for the same symbol share one analysis
+    return await _analysis_flight.do(cache_key, _run_analysis, symbol, cache_key)
+
+
+async def _run_analysis(symbol: str, cache_key: str) -> Dict:
+    """Fetch data and generate the analysis (cache miss path)"""
     # 1. Get Data
     stock = cached_stock_data.get(symbol)
     if not stock:
         try:
-            ticker = yf.Ticker(symbol if symbol.endswith('.NS') else f"{symbol}.NS")
-            stock = get_full_stock_data(symbol, ticker)
+            ticker_symbol = symbol if symbol.endswith('.NS') else f"{symbol}.NS"
+            stock = await run_blocking(get_full_stock_data, ticker_symbol)
         except:
             pass
     
@@ -114,7 +123,7 @@ async def generate_gemini_analysis(stock: Dict, symbol: str) -> Dict:
     """
 
     model = genai.GenerativeModel('gemini-pro')
-    response = model.generate_content(prompt)
+    response = await model.generate_content_async(prompt)
     
     try:
         text = response.text.replace('```json', '').replace('```', '')
@@ -187,7 +196,7 @@ async def _generate_gemini_portfolio_analysis(portfolio: Dict) -> Dict:
     """
     
     model = genai.GenerativeModel('gemini-pro')
-    response = model.generate_content(prompt)
+    response = await model.generate_content_async(prompt)
     
     text = response.text.replace('```json', '').replace('```', '')
     return json.loads(text)
@@ -1,9 +1,16 @@
+import logging
 from typing import List, Dict
 from sqlmodel import Session, select
 from ..models import Transaction
+from ..config import BENCHMARK_SYMBOL
+from ..utils.metrics import performance_metrics, simple_returns, beta
+from .data_provider.base import panel_symbol
+from .data_provider.factory import current_provider
 import pandas as pd
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 def calculate_trade_performance(session: Session) -> Dict:
     """
     Calculate performance metrics from transaction history.
@@ -86,17 +93,101 @@ def calculate_trade_performance(session: Session) -> Dict:
         "recentTrades": closed_trades[-10:] # Last 10 trades
     }
 
+def _history_period(first_date: pd.Timestamp) -> str:
+    """Smallest provider period that reaches back to first_date"""
+    days = (pd.Timestamp.now() - first_date).days
+    for period, span in [("1mo", 30), ("3mo", 91), ("6mo", 182), ("1y", 365), ("2y", 730)]:
+        if days < span - 5:
+            return period
+    return "5y"
+
+
+def _daily_closes(histories: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Close matrix (dates x symbols) on timezone-naive calendar dates"""
+    closes = {}
+    for symbol, hist in histories.items():
+        if hist is None or hist.empty:
+            continue
+        index = pd.to_datetime(hist.index.strftime('%Y-%m-%d'))
+        closes[symbol] = pd.Series(hist['Close'].to_numpy(dtype=float), index=index)
+    return pd.DataFrame(closes).sort_index().ffill()
+
+
 def calculate_risk_metrics(session: Session) -> Dict:
     """
-    Calculate Sharpe Ratio, Max Drawdown based on equity curve
-    (Simulated using closed trades for now)
+    Calculate Sharpe Ratio, Max Drawdown, volatility and beta of the
+    portfolio's daily returns.
+
+    Daily holdings are rebuilt from the transaction log and marked to
+    market with daily closes; each day's return is the price P&L on the
+    previous day's holdings over their value, so deposits and trades don't
+    count as performance. Days with nothing held are left out.
     """
-    # Simply using mock risk metrics for now as we need daily equity snapshots for real Sharpe
-    # In production, we'd log daily portfolio value to a separate table
-    
+    transactions = session.exec(select(Transaction).order_by(Transaction.date)).all()
+    # Beta is None whenever it can't be measured, as without benchmark data
+    empty = {"sharpeRatio": 0, "maxDrawdown": 0, "volatility": 0, "beta": None, "tradingDays": 0}
+    if not transactions:
+        return empty
+
+    txns = pd.DataFrame({
+        "symbol": [t.symbol for t in transactions],
+        "qty": [t.quantity if t.type == "BUY" else -t.quantity for t in transactions],
+        "date": pd.to_datetime([t.date for t in transactions], format="ISO8601").normalize(),
+    })
+    symbols = list(dict.fromkeys(txns["symbol"]))
+
+    try:
+        period = _history_period(txns["date"].min())
+        histories = current_provider.get_batch_history(symbols + [BENCHMARK_SYMBOL], period=period)
+        closes = _daily_closes({s: panel_symbol(histories, s) for s in symbols + [BENCHMARK_SYMBOL]})
+    except Exception as e:
+        logger.error(f"Risk metrics history fetch failed: {e}")
+        return empty
+
+    held_symbols = [s for s in symbols if s in closes]
+    closes = closes[closes.index >= txns["date"].min()]
+    if not held_symbols or len(closes) < 2:
+        return empty
+
+    # Share count per day: transactions on non-trading days apply at the next session
+    days = closes.index
+    txns = txns[txns["symbol"].isin(held_symbols)]
+    bars = np.minimum(np.searchsorted(days, txns["date"]), len(days) - 1)
+    flows = np.zeros((len(days), len(held_symbols)))
+    np.add.at(flows, (bars, txns["symbol"].map(held_symbols.index).to_numpy()), txns["qty"].to_numpy())
+    shares = np.cumsum(flows, axis=0)
+
+    # Closes are forward-filled, so a price is only missing before a symbol's
+    # first bar; leave the holding out until then rather than valuing it at 0
+    prices = closes[held_symbols].to_numpy(dtype=float)
+    priced = ~np.isnan(prices)
+    shares = np.where(priced, shares, 0.0)
+    prices = np.where(priced, prices, 0.0)
+    value = (shares * prices).sum(axis=1)
+    pnl = (shares[:-1] * (prices[1:] - prices[:-1])).sum(axis=1)
+
+    invested = value[:-1] > 0
+    if invested.sum() < 2:
+        return empty
+    returns = pnl[invested] / value[:-1][invested]
+    equity = np.concatenate([[1.0], np.cumprod(1 + returns)])
+
+    risk = performance_metrics(equity, value > 0)
+    portfolio_beta = None
+    if BENCHMARK_SYMBOL in closes:
+        bench = simple_returns(closes[BENCHMARK_SYMBOL].to_numpy(dtype=float))[invested]
+        portfolio_beta = beta(returns, bench)
+
     return {
-        "sharpeRatio": 1.25, # Good > 1
-        "maxDrawdown": -12.5, # Percentage
-        "volatility": 15.4, # Annualized vol
-        "beta": 0.85 # Less volatile than market
+        "sharpeRatio": risk["sharpeRatio"],
+        "maxDrawdown": -risk["maxDrawdown"] if risk["maxDrawdown"] else 0,  # Percentage, negative
+        "volatility": risk["volatility"],  # Annualized vol
+        "beta": round(portfolio_beta, 2) if portfolio_beta is not None else None,
+        "sortinoRatio": risk["sortinoRatio"],
+        "calmarRatio": risk["calmarRatio"],
+        "cagr": risk["cagr"],
+        "maxDrawdownDuration": risk["maxDrawdownDuration"],
+        "exposure": risk["exposure"],
+        "rollingReturns": risk["rollingReturns"],
+        "tradingDays": int(invested.sum()),
     }
@@ -7,11 +7,24 @@ import asyncio
 from sqlmodel import Session
 
 logger = logging.getLogger(__name__)
-from ..config import WS_UPDATE_INTERVAL
+from ..config import SCAN_INTERVALS, PRICE_BUS_RETRY
 from ..database import engine
-from ..services.stock_service import fetch_live_prices, cached_stock_data
+from ..services.stock_service import (
+    fetch_live_prices, cached_stock_data, live_prices, refresh_live_technicals, scan_stocks, get_universe_key
+)
+from ..services.scan_snapshot import publish_snapshot
+from ..services.compute_pool import JobCancelled, pool_context
+from ..utils.async_utils import run_blocking
+from ..utils.market_utils import get_market_status
+from ..utils.singleflight import AsyncSingleFlight, SingleFlight
 from ..services import alert_service, telegram_service
 from ..services.websocket_manager import manager
+from ..services.price_bus import price_bus
+from ..services.price_scheduler import poll_scheduler, due_symbols, provider_symbol
+
+_scan_flight = AsyncSingleFlight()
+# Also joined by scan jobs, which run outside the event loop
+_scan_flight_blocking = SingleFlight()
 
 async def _process_alerts(prices: dict, session: Session):
     """Check and process alerts"""
@@ -33,29 +46,127 @@ async def _process_alerts(prices: dict, session: Session):
         logger.error(f"Alert check failed: {alert_err}")
 
 async def _broadcast_prices(prices: dict):
-    """Broadcast price updates to connected clients"""
+    """Send price updates to connected clients, each filtered to its subscription"""
     if manager.active_connections:
-        await manager.broadcast({
-            "type": "price_update",
-            "data": prices
-        })
+        await manager.publish_prices(prices)
+
+async def _on_bus_prices(prices: dict):
+    """Every worker: apply prices from the bus and fan them out to its own clients"""
+    # A shared table already holds them: the producer wrote it while fetching
+    if not live_prices.shared:
+        live_prices.update(prices)
+    # Roll live prices into the scanner's streaming indicators
+    await run_blocking(refresh_live_technicals, prices)
+    await _broadcast_prices(prices)
 
 async def price_updater():
-    """Background task to fetch prices, check alerts, and broadcast updates"""
-    logger.info(f"Starting price updater task (Interval: {WS_UPDATE_INTERVAL}s)")
+    """
+    Background task to fetch prices, check alerts, and broadcast updates.
+    Only the worker elected producer on the price bus polls the provider and
+    checks alerts; every worker receives the prices through the bus.
+    The poll scheduler picks which symbols are due: watched ones often while
+    the market is open, everything rarely once it is closed.
+    """
+    logger.info("Starting price updater task")
+    price_bus.subscribe(_on_bus_prices)
+    await price_bus.start()
+    
+    try:
+        while True:
+            producer = False
+            try:
+                producer = await price_bus.elect()
+                # Only the producer writes a shared live price table
+                live_prices.writer = producer or not live_prices.shared
+                if producer:
+                    # Fetch due prices even if no clients connected (for alerts)
+                    due = due_symbols(get_market_status()["status"])
+                    # Marked up front: a failing provider is retried at the normal cadence
+                    poll_scheduler.mark_polled(due)
+                    prices = await fetch_live_prices([provider_symbol(s) for s in due]) if due else {}
+                    
+                    if prices:
+                        await price_bus.publish(prices)
+                        
+                        with Session(engine) as session:
+                            await _process_alerts(prices, session)
+                    
+            except Exception as e:
+                logger.error(f"Data update cycle error: {e}")
+            
+            # Followers only check back in case they have taken over
+            await asyncio.sleep(poll_scheduler.next_delay() if producer else PRICE_BUS_RETRY)
+    finally:
+        await price_bus.stop()
+
+
+async def run_scan_and_publish():
+    """
+    Run a full scan off the event loop and publish it as the current snapshot.
+    Concurrent callers (scheduler and /api/scan) share one scan. The price
+    producer also hands it to the other workers over the bus.
+    """
+    snapshot = await _scan_flight.do("scan", _scan_and_publish)
+    if price_bus.is_producer:
+        await price_bus.publish_scan({
+            "universe": snapshot.universe,
+            "marketStatus": snapshot.market_status,
+            "results": list(snapshot.results),
+        })
+    return snapshot
+
+def _scan_and_publish_now():
+    market = get_market_status()
+    universe = get_universe_key()
+    results = scan_stocks()
+    return publish_snapshot(results, universe, market["status"])
+
+def scan_and_publish():
+    """
+    Run a full scan and publish it as the current snapshot (blocking; also
+    run as a job). Callers from any thread share the scan already running.
+    """
+    try:
+        return _scan_flight_blocking.do("scan", _scan_and_publish_now)
+    except JobCancelled:
+        context = pool_context.get()
+        if context is not None and context.cancelled():
+            raise
+        # The scan we joined was a job's and it was cancelled: run our own
+        return _scan_flight_blocking.do("scan", _scan_and_publish_now)
+
+async def _scan_and_publish():
+    return await run_blocking(scan_and_publish)
+
+async def _on_bus_scan(scan: dict):
+    """Other workers: adopt the producer's scan instead of rescanning"""
+    # Rows of another stock list would be rescanned by /api/scan anyway
+    if scan["universe"] != get_universe_key():
+        return
+    for stock_data in scan["results"]:
+        cached_stock_data[stock_data["symbol"]] = stock_data
+    publish_snapshot(scan["results"], scan["universe"], scan["marketStatus"])
+
+async def scan_scheduler():
+    """
+    Background task that rescans on a cadence keyed to market status.
+    Only the price producer scans; the other workers receive its snapshot
+    over the bus, so provider calls don't multiply with the worker count.
+    Live technicals between scans are refreshed by the producer alone, the
+    only worker holding the indicator state.
+    """
+    logger.info("Starting scan scheduler task")
+    price_bus.subscribe_scans(_on_bus_scan)
     
     while True:
+        status = get_market_status()["status"]
+        if not await price_bus.elect():
+            await asyncio.sleep(PRICE_BUS_RETRY)
+            continue
         try:
-            # Fetch live prices even if no clients connected (for alerts)
-            prices = await fetch_live_prices()
-            
-            if prices:
-                with Session(engine) as session:
-                    await _process_alerts(prices, session)
-                
-                await _broadcast_prices(prices)
-                
+            snapshot = await run_scan_and_publish()
+            logger.info(f"Published scan snapshot v{snapshot.version} ({len(snapshot.results)} stocks, market {status})")
         except Exception as e:
-            logger.error(f"Data update cycle error: {e}")
+            logger.error(f"Scheduled scan failed: {e}")
         
-        await asyncio.sleep(WS_UPDATE_INTERVAL)
+        await asyncio.sleep(SCAN_INTERVALS.get(status, SCAN_INTERVALS["closed"]))
@@ -1,20 +1,64 @@
 """
 Backtest Service - Strategy backtesting engine
 """
+import hashlib
+import threading
 import numpy as np
 import pandas as pd
-import yfinance as yf
-from typing import Optional
+from typing import Optional, List, Dict
 
 from ..config import (
     RSI_OVERSOLD, RSI_OVERBOUGHT,
     MACD_FAST, MACD_SLOW, MACD_SIGNAL,
     BOLLINGER_PERIOD, BOLLINGER_STD,
-    MA_FAST, MA_SLOW
-)
-from ..utils.indicators import (
-    calculate_rsi, calculate_macd, calculate_bollinger_bands
+    MA_FAST, MA_SLOW,
+    BACKTEST_EQUITY_POINTS, BACKTEST_TRADES_PAGE
 )
+from ..utils.indicators import IndicatorCache
+from ..utils.strategies import get_strategy, list_strategies
+from ..utils.metrics import performance_metrics, position_from_fills, trade_excursions
+from ..utils.cache import backtest_cache
+from ..utils.downsample import lttb_indices
+from ..utils.serialization import dumps
+from .data_provider.base import panel_symbol, history_fingerprint
+from .data_provider.factory import current_provider
+
+_backtest_cache_lock = threading.Lock()
+
+
+def load_price_histories(symbols: List[str], period: str = "1y") -> Dict[str, pd.DataFrame]:
+    """Fetch daily histories for symbols in grouped downloads through the data provider"""
+    panel = current_provider.get_batch_history(symbols, period=period)
+    return {symbol: panel_symbol(panel, symbol) for symbol in symbols}
+
+
+def build_strategy_frame(
+    hist: pd.DataFrame,
+    strategy: str,
+    params: dict,
+    indicators: Optional[IndicatorCache] = None
+) -> tuple[Optional[pd.DataFrame], str]:
+    """
+    Add the strategy's indicator columns to hist and drop warm-up rows.
+    Returns (None, "Unknown") for an unknown strategy.
+    """
+    spec = get_strategy(strategy)
+    if spec is None:
+        return None, "Unknown"
+    if indicators is None:
+        indicators = IndicatorCache(hist['Close'])
+    
+    columns = {name: indicators.get(ref) for name, ref in spec.indicators(params).items()}
+    
+    # Drop NaN rows (same as hist.assign(**columns).dropna(), built from
+    # arrays since sweeps call this once per parameter set)
+    data = {name: hist[name].to_numpy() for name in hist.columns}
+    data.update({name: series.to_numpy() for name, series in columns.items()})
+    valid = np.ones(len(hist), dtype=bool)
+    for values in data.values():
+        valid &= ~pd.isna(values)
+    frame = pd.DataFrame({name: values[valid] for name, values in data.items()}, index=hist.index[valid])
+    return frame, spec.title(params)
 
 
 def run_backtest(
@@ -22,7 +66,10 @@ def run_backtest(
     period: str = "1y",
     strategy: str = "rsi_sma",
     initial_capital: float = 100000,
-    params: Optional[dict] = None
+    params: Optional[dict] = None,
+    points: int = BACKTEST_EQUITY_POINTS,
+    trades_offset: Optional[int] = None,
+    trades_limit: int = BACKTEST_TRADES_PAGE
 ) -> dict:
     """
     Run a backtest simulation with multiple strategy options
@@ -33,64 +80,86 @@ def run_backtest(
         strategy: Strategy type (rsi_sma, macd, bollinger, ma_crossover)
         initial_capital: Starting capital
         params: Strategy-specific parameters
+        points: Equity curve points to return (LTTB-downsampled; 0 = every bar)
+        trades_offset: First trade of the page (default: the last page)
+        trades_limit: Trades per page
     
     Returns:
-        Backtest results with trades, equity curve, and metrics
+        Backtest results with a page of trades, equity curve, and metrics
+    """
+    result = run_full_backtest(symbol, period, strategy, initial_capital, params)
+    if not result.get("success"):
+        return result
+    return backtest_view(result, points, trades_offset, trades_limit)
+
+
+def backtest_view(
+    result: dict,
+    points: int = BACKTEST_EQUITY_POINTS,
+    trades_offset: Optional[int] = None,
+    trades_limit: int = BACKTEST_TRADES_PAGE
+) -> dict:
+    """A page of trades and a downsampled equity curve from a full-resolution result"""
+    trades = result["trades"]
+    limit = max(1, trades_limit)
+    if trades_offset is None:
+        start = max(0, len(trades) - limit)
+    else:
+        start = min(max(0, trades_offset), len(trades))
+    
+    curve = result["equityCurve"]
+    if points and points < len(curve):
+        keep = lttb_indices([e["equity"] for e in curve], points)
+        curve = [curve[i] for i in keep]
+    
+    return {
+        **result,
+        "trades": trades[start:start + limit],
+        "tradeCount": len(trades),
+        "tradeOffset": start,
+        "equityCurve": curve,
+        "equityPoints": len(result["equityCurve"])
+    }
+
+
+def run_full_backtest(
+    symbol: str,
+    period: str = "1y",
+    strategy: str = "rsi_sma",
+    initial_capital: float = 100000,
+    params: Optional[dict] = None
+) -> dict:
+    """
+    Backtest with every trade and an equity point per bar. Results are
+    cached by data fingerprint; run_backtest pages and downsamples them.
     """
     if params is None:
         params = get_default_params()
+    key = backtest_cache_key(symbol, period, strategy, initial_capital, params)
     
     try:
+        # Served from the store as is: the cached result is current, skip the read
+        fingerprint = current_provider.peek_history_fingerprint(symbol, period)
+        cached = _cached_backtest(key, fingerprint)
+        if cached is not None:
+            return cached
+        
         # Fetch historical data
-        ticker_symbol = symbol if symbol.endswith('.NS') else f"{symbol}.NS"
-        ticker = yf.Ticker(ticker_symbol)
-        hist = ticker.history(period=period)
+        hist = load_price_histories([symbol], period)[symbol]
         
         if len(hist) < 60:
             return {"success": False, "error": "Not enough historical data (need 60+ days)"}
         
-        # Calculate indicators based on strategy
-        strategy_name = "Unknown"
-        
-        if strategy == "rsi_sma":
-            strategy_name = "RSI + SMA50"
-            hist['SMA50'] = hist['Close'].rolling(window=50).mean()
-            hist['RSI'] = calculate_rsi(hist['Close'])
-            
-        elif strategy == "macd":
-            strategy_name = f"MACD ({params['macd_fast']},{params['macd_slow']},{params['macd_signal']})"
-            macd, signal, histogram = calculate_macd(
-                hist['Close'],
-                params['macd_fast'],
-                params['macd_slow'],
-                params['macd_signal']
-            )
-            hist['MACD'] = macd
-            hist['MACD_Signal'] = signal
-            hist['MACD_Hist'] = histogram
-            
-        elif strategy == "bollinger":
-            strategy_name = f"Bollinger Bands ({params['bb_period']}, {params['bb_std']}σ)"
-            sma, upper, lower = calculate_bollinger_bands(
-                hist['Close'],
-                params['bb_period'],
-                params['bb_std']
-            )
-            hist['BB_Mid'] = sma
-            hist['BB_Upper'] = upper
-            hist['BB_Lower'] = lower
-            
-        elif strategy == "ma_crossover":
-            strategy_name = f"MA Crossover ({params['ma_fast']}/{params['ma_slow']})"
-            hist['MA_Fast'] = hist['Close'].rolling(window=params['ma_fast']).mean()
-            hist['MA_Slow'] = hist['Close'].rolling(window=params['ma_slow']).mean()
+        fingerprint = history_fingerprint(hist)
+        cached = _cached_backtest(key, fingerprint)
+        if cached is not None:
+            return cached
         
-        else:
+        # Calculate indicators based on strategy
+        hist, strategy_name = build_strategy_frame(hist, strategy, params)
+        if hist is None:
             return {"success": False, "error": f"Unknown strategy: {strategy}"}
         
-        # Drop NaN rows
-        hist = hist.dropna()
-        
         if len(hist) < 10:
             return {"success": False, "error": "Not enough data after indicator calculation"}
         
@@ -102,53 +171,87 @@ def run_backtest(
         # Calculate metrics
         metrics = calculate_metrics(trades, equity_curve, initial_capital, hist)
         
-        return {
+        result = {
             "success": True,
             "symbol": symbol.replace(".NS", ""),
             "period": period,
             "strategy": strategy,
             "strategyName": strategy_name,
             "summary": metrics,
-            "trades": trades[-20:],  # Last 20 trades
-            "equityCurve": equity_curve[::max(1, len(equity_curve)//50)]  # Sample 50 points
+            "trades": trades,
+            "equityCurve": equity_curve
         }
+        _store_backtest(key, fingerprint, result)
+        return result
         
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
+def backtest_cache_key(
+    symbol: str,
+    period: str,
+    strategy: str,
+    initial_capital: float,
+    params: dict
+) -> tuple:
+    """
+    Cache key for a backtest, without the data fingerprint. Only the
+    parameters the strategy reads are hashed, so unrelated ones still hit.
+    """
+    spec = get_strategy(strategy)
+    used = {name: params.get(name) for name in spec.params} if spec else params
+    params_hash = hashlib.sha1(dumps(used, sort_keys=True)).hexdigest()
+    return (symbol, period, strategy, float(initial_capital), params_hash)
+
+
+def _cached_backtest(key: tuple, fingerprint: Optional[tuple]) -> Optional[dict]:
+    if fingerprint is None:
+        return None
+    with _backtest_cache_lock:
+        return backtest_cache.get(key + fingerprint)
+
+
+def _store_backtest(key: tuple, fingerprint: Optional[tuple], result: dict):
+    if fingerprint is None:
+        return
+    try:
+        with _backtest_cache_lock:
+            backtest_cache[key + fingerprint] = result
+    except ValueError:
+        pass  # larger than the whole cache
+
+
 def simulate_trades(
     hist: pd.DataFrame,
     strategy: str,
     params: dict,
     initial_capital: float
 ) -> tuple[list, list]:
-    """Run trade simulation on historical data"""
+    """
+    Run trade simulation on historical data.
+    Signals are computed as whole arrays; only bars with a buy or sell
+    signal go through the position state machine, and the equity curve is
+    rebuilt from the resulting cash/share steps.
+    """
+    close = hist['Close'].to_numpy(dtype=float)
+    dates = hist.index.strftime('%Y-%m-%d')
+    buy, sell = generate_signals(hist, strategy, params)
+    
     capital = initial_capital
     shares = 0
     position_open = False
     entry_price = 0
     trades = []
-    equity_curve = []
+    trade_bars = []   # bar index of each fill
+    cash_after = []   # capital after each fill
+    shares_after = [] # shares held after each fill
     
-    for i, (date, row) in enumerate(hist.iterrows()):
-        current_price = row['Close']
-        
-        # Record equity
-        current_equity = capital + (shares * current_price)
-        equity_curve.append({
-            "date": date.strftime('%Y-%m-%d'),
-            "equity": round(current_equity, 2),
-            "price": round(current_price, 2)
-        })
-        
-        # Generate signals based on strategy
-        buy_signal, sell_signal, signal_info = generate_signals(
-            row, hist, i, strategy, params
-        )
+    for i in np.flatnonzero(buy | sell):
+        current_price = close[i]
         
         # Execute trades
-        if not position_open and buy_signal:
+        if not position_open and buy[i]:
             shares = int(capital * 0.95 / current_price)
             if shares > 0:
                 entry_price = current_price
@@ -156,13 +259,15 @@ def simulate_trades(
                 position_open = True
                 trades.append({
                     "type": "BUY",
-                    "date": date.strftime('%Y-%m-%d'),
+                    "date": dates[i],
                     "price": round(current_price, 2),
                     "shares": shares,
-                    "signal": signal_info
+                    "signal": signal_info(hist, strategy, i, params)
                 })
+            else:
+                continue
         
-        elif position_open and sell_signal:
+        elif position_open and sell[i]:
             exit_price = current_price
             capital += shares * exit_price
             profit = (exit_price - entry_price) * shares
@@ -170,27 +275,46 @@ def simulate_trades(
             
             trades.append({
                 "type": "SELL",
-                "date": date.strftime('%Y-%m-%d'),
+                "date": dates[i],
                 "price": round(current_price, 2),
                 "shares": shares,
                 "profit": round(profit, 2),
                 "profitPct": round(profit_pct, 2),
-                "signal": signal_info
+                "signal": signal_info(hist, strategy, i, params)
             })
             
             shares = 0
             position_open = False
             entry_price = 0
+        
+        else:
+            continue
+        
+        trade_bars.append(i)
+        cash_after.append(capital)
+        shares_after.append(shares)
+    
+    # Equity is recorded before each bar's fill, so bar i uses the state
+    # left by the last fill strictly before it
+    state = np.searchsorted(np.asarray(trade_bars, dtype=int), np.arange(len(close)), side='left') - 1
+    cash = np.append(cash_after, initial_capital)[state]        # state -1 -> initial
+    held = np.append(np.asarray(shares_after, dtype=float), 0)[state]
+    equity = np.round(cash + held * close, 2)
+    prices = np.round(close, 2)
+    equity_curve = [
+        {"date": date, "equity": eq, "price": price}
+        for date, eq, price in zip(dates, equity.tolist(), prices.tolist())
+    ]
     
     # Close any open position at the end
     if position_open:
-        final_price = hist['Close'].iloc[-1]
+        final_price = close[-1]
         capital += shares * final_price
         profit = (final_price - entry_price) * shares
         profit_pct = ((final_price - entry_price) / entry_price) * 100
         trades.append({
             "type": "SELL (End)",
-            "date": hist.index[-1].strftime('%Y-%m-%d'),
+            "date": dates[-1],
             "price": round(final_price, 2),
             "shares": shares,
             "profit": round(profit, 2),
@@ -201,53 +325,35 @@ def simulate_trades(
 
 
 def generate_signals(
-    row: pd.Series,
     hist: pd.DataFrame,
-    idx: int,
     strategy: str,
     params: dict
-) -> tuple[bool, bool, str]:
-    """Generate buy/sell signals based on strategy"""
-    buy_signal = False
-    sell_signal = False
-    signal_info = ""
-    current_price = row['Close']
+) -> tuple[np.ndarray, np.ndarray]:
+    """Buy/sell signal arrays (one bool per bar) from the strategy registry"""
+    spec = get_strategy(strategy)
+    if spec is None:
+        empty = np.zeros(len(hist), dtype=bool)
+        return empty, empty
     
-    if strategy == "rsi_sma":
-        rsi = row['RSI']
-        sma50 = row['SMA50']
-        buy_signal = current_price > sma50 and rsi < params['rsi_oversold']
-        sell_signal = rsi > params['rsi_overbought'] or current_price < sma50
-        signal_info = f"RSI: {rsi:.1f}"
-        
-    elif strategy == "macd":
-        hist_val = row['MACD_Hist']
-        if idx > 0:
-            prev_hist = hist['MACD_Hist'].iloc[idx-1]
-            buy_signal = prev_hist < 0 and hist_val > 0
-            sell_signal = prev_hist > 0 and hist_val < 0
-        signal_info = f"MACD: {row['MACD']:.2f}"
-        
-    elif strategy == "bollinger":
-        lower = row['BB_Lower']
-        upper = row['BB_Upper']
-        mid = row['BB_Mid']
-        buy_signal = current_price <= lower
-        sell_signal = current_price >= upper or current_price < mid
-        bb_pct = ((current_price - lower) / (upper - lower) * 100) if upper != lower else 50
-        signal_info = f"BB%: {bb_pct:.1f}"
-        
-    elif strategy == "ma_crossover":
-        ma_fast = row['MA_Fast']
-        ma_slow = row['MA_Slow']
-        if idx > 0:
-            prev_fast = hist['MA_Fast'].iloc[idx-1]
-            prev_slow = hist['MA_Slow'].iloc[idx-1]
-            buy_signal = prev_fast <= prev_slow and ma_fast > ma_slow
-            sell_signal = prev_fast >= prev_slow and ma_fast < ma_slow
-        signal_info = f"Fast: {ma_fast:.1f}"
+    columns = {'Close': hist['Close'].to_numpy(dtype=float)}
+    for name in spec.indicators(params):
+        columns[name] = hist[name].to_numpy(dtype=float)
     
-    return buy_signal, sell_signal, signal_info
+    # NaN comparisons are False, so the first bar never crosses
+    with np.errstate(invalid='ignore'):
+        return spec.signals(columns, params)
+
+
+def signal_info(hist: pd.DataFrame, strategy: str, idx: int, params: Optional[dict] = None) -> str:
+    """Short indicator readout recorded on a trade at bar idx"""
+    spec = get_strategy(strategy)
+    if spec is None:
+        return ""
+    
+    def value(column):
+        return hist.iat[idx, hist.columns.get_loc(column)]
+    
+    return spec.info(value, params or {})
 
 
 def calculate_metrics(
@@ -269,16 +375,17 @@ def calculate_metrics(
     avg_win = np.mean([t['profit'] for t in winning_trades]) if winning_trades else 0
     avg_loss = np.mean([t['profit'] for t in losing_trades]) if losing_trades else 0
     
-    # Max drawdown
-    equity_values = [e['equity'] for e in equity_curve]
-    peak = equity_values[0] if equity_values else initial_capital
-    max_drawdown = 0
-    for eq in equity_values:
-        if eq > peak:
-            peak = eq
-        drawdown = (peak - eq) / peak * 100
-        if drawdown > max_drawdown:
-            max_drawdown = drawdown
+    # Risk figures from the equity curve and the held/flat bars
+    equity_values = np.array([e['equity'] for e in equity_curve], dtype=float)
+    entries, exits = fill_bars(trades, hist)
+    held = position_from_fills(len(hist), entries, exits)
+    risk = performance_metrics(equity_values, held) if len(equity_values) else {}
+    
+    # Excursions over each round trip, using intraday range when available
+    close = hist['Close'].to_numpy(dtype=float)
+    high = hist['High'].to_numpy(dtype=float) if 'High' in hist else close
+    low = hist['Low'].to_numpy(dtype=float) if 'Low' in hist else close
+    mae, mfe = trade_excursions(entries, np.minimum(exits, len(hist) - 1), close[entries], high, low)
     
     # Buy and hold comparison
     start_price = hist['Close'].iloc[0]
@@ -297,12 +404,38 @@ def calculate_metrics(
         "winRate": round(win_rate, 1),
         "avgWin": round(avg_win, 2),
         "avgLoss": round(avg_loss, 2),
-        "maxDrawdown": round(max_drawdown, 2),
+        "maxDrawdown": risk.get("maxDrawdown") or 0,
+        "maxDrawdownDuration": risk.get("maxDrawdownDuration", 0),
+        "cagr": risk.get("cagr"),
+        "volatility": risk.get("volatility"),
+        "sharpeRatio": risk.get("sharpeRatio"),
+        "sortinoRatio": risk.get("sortinoRatio"),
+        "calmarRatio": risk.get("calmarRatio"),
+        "exposure": risk.get("exposure"),
+        "avgMae": round(float(mae.mean()), 2) if len(mae) else 0,
+        "avgMfe": round(float(mfe.mean()), 2) if len(mfe) else 0,
+        "worstMae": round(float(mae.min()), 2) if len(mae) else 0,
+        "rollingReturns": risk.get("rollingReturns", {}),
         "startDate": hist.index[0].strftime('%Y-%m-%d'),
         "endDate": hist.index[-1].strftime('%Y-%m-%d')
     }
 
 
+def fill_bars(trades: list, hist: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bar positions of buy and sell fills. A closing 'SELL (End)' is placed
+    one past the last bar, since the position is held through it.
+    """
+    dates = np.asarray(hist.index.strftime('%Y-%m-%d'))
+    buys = [t['date'] for t in trades if t['type'] == 'BUY']
+    sells = [t['date'] for t in trades if t['type'] == 'SELL']
+    entries = np.searchsorted(dates, buys).astype(int)
+    exits = np.searchsorted(dates, sells).astype(int)
+    if trades and trades[-1]['type'] == 'SELL (End)':
+        exits = np.append(exits, len(hist))
+    return entries, exits
+
+
 def get_default_params() -> dict:
     """Get default strategy parameters"""
     return {
@@ -320,29 +453,4 @@ def get_default_params() -> dict:
 
 def get_available_strategies() -> list:
     """Get list of available trading strategies"""
-    return [
-        {
-            "id": "rsi_sma",
-            "name": "RSI + SMA50",
-            "description": "Buy when RSI is oversold and price > SMA50, sell when RSI overbought",
-            "params": ["rsi_oversold", "rsi_overbought"]
-        },
-        {
-            "id": "macd",
-            "name": "MACD Crossover",
-            "description": "Buy on bullish MACD histogram crossover, sell on bearish crossover",
-            "params": ["macd_fast", "macd_slow", "macd_signal"]
-        },
-        {
-            "id": "bollinger",
-            "name": "Bollinger Bands",
-            "description": "Buy when price touches lower band, sell at upper band",
-            "params": ["bb_period", "bb_std"]
-        },
-        {
-            "id": "ma_crossover",
-            "name": "Moving Average Crossover",
-            "description": "Golden cross buy, death cross sell",
-            "params": ["ma_fast", "ma_slow"]
-        }
-    ]
+    return list_strategies()
@@ -0,0 +1,296 @@
+"""
+Compute Pool
+Process pool for CPU-bound work such as backtest sweeps, so it runs
+outside the GIL instead of competing with request threads.
+
+Price histories go to workers through shared memory (SharedFrames) rather
+than being pickled into every task. Work started from a job (see
+job_service) reports progress and stops early when the job is cancelled.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..config import COMPUTE_POOL_SIZE
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside pool work whose job was cancelled. A BaseException, like
+    asyncio.CancelledError, so services' generic error handling lets it through.
+    """
+
+
+class PoolContext:
+    """
+    Hooks for the work running in the current thread: map_in_pool checks
+    cancelled() between tasks and calls on_task_done() as tasks finish.
+    Work whose pieces are useful on their own (scan rows) hands them to
+    on_partial() as they complete.
+    """
+
+    def cancelled(self) -> bool:
+        return False
+
+    def on_task_done(self, done: int, total: int, result):
+        pass
+
+    def on_partial(self, items: list):
+        pass
+
+
+# Set by job_service while a job runs, so nested pool calls can report to it
+pool_context: ContextVar[Optional[PoolContext]] = ContextVar("pool_context", default=None)
+
+
+# ====================================================================
+# SHARED MEMORY TRANSFER
+# ====================================================================
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Open an existing block. Spawned workers share the parent's resource
+    tracker, so the creator's unlink() is the only cleanup needed.
+    """
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedFrames:
+    """
+    Date-indexed numeric DataFrames copied into one shared-memory block.
+
+    The handle pickles to just the block name and layout, so sending it to
+    many tasks costs nothing per task. The creating process owns the block:
+    use it as a context manager (or call close()) to release it.
+    """
+
+    def __init__(self, frames: List[pd.DataFrame]):
+        self.specs = []
+        offset = 0
+        for df in frames:
+            index = df.index
+            tz = str(index.tz) if getattr(index, "tz", None) is not None else None
+            self.specs.append((offset, len(df), list(df.columns), tz))
+            offset += len(df) * (len(df.columns) + 1) * 8
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        self.name = self._shm.name
+        for df, (start, n, columns, _) in zip(frames, self.specs):
+            if n == 0:
+                continue
+            ts = np.ndarray((n,), dtype=np.int64, buffer=self._shm.buf, offset=start)
+            values = np.ndarray((n, len(columns)), dtype=np.float64, buffer=self._shm.buf, offset=start + n * 8)
+            ts[:] = df.index.as_unit("ns").asi8
+            values[:] = df.to_numpy(dtype=np.float64)
+
+    def __getstate__(self):
+        return {"name": self.name, "specs": self.specs}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._shm = None
+
+    def frames(self, which: Optional[List[int]] = None) -> List[pd.DataFrame]:
+        """Copies of the frames (all, or the given positions) as DataFrames"""
+        shm = self._shm or _attach(self.name)
+        try:
+            result = []
+            for i in (range(len(self.specs)) if which is None else which):
+                start, n, columns, tz = self.specs[i]
+                ts = np.ndarray((n,), dtype=np.int64, buffer=shm.buf, offset=start).copy()
+                values = np.ndarray((n, len(columns)), dtype=np.float64, buffer=shm.buf, offset=start + n * 8).copy()
+                index = pd.DatetimeIndex(ts.view("M8[ns]"))
+                if tz:
+                    index = index.tz_localize("UTC").tz_convert(tz)
+                result.append(pd.DataFrame(values, index=index, columns=columns))
+            return result
+        finally:
+            if shm is not self._shm:
+                shm.close()
+
+    def ref(self, position: int = 0, stop: Optional[int] = None) -> "FrameRef":
+        """Task argument standing for one frame (its first `stop` rows if given)"""
+        return FrameRef(self, position, stop)
+
+    def close(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@dataclass(frozen=True)
+class FrameRef:
+    """One frame in a SharedFrames block, optionally only its first `stop` rows"""
+    shared: SharedFrames
+    position: int = 0
+    stop: Optional[int] = None
+
+    def load(self) -> pd.DataFrame:
+        df = self.shared.frames([self.position])[0]
+        return df if self.stop is None else df.iloc[:self.stop]
+
+
+def shared_frame(value: Union[pd.DataFrame, FrameRef]) -> pd.DataFrame:
+    """The DataFrame passed to a task, loading it from shared memory if needed"""
+    return value.load() if isinstance(value, FrameRef) else value
+
+
+# ====================================================================
+# POOL
+# ====================================================================
+
+class _PoolStats:
+    """Counters behind get_pool_stats(); updated from submitting threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.inflight = set()
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+
+
+_stats = _PoolStats()
+
+
+def _timed_call(fn: Callable, args: tuple):
+    """Runs in the worker: the result plus how long the worker was busy"""
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def get_compute_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool, created on first use. None if processes are unavailable."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            try:
+                # spawn: forking a process that runs threads and an event loop is unsafe
+                _pool = ProcessPoolExecutor(
+                    max_workers=max(1, COMPUTE_POOL_SIZE),
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Compute pool unavailable, running inline: {e}")
+                return None
+        return _pool
+
+
+def _collect(futures: list, context: Optional[PoolContext]) -> List:
+    """Wait for pool futures in order of completion; results in submit order"""
+    results = [None] * len(futures)
+    position = {f: i for i, f in enumerate(futures)}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for f in done:
+                try:
+                    elapsed, results[position[f]] = f.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception:
+                    with _stats.lock:
+                        _stats.failed += 1
+                    raise
+                with _stats.lock:
+                    _stats.completed += 1
+                    _stats.busy_seconds += elapsed
+                if context is not None:
+                    context.on_task_done(len(futures) - len(pending), len(futures), results[position[f]])
+            if context is not None and context.cancelled():
+                raise JobCancelled()
+    finally:
+        for f in pending:
+            f.cancel()
+        with _stats.lock:
+            _stats.inflight.difference_update(futures)
+    return results
+
+
+def map_in_pool(fn: Callable, chunks: Iterable[tuple]) -> List:
+    """
+    Run fn(*chunk) for each chunk in the pool and return results in order.
+    Falls back to running inline if the pool can't be used.
+    Raises JobCancelled if the surrounding job is cancelled meanwhile.
+    """
+    chunks = list(chunks)
+    context = pool_context.get()
+    pool = get_compute_pool()
+    if pool is not None:
+        try:
+            futures = [pool.submit(_timed_call, fn, chunk) for chunk in chunks]
+            with _stats.lock:
+                _stats.inflight.update(futures)
+            return _collect(futures, context)
+        except BrokenProcessPool as e:
+            logger.error(f"Compute pool broke, running inline: {e}")
+            _reset_pool()
+
+    results = []
+    for chunk in chunks:
+        if context is not None and context.cancelled():
+            raise JobCancelled()
+        results.append(fn(*chunk))
+        if context is not None:
+            context.on_task_done(len(results), len(chunks), results[-1])
+    return results
+
+
+def get_pool_stats() -> dict:
+    """Queue depth and worker utilisation of the compute pool"""
+    workers = max(1, COMPUTE_POOL_SIZE)
+    with _stats.lock:
+        inflight = list(_stats.inflight)
+        uptime = time.time() - _stats.started_at
+        busy = _stats.busy_seconds
+        completed, failed = _stats.completed, _stats.failed
+    running = sum(1 for f in inflight if f.running())
+    return {
+        "workers": workers,
+        "active": _pool is not None,
+        "queued": len(inflight) - running,
+        "running": running,
+        "utilisation": round(min(running, workers) / workers * 100, 1),
+        "avgUtilisation": round(busy / (workers * uptime) * 100, 1) if uptime > 0 else 0,
+        "busySeconds": round(busy, 2),
+        "tasksCompleted": completed,
+        "tasksFailed": failed,
+    }
+
+
+def _reset_pool():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def shutdown_compute_pool():
+    """Stop worker processes (called on application shutdown)"""
+    _reset_pool()
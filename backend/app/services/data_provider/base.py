@@ -1,10 +1,64 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Optional
 import pandas as pd
+from ...utils.throttle import TokenBucket
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def make_panel(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combine per-symbol OHLCV frames into one aligned panel.
+    Columns are a (symbol, field) MultiIndex over the union of dates.
+    """
+    frames = {
+        symbol: df[[c for c in OHLCV_COLUMNS if c in df.columns]]
+        for symbol, df in frames.items()
+        if df is not None and not df.empty
+    }
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, axis=1).sort_index()
+
+
+def panel_symbol(panel: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """
+    Slice one symbol's OHLCV frame out of a panel.
+    Rows where the symbol has no data (alignment padding) are dropped.
+    """
+    if panel.empty or symbol not in panel.columns.get_level_values(0):
+        return pd.DataFrame()
+    return panel[symbol].dropna(how="all")
+
+
+def history_fingerprint(hist: pd.DataFrame) -> Optional[tuple]:
+    """
+    Identity of a daily history: (first bar ts, last bar ts, last close, bars),
+    timestamps in UTC ns. Changes when bars are added or the forming bar moves.
+    """
+    if hist is None or hist.empty:
+        return None
+    return (hist.index[0].value, hist.index[-1].value, float(hist['Close'].iloc[-1]), len(hist))
+
 
 class DataProvider(ABC):
     """Abstract Base Class for Stock Market Data Providers"""
 
+    name = "base"
+    # Whether get_batch_history makes one grouped request rather than one per symbol
+    batches_history = False
+    # Request budget each upstream history request draws from (set by the factory)
+    rate_budget: Optional[TokenBucket] = None
+
+    def _take_token(self):
+        """Wait for one request's worth of the rate budget"""
+        if self.rate_budget is not None:
+            self.rate_budget.acquire()
+
+    def _history_per_symbol(self, symbols: List[str], period: str, interval: str) -> pd.DataFrame:
+        """Batch history for APIs without a grouped download: one get_history (and token) per symbol"""
+        return make_panel({symbol: self.get_history(symbol, period, interval) for symbol in symbols})
+
     @abstractmethod
     def get_history(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         """
@@ -13,6 +67,15 @@ class DataProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_batch_history(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """
+        Fetch historical OHLCV data for many symbols at once.
+        Returns an aligned panel (see make_panel) keyed by the symbols as passed.
+        Symbols that failed are missing from the panel.
+        """
+        pass
+
     @abstractmethod
     def get_current_price(self, symbol: str) -> float:
         """
@@ -51,3 +114,10 @@ class DataProvider(ABC):
         Returns list of dicts: {symbol, name, exchange}.
         """
         pass
+
+    def peek_history_fingerprint(self, symbol: str, period: str = "1y", interval: str = "1d") -> Optional[tuple]:
+        """
+        history_fingerprint() of what get_history would return, if known
+        without a network request; None otherwise.
+        """
+        return None
@@ -3,6 +3,10 @@ from .base import DataProvider
 from .yfinance_provider import YFinanceProvider
 from .mock_provider import MockProvider
 from .kite_provider import KiteProvider
+from .stored_provider import StoredHistoryProvider
+from ..ohlcv_store import ohlcv_store
+from ...config import PROVIDER_RATE_LIMITS, OHLCV_STORE_ENABLED
+from ...utils.throttle import TokenBucket
 
 def get_data_provider() -> DataProvider:
     """Factory to get the configured data provider"""
@@ -18,5 +22,20 @@ def get_data_provider() -> DataProvider:
         # Default to YFinance
         return YFinanceProvider()
 
-# Singleton instance
-current_provider = get_data_provider()
+def get_rate_budget(provider: DataProvider) -> TokenBucket:
+    """Token bucket sized to the provider's request budget"""
+    rate, burst = PROVIDER_RATE_LIMITS.get(provider.name, PROVIDER_RATE_LIMITS["yfinance"])
+    return TokenBucket(rate, burst)
+
+def with_history_store(provider: DataProvider) -> DataProvider:
+    """Serve daily history from the local OHLCV store when enabled"""
+    # Mock data is regenerated on every call, so there is nothing to persist
+    if not OHLCV_STORE_ENABLED or provider.name == "mock":
+        return provider
+    return StoredHistoryProvider(provider, ohlcv_store)
+
+# Singleton instance; providers draw from the budget per upstream history request
+_provider = get_data_provider()
+current_rate_budget = get_rate_budget(_provider)
+_provider.rate_budget = current_rate_budget
+current_provider = with_history_store(_provider)
@@ -9,6 +9,8 @@ class KiteProvider(DataProvider):
     Production-ready implementation for Zerodha Kite Connect.
     Requires KITE_API_KEY and KITE_ACCESS_TOKEN env vars.
     """
+    name = "kite"
+
     def __init__(self):
         self.api_key = os.getenv("KITE_API_KEY")
         self.access_token = os.getenv("KITE_ACCESS_TOKEN")
@@ -32,11 +34,18 @@ class KiteProvider(DataProvider):
 
     def get_history(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         self._ensure_connected()
+        self._take_token()
         # Note: In a real implementation, you'd map 'symbol' to Kite's instrument_token
         # For this stub, we return empty to avoid crashing if called without real tokens
         print(f"[Kite] Fetching history for {symbol} (Stub)")
         return pd.DataFrame()
 
+    def get_batch_history(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        self._ensure_connected()
+        # Kite's historical_data endpoint is per instrument_token, so there's
+        # no grouped download; fetch each symbol and align them into one panel
+        return self._history_per_symbol(symbols, period, interval)
+
     def get_current_price(self, symbol: str) -> float:
         self._ensure_connected()
         print(f"[Kite] Fetching price for {symbol} (Stub)")
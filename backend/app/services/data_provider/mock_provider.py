@@ -6,8 +6,10 @@ from .base import DataProvider
 
 class MockProvider(DataProvider):
     """Implementation using generated mock data for stability"""
+    name = "mock"
 
     def get_history(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        self._take_token()
         # Generate date range
         end_date = datetime.now()
         start_date = end_date - timedelta(days=365)
@@ -18,13 +20,14 @@ class MockProvider(DataProvider):
         if interval == "1h": freq = "h"
         if interval == "5m": freq = "5min"
         
-        dates = pd.date_range(start=start_date, end=end_date, freq=freq)
+        # Snap to bar boundaries so batch panels of mock symbols line up
+        dates = pd.date_range(start=start_date, end=end_date, freq=freq).floor(freq)
         
         # Seed based on symbol for consistency
-        np.random.seed(sum(ord(c) for c in symbol))
+        rng = np.random.RandomState(sum(ord(c) for c in symbol))
         
         base_price = 1000.0
-        returns = np.random.normal(0, 0.02, len(dates))
+        returns = rng.normal(0, 0.02, len(dates))
         price_path = base_price * (1 + returns).cumprod()
         
         df = pd.DataFrame(index=dates)
@@ -32,13 +35,16 @@ class MockProvider(DataProvider):
         df['High'] = price_path * 1.01
         df['Low'] = price_path * 0.99
         df['Close'] = price_path
-        df['Volume'] = np.random.randint(1000, 100000, len(dates))
+        df['Volume'] = rng.randint(1000, 100000, len(dates))
         
         return df
 
+    def get_batch_history(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        return self._history_per_symbol(symbols, period, interval)
+
     def get_current_price(self, symbol: str) -> float:
-        np.random.seed(sum(ord(c) for c in symbol) + datetime.now().hour)
-        return round(1000.0 * (1 + np.random.normal(0, 0.05)), 2)
+        rng = np.random.RandomState(sum(ord(c) for c in symbol) + datetime.now().hour)
+        return round(1000.0 * (1 + rng.normal(0, 0.05)), 2)
 
     def get_batch_prices(self, symbols: List[str]) -> Dict[str, float]:
         return {s: self.get_current_price(s) for s in symbols}
@@ -0,0 +1,79 @@
+import pandas as pd
+from collections import defaultdict
+from typing import List, Dict
+from .base import DataProvider, make_panel, panel_symbol
+from ..ohlcv_store import OHLCVStore, PERIOD_DAYS
+
+class StoredHistoryProvider(DataProvider):
+    """
+    Wraps another provider and serves daily history from the local OHLCV store.
+    Only the bars missing since the last stored one are requested upstream;
+    everything else is delegated unchanged.
+    """
+
+    def __init__(self, inner: DataProvider, store: OHLCVStore):
+        self.inner = inner
+        self.store = store
+        self.name = inner.name
+        self.batches_history = inner.batches_history
+
+    def _refresh(self, symbol: str, period: str, interval: str):
+        fetch_period = self.store.plan_fetch(symbol, period)
+        if fetch_period is None:
+            return
+        fetched = self.inner.get_history(symbol, period=fetch_period, interval=interval)
+        self.store.update(symbol, fetched, span_days=PERIOD_DAYS[period] if fetch_period == period else None)
+
+    def get_history(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        if not self.store.supports(period, interval):
+            return self.inner.get_history(symbol, period, interval)
+        try:
+            self._refresh(symbol, period, interval)
+            return self.store.read(symbol, period)
+        except Exception as e:
+            print(f"[OHLCVStore] Falling back to provider for {symbol}: {e}")
+            return self.inner.get_history(symbol, period, interval)
+
+    def get_batch_history(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        if not self.store.supports(period, interval):
+            return self.inner.get_batch_history(symbols, period, interval)
+
+        # Group symbols by the request each one needs, one batch per group
+        plans = defaultdict(list)
+        for symbol in symbols:
+            fetch_period = self.store.plan_fetch(symbol, period)
+            if fetch_period is not None:
+                plans[fetch_period].append(symbol)
+
+        for fetch_period, group in plans.items():
+            try:
+                panel = self.inner.get_batch_history(group, period=fetch_period, interval=interval)
+            except Exception as e:
+                print(f"[OHLCVStore] Batch refresh failed ({fetch_period}): {e}")
+                continue
+            span_days = PERIOD_DAYS[period] if fetch_period == period else None
+            for symbol in group:
+                self.store.update(symbol, panel_symbol(panel, symbol), span_days=span_days)
+
+        return make_panel({s: self.store.read(s, period) for s in symbols})
+
+    def peek_history_fingerprint(self, symbol: str, period: str = "1y", interval: str = "1d"):
+        # Only when a read would be served from the store without a refresh
+        if not self.store.supports(period, interval) or self.store.plan_fetch(symbol, period) is not None:
+            return None
+        return self.store.fingerprint(symbol, period)
+
+    def get_current_price(self, symbol: str) -> float:
+        return self.inner.get_current_price(symbol)
+
+    def get_batch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        return self.inner.get_batch_prices(symbols)
+
+    def get_ticker_info(self, symbol: str) -> Dict:
+        return self.inner.get_ticker_info(symbol)
+
+    def get_market_status(self) -> Dict:
+        return self.inner.get_market_status()
+
+    def search_symbols(self, query: str) -> List[Dict]:
+        return self.inner.search_symbols(query)
@@ -1,14 +1,25 @@
 import yfinance as yf
 import pandas as pd
 from typing import List, Dict
-from .base import DataProvider
+from .base import DataProvider, make_panel
+from ...config import HISTORY_BATCH_SIZE
+
+def nse_symbol(symbol: str) -> str:
+    """Yahoo ticker for an NSE symbol: RELIANCE -> RELIANCE.NS; indices (^NSEI) unchanged"""
+    if symbol.startswith("^") or symbol.endswith(".NS"):
+        return symbol
+    return f"{symbol}.NS"
+
 
 class YFinanceProvider(DataProvider):
     """Implementation using yfinance library"""
+    name = "yfinance"
+    batches_history = True
 
     def get_history(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        self._take_token()
         try:
-            search_symbol = symbol if symbol.endswith(".NS") else f"{symbol}.NS"
+            search_symbol = nse_symbol(symbol)
             ticker = yf.Ticker(search_symbol)
             
             # Map periods if needed (yfinance is quite standard though)
@@ -18,9 +29,40 @@ class YFinanceProvider(DataProvider):
             print(f"[YFinance] Error fetching history for {symbol}: {e}")
             return pd.DataFrame()
 
+    def get_batch_history(self, symbols: List[str], period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        frames = {}
+        # One grouped download per chunk instead of one request per symbol
+        for i in range(0, len(symbols), HISTORY_BATCH_SIZE):
+            chunk = symbols[i:i + HISTORY_BATCH_SIZE]
+            search_map = {nse_symbol(s): s for s in chunk}
+            self._take_token()
+            try:
+                data = yf.download(
+                    " ".join(search_map), period=period, interval=interval,
+                    group_by='ticker', auto_adjust=True, threads=False, progress=False,
+                    ignore_tz=False  # exchange tz, like Ticker.history
+                )
+            except Exception as e:
+                print(f"[YFinance] Batch history error: {e}")
+                continue
+
+            if data.empty:
+                continue
+
+            # Older yfinance versions return flat columns for a single ticker
+            if not isinstance(data.columns, pd.MultiIndex):
+                frames[chunk[0]] = data
+                continue
+
+            for search_sym, symbol in search_map.items():
+                if search_sym in data.columns.get_level_values(0):
+                    frames[symbol] = data[search_sym].dropna(how="all")
+
+        return make_panel(frames)
+
     def get_current_price(self, symbol: str) -> float:
         try:
-            search_symbol = symbol if symbol.endswith(".NS") else f"{symbol}.NS"
+            search_symbol = nse_symbol(symbol)
             ticker = yf.Ticker(search_symbol)
             # Fast fetch using fast_info or history
             # history(period='1d') is safer than fast_info for reliability
@@ -37,7 +79,7 @@ class YFinanceProvider(DataProvider):
             
         results = {}
         # yfinance allows space-separated tickers
-        formatted_symbols = [s if s.endswith(".NS") else f"{s}.NS" for s in symbols]
+        formatted_symbols = [nse_symbol(s) for s in symbols]
         tickers_str = " ".join(formatted_symbols)
         
         try:
@@ -56,7 +98,7 @@ class YFinanceProvider(DataProvider):
                     results[symbol] = float(val)
             else:
                 for symbol in symbols:
-                    search_sym = symbol if symbol.endswith(".NS") else f"{symbol}.NS"
+                    search_sym = nse_symbol(symbol)
                     try:
                         if search_sym in data.columns.levels[0]:
                             val = data[search_sym]['Close'].iloc[-1]
@@ -70,7 +112,7 @@ class YFinanceProvider(DataProvider):
 
     def get_ticker_info(self, symbol: str) -> Dict:
         try:
-            search_symbol = symbol if symbol.endswith(".NS") else f"{symbol}.NS"
+            search_symbol = nse_symbol(symbol)
             ticker = yf.Ticker(search_symbol)
             return ticker.info
         except:
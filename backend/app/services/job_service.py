@@ -0,0 +1,186 @@
+"""
+Job Service - Long-running analytics in the background
+Scans, sweeps, universe and walk-forward backtests are submitted as jobs,
+polled (or streamed) for progress and fetched when done, so they don't
+hold a request open behind a proxy timeout.
+Each job drives the compute pool from its own thread; work started by the
+job reports progress and partial results to it and stops when it is cancelled.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ..config import JOB_MAX_CONCURRENT, JOB_RESULT_TTL, JOB_MAX_RETAINED
+from .compute_pool import PoolContext, JobCancelled, pool_context, get_pool_stats
+
+logger = logging.getLogger(__name__)
+
+FINISHED = ("done", "failed", "cancelled")
+
+
+class Job(PoolContext):
+    """One submitted job and its state (queued, running, done, failed, cancelled)"""
+
+    def __init__(self, kind: str, params: Optional[dict] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params or {}
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.tasks_done = 0
+        self.tasks_total = 0
+        self.partial: List[Any] = []
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def on_task_done(self, done: int, total: int, result):
+        self.tasks_done, self.tasks_total = done, total
+
+    def on_partial(self, items: list):
+        # Append-only: readers slice from their last offset without locking
+        self.partial.extend(items)
+
+    def eta_seconds(self) -> Optional[float]:
+        """Remaining time at the average pace so far, None until something finished"""
+        if self.status != "running" or not self.tasks_done or not self.tasks_total:
+            return None
+        elapsed = time.time() - self.started_at
+        return round(elapsed / self.tasks_done * (self.tasks_total - self.tasks_done), 1)
+
+    def to_dict(self) -> dict:
+        """Status without the result"""
+        return {
+            "jobId": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "progress": {
+                "done": self.tasks_done,
+                "total": self.tasks_total,
+                "percent": round(self.tasks_done / self.tasks_total * 100, 1) if self.tasks_total else None,
+                "etaSeconds": self.eta_seconds(),
+            },
+            "partialResults": len(self.partial),
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "error": self.error,
+        }
+
+
+_jobs: Dict[str, Job] = {}
+_lock = threading.Lock()
+_runner = ThreadPoolExecutor(max_workers=max(1, JOB_MAX_CONCURRENT), thread_name_prefix="job")
+
+
+def _run_job(job: Job, fn: Callable, args: tuple, kwargs: dict):
+    if job.cancelled():
+        # Cancelled after the runner picked it up but before it started
+        job.status = "cancelled"
+        job.finished_at = time.time()
+        return
+    job.status = "running"
+    job.started_at = time.time()
+    token = pool_context.set(job)
+    try:
+        result = fn(*args, **kwargs)
+        if job.cancelled():
+            job.status = "cancelled"
+        elif isinstance(result, dict) and result.get("success") is False:
+            job.status, job.error, job.result = "failed", result.get("error"), result
+        else:
+            job.status, job.result = "done", result
+    except JobCancelled:
+        job.status = "cancelled"
+    except Exception as e:
+        logger.error(f"Job {job.id} ({job.kind}) failed: {e}")
+        job.status, job.error = "failed", str(e)
+    finally:
+        pool_context.reset(token)
+        job.finished_at = time.time()
+
+
+def _prune():
+    """Drop expired finished jobs, then the oldest beyond JOB_MAX_RETAINED"""
+    now = time.time()
+    with _lock:
+        finished = [j for j in _jobs.values() if j.status in FINISHED]
+        for job in finished:
+            if now - (job.finished_at or now) > JOB_RESULT_TTL:
+                del _jobs[job.id]
+        finished = [j for j in finished if j.id in _jobs]
+        for job in finished[:max(0, len(finished) - JOB_MAX_RETAINED)]:
+            del _jobs[job.id]
+
+
+def submit_job(kind: str, fn: Callable, *args, params: Optional[dict] = None, **kwargs) -> Job:
+    """Queue fn(*args, **kwargs) as a background job"""
+    _prune()
+    job = Job(kind, params)
+    with _lock:
+        _jobs[job.id] = job
+    job.future = _runner.submit(_run_job, job, fn, args, kwargs)
+    return job
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    return _jobs.get(job_id)
+
+
+def find_active_job(kind: str) -> Optional[Job]:
+    """A queued or running job of this kind, if any"""
+    with _lock:
+        jobs = list(_jobs.values())
+    return next((j for j in jobs if j.kind == kind and j.status not in FINISHED), None)
+
+
+def list_jobs() -> List[dict]:
+    _prune()
+    with _lock:
+        jobs = list(_jobs.values())
+    return [job.to_dict() for job in reversed(jobs)]
+
+
+def cancel_job(job_id: str) -> Optional[Job]:
+    """
+    Cancel a queued or running job. Pool tasks not yet started are
+    dropped; tasks already on a worker finish but their results are discarded.
+    """
+    job = _jobs.get(job_id)
+    if job is None or job.status in FINISHED:
+        return job
+    job._cancel.set()
+    if job.future is not None and job.future.cancel():
+        job.status = "cancelled"
+        job.finished_at = time.time()
+    return job
+
+
+def get_job_stats() -> dict:
+    """Job counts by status plus compute pool queue depth and utilisation"""
+    with _lock:
+        statuses = [j.status for j in _jobs.values()]
+    return {
+        "jobs": {status: statuses.count(status) for status in ("queued", "running", *FINISHED)},
+        "maxConcurrent": max(1, JOB_MAX_CONCURRENT),
+        "pool": get_pool_stats(),
+    }
+
+
+def shutdown_jobs():
+    """Cancel outstanding jobs (called on application shutdown)"""
+    with _lock:
+        jobs = list(_jobs.values())
+    for job in jobs:
+        cancel_job(job.id)
+    _runner.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,7 @@
 import logging
 import yfinance as yf
 from typing import List, Dict
+from ..utils.async_utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +13,7 @@ async def get_stock_news(symbol: str) -> List[Dict]:
         # ticker.news returns a list of dicts
         # [{'uuid': '...', 'title': '...', 'publisher': '...', 'link': '...', 'providerPublishTime': ...}]
         ticker = yf.Ticker(symbol)
-        news_items = ticker.news
+        news_items = await run_blocking(lambda: ticker.news)
         
         results = []
         if news_items:
@@ -0,0 +1,228 @@
+"""
+OHLCV Store - Persistent daily bars under DATA_DIR
+Each symbol is a structured NumPy file that is memory-mapped on read and
+rewritten atomically when new bars are appended, plus a small JSON sidecar
+recording how far back the data goes and when it was last refreshed.
+
+Bars are keyed by their exchange-local trading date (midnight, tz-naive),
+so tz-aware Ticker.history bars and tz-naive download bars of the same day
+land on the same key; the exchange tz is kept in the sidecar and restored
+on read.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import OHLCV_STORE_DIR, OHLCV_REFRESH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+_FIELDS = {"Open": "open", "High": "high", "Low": "low", "Close": "close", "Volume": "volume"}
+
+# Calendar days covered by each yfinance-style period
+PERIOD_DAYS = {
+    "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183,
+    "1y": 366, "2y": 731, "5y": 1827, "10y": 3653,
+}
+# Smallest first: used to pick the cheapest request that covers a gap
+DELTA_PERIODS = ["5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y"]
+
+_DAY = 86400
+
+
+def _trading_dates(index: pd.DatetimeIndex) -> pd.DatetimeIndex:
+    """Exchange-local calendar date of each daily bar, as naive midnight"""
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)   # wall time in the exchange tz
+    return index.normalize()
+
+
+class OHLCVStore:
+    """Per-symbol daily OHLCV bars persisted as memory-mapped NumPy files"""
+
+    def __init__(self, root: Path, refresh_seconds: float = 300):
+        self.root = Path(root)
+        self.refresh_seconds = refresh_seconds
+        self._meta = {}
+        self._locks = defaultdict(threading.Lock)
+        self._locks_guard = threading.Lock()
+
+    @staticmethod
+    def supports(period: str, interval: str) -> bool:
+        """Only daily bars over a fixed lookback are stored"""
+        return interval == "1d" and period in PERIOD_DAYS
+
+    def _lock(self, symbol: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks[symbol]
+
+    def _paths(self, symbol: str) -> tuple[Path, Path]:
+        safe = symbol.replace("/", "_").replace("^", "_")
+        return self.root / f"{safe}.npy", self.root / f"{safe}.json"
+
+    def get_meta(self, symbol: str) -> Optional[dict]:
+        """Stored range info: tz, span_start, last_ts and fetched_at (epoch seconds)"""
+        if symbol in self._meta:
+            return self._meta[symbol]
+        _, meta_path = self._paths(symbol)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        self._meta[symbol] = meta
+        return meta
+
+    def last_bar(self, symbol: str) -> Optional[int]:
+        """Timestamp (ns) of the latest stored bar, without touching the bar file"""
+        meta = self.get_meta(symbol)
+        return meta["last_ts"] if meta else None
+
+    def plan_fetch(self, symbol: str, period: str) -> Optional[str]:
+        """
+        Period to request from the provider so the store can serve `period`.
+        Returns None when the stored bars are recent enough to serve as is.
+        """
+        meta = self.get_meta(symbol)
+        now = time.time()
+        days = PERIOD_DAYS[period]
+
+        if meta is None or meta["span_start"] > now - days * _DAY:
+            return period
+        if now - meta["fetched_at"] < self.refresh_seconds:
+            return None
+
+        # Re-request the last stored bar too: it may have been a partial day
+        gap_days = (now - meta["last_ts"] / 1e9) / _DAY
+        for delta in DELTA_PERIODS:
+            if PERIOD_DAYS[delta] > gap_days + 1:
+                return delta if PERIOD_DAYS[delta] < days else period
+        return period
+
+    def _read_all(self, symbol: str) -> Optional[np.ndarray]:
+        bars_path, _ = self._paths(symbol)
+        try:
+            return np.load(bars_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _to_index(ts: np.ndarray, tz: Optional[str]) -> pd.DatetimeIndex:
+        index = pd.to_datetime(ts, unit="ns")
+        return index.tz_localize(tz) if tz else index
+
+    @staticmethod
+    def _window_start(bars: np.ndarray, period: str) -> int:
+        """Index of the first stored bar inside the last `period`"""
+        cutoff = int((time.time() - PERIOD_DAYS[period] * _DAY) * 1e9)
+        return int(np.searchsorted(bars["ts"], cutoff))
+
+    def read(self, symbol: str, period: str) -> pd.DataFrame:
+        """Stored bars covering the last `period`, as a provider-style DataFrame"""
+        meta = self.get_meta(symbol)
+        bars = self._read_all(symbol)
+        if meta is None or bars is None or len(bars) == 0:
+            return pd.DataFrame()
+
+        start = self._window_start(bars, period)
+        window = np.array(bars[start:])  # copy out of the memory map
+
+        index = self._to_index(window["ts"], meta.get("tz"))
+        return pd.DataFrame(
+            {column: window[field] for column, field in _FIELDS.items()},
+            index=index
+        )
+
+    def fingerprint(self, symbol: str, period: str) -> Optional[tuple]:
+        """
+        history_fingerprint() of read(symbol, period), from the first and
+        last rows of the memory map without building a DataFrame
+        """
+        meta = self.get_meta(symbol)
+        bars = self._read_all(symbol)
+        if meta is None or bars is None or len(bars) == 0:
+            return None
+        start = self._window_start(bars, period)
+        if start >= len(bars):
+            return None
+        first, last = self._to_index(np.array([bars["ts"][start], bars["ts"][-1]]), meta.get("tz")).asi8
+        return (int(first), int(last), float(bars["close"][-1]), len(bars) - start)
+
+    def update(self, symbol: str, fetched: pd.DataFrame, span_days: Optional[int] = None):
+        """
+        Merge freshly fetched bars into the store.
+        Overlapping bars are replaced by the fetched ones. Pass `span_days`
+        when `fetched` is a full lookback rather than a delta.
+        """
+        if fetched is None or fetched.empty or "Close" not in fetched.columns:
+            return
+        fetched = fetched.dropna(subset=["Close"])
+        if fetched.empty:
+            return
+
+        index = fetched.index
+        tz = str(index.tz) if getattr(index, "tz", None) is not None else None
+
+        new_bars = np.empty(len(fetched), dtype=BAR_DTYPE)
+        new_bars["ts"] = _trading_dates(index).as_unit("ns").asi8
+        for column, field in _FIELDS.items():
+            new_bars[field] = fetched[column].to_numpy(dtype=float) if column in fetched.columns else np.nan
+        # One bar per trading date, the last one fetched winning
+        _, last = np.unique(new_bars["ts"][::-1], return_index=True)
+        new_bars = new_bars[len(new_bars) - 1 - last]
+
+        with self._lock(symbol):
+            meta = self.get_meta(symbol)
+            # A tz-naive delta doesn't say the exchange tz; keep the stored one
+            tz = tz or (meta or {}).get("tz")
+            old_bars = self._read_all(symbol)
+            if old_bars is not None and len(old_bars):
+                keep = np.array(old_bars[old_bars["ts"] < new_bars["ts"][0]])
+                new_bars = np.concatenate([keep, new_bars])
+
+            now = time.time()
+            span_start = meta["span_start"] if meta else now
+            if span_days is not None:
+                span_start = min(span_start, now - span_days * _DAY)
+
+            meta = {
+                "tz": tz,
+                "span_start": span_start,
+                "last_ts": int(new_bars["ts"][-1]),
+                "fetched_at": now,
+            }
+            self._write(symbol, new_bars, meta)
+            self._meta[symbol] = meta
+
+    def _write(self, symbol: str, bars: np.ndarray, meta: dict):
+        self.root.mkdir(parents=True, exist_ok=True)
+        bars_path, meta_path = self._paths(symbol)
+
+        # Write to temp files and swap in, so readers never see a torn file
+        tmp_bars = bars_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_bars, "wb") as f:
+            np.save(f, bars)
+        os.replace(tmp_bars, bars_path)
+
+        tmp_meta = meta_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_meta, meta_path)
+
+
+# Global instance shared by the stored history provider
+ohlcv_store = OHLCVStore(OHLCV_STORE_DIR, OHLCV_REFRESH_SECONDS)
@@ -0,0 +1,233 @@
+"""
+Price Bus
+Live prices fetched once and delivered to every worker process.
+
+With several uvicorn/gunicorn workers each one has its own websocket
+clients, caches and background loop. The bus elects one worker as the
+producer that polls the provider, checks alerts and runs the scheduled
+scans; every worker (producer included) receives each published price
+update and fans it out to its own clients, and the other workers adopt
+each published scan instead of rescanning.
+
+Backends:
+    local - single process, the only worker is always the producer (default)
+    unix  - workers on one host: the producer holds an flock on
+            PRICE_BUS_PATH + ".lock" and serves updates on the Unix socket
+            at PRICE_BUS_PATH; the others follow it and take over when the
+            lock is released.
+"""
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from ..config import PRICE_BUS, PRICE_BUS_PATH, PRICE_BUS_RETRY, PRICE_BUS_MAX_BUFFER
+from ..utils.serialization import dumps, loads
+
+try:
+    import fcntl
+except ImportError:  # optional: not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PriceHandler = Callable[[Dict[str, float]], Awaitable[None]]
+ScanHandler = Callable[[dict], Awaitable[None]]
+
+
+class PriceBus:
+    """In-process bus: publish() delivers straight to this worker's handlers"""
+
+    backend = "local"
+
+    def __init__(self):
+        self.handlers: List[PriceHandler] = []
+        self.scan_handlers: List[ScanHandler] = []
+        self.published = 0
+        self.received = 0
+
+    def subscribe(self, handler: PriceHandler):
+        self.handlers.append(handler)
+
+    def subscribe_scans(self, handler: ScanHandler):
+        """Called with each scan the producer publishes (other workers only)"""
+        self.scan_handlers.append(handler)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def elect(self) -> bool:
+        """Whether this worker is the producer (trying to become it if not)"""
+        return True
+
+    async def publish(self, prices: Dict[str, float]):
+        """Deliver prices to every worker; only the producer publishes"""
+        self.published += 1
+        await self._deliver(prices)
+
+    async def publish_scan(self, scan: dict):
+        """Hand a published scan to the other workers; there are none here"""
+        pass
+
+    async def _deliver(self, prices: Dict[str, float]):
+        self.received += 1
+        for handler in self.handlers:
+            try:
+                await handler(prices)
+            except Exception as e:
+                logger.error(f"Price bus handler failed: {e}")
+
+    async def _deliver_scan(self, scan: dict):
+        for handler in self.scan_handlers:
+            try:
+                await handler(scan)
+            except Exception as e:
+                logger.error(f"Price bus scan handler failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "producer": self.is_producer,
+            "published": self.published,
+            "received": self.received,
+        }
+
+    @property
+    def is_producer(self) -> bool:
+        return True
+
+
+class UnixSocketPriceBus(PriceBus):
+    """Workers on one host: flock election, newline-delimited JSON over a Unix socket"""
+
+    backend = "unix"
+
+    def __init__(self, path: str = PRICE_BUS_PATH, retry: float = PRICE_BUS_RETRY):
+        super().__init__()
+        self.path = path
+        self.retry = retry
+        self._lock_fd: Optional[int] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._followers: set = set()
+        self._follow_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_producer(self) -> bool:
+        return self._lock_fd is not None
+
+    async def start(self):
+        if not await self.elect():
+            self._follow_task = asyncio.create_task(self._follow())
+
+    async def stop(self):
+        if self._follow_task is not None:
+            self._follow_task.cancel()
+            self._follow_task = None
+        for writer in list(self._followers):
+            writer.close()
+        self._followers.clear()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        if self._lock_fd is not None:
+            # Closing the descriptor releases the lock for a follower to take over
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def elect(self) -> bool:
+        if self._lock_fd is not None:
+            return True
+        fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        self._lock_fd = fd
+        # Holding the lock: any socket file left behind is stale
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self._server = await asyncio.start_unix_server(self._on_follower, path=self.path)
+        logger.info(f"Price bus: this worker (pid {os.getpid()}) is the price producer")
+        return True
+
+    async def _on_follower(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._followers.add(writer)
+        try:
+            # Followers only listen; wait for them to hang up
+            await reader.read()
+        finally:
+            self._followers.discard(writer)
+            writer.close()
+
+    async def publish(self, prices: Dict[str, float]):
+        self.published += 1
+        self._send({"prices": prices})
+        await self._deliver(prices)
+
+    async def publish_scan(self, scan: dict):
+        self._send({"scan": scan})
+
+    def _send(self, message: dict):
+        """Write one message line to every follower"""
+        line = dumps(message) + b"\n"
+        for writer in list(self._followers):
+            # Writes are buffered by the transport; a follower that stops
+            # reading is dropped instead of growing the buffer without bound
+            if writer.transport.get_write_buffer_size() > PRICE_BUS_MAX_BUFFER:
+                logger.warning("Price bus: dropping a follower that stopped reading")
+                self._followers.discard(writer)
+                writer.close()
+                continue
+            writer.write(line)
+
+    async def _follow(self):
+        """Receive the producer's updates; take over if it goes away"""
+        while True:
+            try:
+                # Scan messages are much longer than the default 64 KiB line limit
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=PRICE_BUS_MAX_BUFFER)
+            except OSError:
+                reader = None
+            if reader is not None:
+                try:
+                    while line := await reader.readline():
+                        message = loads(line)
+                        if "scan" in message:
+                            await self._deliver_scan(message["scan"])
+                        else:
+                            await self._deliver(message["prices"])
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Price bus connection lost: {e}")
+                finally:
+                    writer.close()
+
+            if await self.elect():
+                return
+            await asyncio.sleep(self.retry)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "followers": len(self._followers) if self.is_producer else None}
+
+
+def create_price_bus(backend: str = PRICE_BUS) -> PriceBus:
+    if backend == "unix":
+        if fcntl is None:
+            logger.warning("Price bus: unix backend needs fcntl, using the in-process bus")
+        else:
+            return UnixSocketPriceBus()
+    return PriceBus()
+
+
+# Global instance to be shared across the app
+price_bus = create_price_bus()
@@ -0,0 +1,130 @@
+"""
+Price Poll Scheduler
+Decides which symbols the price updater fetches on each tick.
+
+Symbols someone is looking at (websocket subscriptions, watchlist, active
+alerts) are "hot" and polled on a short interval while the market is open;
+the rest of the active list is polled less often, and everything backs off
+to a poll every few hours once the market is closed. A change of market
+status makes every symbol due once, so the opening and closing prices are
+picked up promptly.
+"""
+import logging
+import math
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from sqlmodel import Session, select
+
+from ..config import PRICE_POLL_INTERVALS, PRICE_POLL_MIN_SLEEP, PRICE_POLL_HOT_REFRESH
+from ..database import engine
+from ..models import Alert, WatchlistItem
+from . import stock_service
+from .websocket_manager import manager
+
+logger = logging.getLogger(__name__)
+
+
+def clean_symbol(symbol: str) -> str:
+    """Key used for live prices: RELIANCE.NS -> RELIANCE"""
+    return symbol.strip().upper().replace('.NS', '')
+
+
+def provider_symbol(symbol: str) -> str:
+    """Symbol as the provider expects it: RELIANCE -> RELIANCE.NS (indices unchanged)"""
+    return symbol if symbol.startswith('^') or '.' in symbol else f"{symbol}.NS"
+
+
+class PollScheduler:
+    """Last poll time per symbol and the intervals that make it due again"""
+
+    def __init__(self, intervals: Dict[str, Dict[str, float]] = PRICE_POLL_INTERVALS):
+        self.intervals = intervals
+        self.status: Optional[str] = None
+        self.hot: FrozenSet[str] = frozenset()
+        self.universe: List[str] = []
+        self.last_polled: Dict[str, float] = {}
+        self.polls = 0
+        self.symbols_polled = 0
+
+    def interval(self, symbol: str) -> float:
+        tiers = self.intervals.get(self.status, self.intervals["closed"])
+        return tiers["hot"] if symbol in self.hot else tiers["cold"]
+
+    def plan(self, status: str, symbols: Iterable[str], hot: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """Symbols due for a poll (clean names), hot ones first"""
+        now = time.monotonic() if now is None else now
+        if status != self.status:
+            # Opening/closing: refresh everything once at the new cadence
+            self.status = status
+            self.last_polled.clear()
+        self.hot = frozenset(hot)
+        self.universe = list(dict.fromkeys([*sorted(self.hot), *symbols]))
+        return [
+            s for s in self.universe
+            if now - self.last_polled.get(s, -math.inf) >= self.interval(s)
+        ]
+
+    def mark_polled(self, symbols: List[str], now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        for s in symbols:
+            self.last_polled[s] = now
+        if symbols:
+            self.polls += 1
+            self.symbols_polled += len(symbols)
+
+    def next_delay(self, now: Optional[float] = None) -> float:
+        """Seconds until the next symbol falls due"""
+        now = time.monotonic() if now is None else now
+        if not self.universe:
+            return self.intervals.get(self.status, self.intervals["closed"])["cold"]
+        remaining = min(
+            self.last_polled.get(s, -math.inf) + self.interval(s) - now
+            for s in self.universe
+        )
+        return max(PRICE_POLL_MIN_SLEEP, remaining)
+
+    def stats(self) -> dict:
+        return {
+            "marketStatus": self.status,
+            "hotSymbols": len(self.hot),
+            "symbols": len(self.universe),
+            "intervals": self.intervals.get(self.status),
+            "polls": self.polls,
+            "symbolsPolled": self.symbols_polled,
+        }
+
+
+_saved_hot: FrozenSet[str] = frozenset()
+_saved_hot_at = -math.inf
+
+
+def _saved_hot_symbols() -> FrozenSet[str]:
+    """Watchlisted and actively alerted symbols, reloaded every PRICE_POLL_HOT_REFRESH"""
+    global _saved_hot, _saved_hot_at
+    now = time.monotonic()
+    if now - _saved_hot_at >= PRICE_POLL_HOT_REFRESH:
+        try:
+            with Session(engine) as session:
+                watched = session.exec(select(WatchlistItem.symbol)).all()
+                alerted = session.exec(select(Alert.symbol).where(Alert.active == True)).all()  # noqa: E712
+            _saved_hot = frozenset(clean_symbol(s) for s in [*watched, *alerted])
+        except Exception as e:
+            logger.error(f"Could not load watched symbols: {e}")
+        _saved_hot_at = now
+    return _saved_hot
+
+
+def hot_symbols() -> FrozenSet[str]:
+    """Symbols someone is watching: saved in the app or subscribed to live"""
+    return _saved_hot_symbols() | manager.subscribed_symbols()
+
+
+def due_symbols(status: str) -> List[str]:
+    """Symbols (clean names) to poll now for the given market status"""
+    active = [clean_symbol(s) for s in stock_service.active_stock_list["symbols"]]
+    return poll_scheduler.plan(status, active, hot_symbols())
+
+
+# Global instance to be shared across the app
+poll_scheduler = PollScheduler()
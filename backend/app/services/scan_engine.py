@@ -0,0 +1,109 @@
+"""
+Scan Engine - Bounded concurrent execution for per-symbol provider work
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, List, Optional, Sequence
+
+from ..config import SCAN_CONCURRENCY, SCAN_SYMBOL_TIMEOUT, SCAN_MAX_HUNG
+from ..utils.throttle import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# How often the engine wakes up to check for timed out tasks
+_POLL_INTERVAL = 0.25
+
+
+def run_bounded(
+    items: Sequence,
+    worker: Callable,
+    concurrency: int = SCAN_CONCURRENCY,
+    timeout: float = SCAN_SYMBOL_TIMEOUT,
+    rate_budget: Optional[TokenBucket] = None,
+    on_result: Optional[Callable[[int, Any], None]] = None,
+    max_hung: int = SCAN_MAX_HUNG
+) -> List:
+    """
+    Run `worker(item)` for every item with at most `concurrency` in flight.
+
+    Each task draws one token from `rate_budget` before it starts and is
+    abandoned once it has been running for longer than `timeout` seconds.
+    An abandoned task's thread can't be stopped, so the pool keeps `max_hung`
+    spare threads that take over its slot. Once more than `max_hung` tasks
+    have hung no more items are started: the rest yield None instead of
+    queueing behind stuck calls, so a run leaves at most
+    `concurrency + max_hung` threads behind.
+    Results keep the order of `items`; failed or timed out tasks yield None.
+    `on_result(index, result)` is called from the calling thread as each
+    task finishes, fails or times out; an exception it raises stops the run.
+    """
+    results = [None] * len(items)
+    if not items:
+        return results
+
+    started = {}
+
+    def _run(index, item):
+        if rate_budget is not None:
+            rate_budget.acquire()
+        started[index] = time.monotonic()
+        return worker(item)
+
+    concurrency = max(1, concurrency)
+    pool = ThreadPoolExecutor(max_workers=concurrency + max(0, max_hung), thread_name_prefix="scan")
+    queued = iter(enumerate(items))
+    futures = {}
+    pending = set()
+    hung = 0
+
+    def _submit():
+        """Start queued items until `concurrency` are in flight"""
+        for index, item in queued:
+            future = pool.submit(_run, index, item)
+            futures[future] = index
+            pending.add(future)
+            if len(pending) >= concurrency:
+                return
+
+    try:
+        _submit()
+        while pending:
+            done, pending = wait(pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Scan task failed for {items[index]}: {e}")
+                if on_result is not None:
+                    on_result(index, results[index])
+
+            # Abandon tasks that have been running past their deadline.
+            # The thread can't be killed, but its result is ignored.
+            now = time.monotonic()
+            expired = {
+                f for f in pending
+                if futures[f] in started and now - started[futures[f]] > timeout
+            }
+            for future in expired:
+                logger.warning(f"Scan task timed out after {timeout:.0f}s: {items[futures[future]]}")
+                if on_result is not None:
+                    on_result(futures[future], None)
+            pending -= expired
+            hung += len(expired)
+
+            if hung <= max_hung:
+                _submit()
+            elif not pending:
+                skipped = list(queued)
+                if skipped:
+                    logger.warning(f"{hung} scan tasks hung; giving up {len(skipped)} not yet started")
+                for index, _ in skipped:
+                    if on_result is not None:
+                        on_result(index, None)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return results
@@ -0,0 +1,61 @@
+"""
+Scan Snapshot Service
+Holds the latest published scan so /api/scan can serve it without rescanning.
+"""
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from ..utils.serialization import CachedPayload
+
+
+@dataclass(frozen=True)
+class ScanSnapshot:
+    """One published scan. Never mutated; a rescan publishes a new one."""
+    version: int
+    etag: str
+    universe: str
+    market_status: str
+    generated_at: str
+    results: tuple
+    payload: CachedPayload  # results pre-encoded as a JSON array
+
+
+_current: Optional[ScanSnapshot] = None
+_lock = threading.Lock()
+
+
+def get_snapshot() -> Optional[ScanSnapshot]:
+    """Latest published snapshot, or None before the first scan"""
+    return _current
+
+
+def publish_snapshot(results: list, universe: str, market_status: str) -> ScanSnapshot:
+    """
+    Publish scan results as a new snapshot.
+    If the content is unchanged the current snapshot (and its ETag) is kept,
+    so clients polling with If-None-Match keep getting 304s.
+    """
+    global _current
+    # Encoded once with sorted keys: the bytes are both the ETag source
+    # and the response body
+    payload = CachedPayload.encode(results, sort_keys=True)
+    digest = hashlib.sha1(payload.body).hexdigest()[:20]
+
+    with _lock:
+        if _current is not None and _current.universe == universe and _current.etag == f'"{digest}"':
+            return _current
+
+        version = (_current.version + 1) if _current else 1
+        _current = ScanSnapshot(
+            version=version,
+            etag=f'"{digest}"',
+            universe=universe,
+            market_status=market_status,
+            generated_at=datetime.now().isoformat(),
+            results=tuple(results),
+            payload=payload,
+        )
+        return _current
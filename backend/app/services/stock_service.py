@@ -1,25 +1,33 @@
 """
 Stock Service - Stock data fetching and processing
 """
+import hashlib
 import logging
 import random
 import pandas as pd
 import yfinance as yf
 import numpy as np
+from datetime import datetime
 from typing import Optional, List, Dict
 
 from ..config import (
     MAX_DEBT_RATIO, MAX_CASH_RATIO, DEFAULT_STOCKS,
-    CSV_FILE, WS_BATCH_SIZE
-)
-from ..utils.indicators import (
-    calculate_rsi, calculate_sma, calculate_ema, calculate_macd,
-    calculate_bollinger_bands, calculate_volume_ma, generate_rsi_signal,
-    generate_macd_signal, generate_bollinger_signal, generate_ma_signal, calculate_composite_score,
-    calculate_stop_loss, calculate_take_profit, calculate_potential_gain
+    CSV_FILE, WS_BATCH_SIZE, HISTORY_BATCH_SIZE, SCAN_BATCH_TIMEOUT, SCAN_SYMBOL_TIMEOUT,
+    SCAN_POOL_MIN_SYMBOLS, PRICE_TABLE_SHARED, PRICE_TABLE_NAME, PRICE_TABLE_SLOTS
 )
+from ..utils.indicators import calculate_stop_loss, calculate_take_profit, calculate_potential_gain
+from ..utils.panel_indicators import calculate_panel_indicators
+from ..utils.streaming_indicators import SymbolIndicatorState
+from ..utils.market_utils import IST, get_market_status
 from ..utils.cache import stock_data_cache, history_cache
-from .data_provider.factory import current_provider
+from ..utils.async_utils import run_blocking
+from ..utils.singleflight import SingleFlight
+from ..utils.serialization import CachedPayload
+from ..utils.downsample import bucket_ohlcv
+from ..utils.price_table import open_price_table
+from .data_provider.factory import current_provider, current_rate_budget
+from .scan_engine import run_bounded
+from .compute_pool import map_in_pool, SharedFrames, FrameRef, shared_frame, pool_context, JobCancelled
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +39,10 @@ active_stock_list = {
 }
 stock_metadata = {}
 cached_stock_data = {}
-live_prices = {} # New: global cache for live prices
+# Latest live price per symbol; shared between workers when PRICE_TABLE_SHARED
+live_prices = open_price_table(PRICE_TABLE_SLOTS, PRICE_TABLE_NAME if PRICE_TABLE_SHARED else None)
+indicator_states: Dict[str, SymbolIndicatorState] = {}  # streaming technicals per clean symbol
+_history_flight = SingleFlight()
 
 
 
@@ -77,9 +88,9 @@ def get_shariah_status(symbol: str) -> dict:
     Generate Shariah compliance check (mock data)
     In production, this would use actual financial data
     """
-    random.seed(hash(symbol))
-    debt_ratio = round(random.uniform(10, 50), 1)
-    cash_ratio = round(random.uniform(5, 40), 1)
+    rng = random.Random(hash(symbol))  # local generator: scans run in parallel threads
+    debt_ratio = round(rng.uniform(10, 50), 1)
+    cash_ratio = round(rng.uniform(5, 40), 1)
     
     is_halal = debt_ratio < MAX_DEBT_RATIO and cash_ratio < MAX_CASH_RATIO
     
@@ -92,20 +103,57 @@ def get_shariah_status(symbol: str) -> dict:
 
 
 def get_stock_history(symbol: str, period: str = "1y") -> list:
+    """Chart history as a list of OHLCV dicts (see get_stock_history_payload)"""
+    payload = get_stock_history_payload(symbol, period)
+    return payload.data() if payload is not None else []
+
+
+# Bar spacing per chart interval, used as the columnar time unit
+HISTORY_INTERVAL_SECONDS = {"5m": 300, "15m": 900, "1h": 3600, "1d": 86400}
+HISTORY_PRICE_DECIMALS = 4  # columnar prices are rounded to this many places
+
+
+def get_stock_history_payload(
+    symbol: str,
+    period: str = "1y",
+    fmt: str = "rows",
+    points: Optional[int] = None
+) -> Optional[CachedPayload]:
     """
     Fetch historical data for charts with appropriate intervals
     1d -> 5m interval
     5d -> 15m interval
     1mo -> 1h interval
     others -> 1d interval
+
+    fmt="rows" gives the classic list of {date, open, ...} objects;
+    fmt="columnar" gives parallel arrays (see _format_columnar).
+    points caps the number of bars: consecutive bars are merged into
+    OHLC candles (see bucket_ohlcv) so highs and lows are kept.
+    Cached as pre-encoded JSON so hot chart reads skip rebuilding and
+    re-encoding the bars. Returns None when no history is available.
     """
     # Check cache first
-    cache_key = f"{symbol}:{period}"
+    cache_key = f"{symbol}:{period}" if fmt == "rows" else f"{symbol}:{period}:{fmt}"
+    if points:
+        cache_key += f":{points}"
     cached_data = history_cache.get(cache_key)
     if cached_data is not None:
-        logger.debug(f"Cache hit: History for {symbol} ({period})")
+        logger.debug(f"Cache hit: History for {symbol} ({period}, {fmt})")
         return cached_data
     
+    # Concurrent misses for the same chart share one provider call
+    return _history_flight.do(cache_key, _load_stock_history, symbol, period, fmt, points, cache_key)
+
+
+def _load_stock_history(
+    symbol: str,
+    period: str,
+    fmt: str,
+    points: Optional[int],
+    cache_key: str
+) -> Optional[CachedPayload]:
+    """Fetch, encode and cache chart history (cache miss path)"""
     try:
         # Map frontend period codes to yfinance codes
         period_map = {
@@ -133,29 +181,81 @@ def get_stock_history(symbol: str, period: str = "1y") -> list:
         
         if history.empty:
             logger.warning(f"No history found for {symbol}")
-            return []
+            return None
+        
+        if points:
+            history = bucket_ohlcv(history, points)
             
-        # Format for frontend and sanitize NaNs
-        formatted_data = []
-        for date, row in history.iterrows():
-            formatted_data.append({
-                "date": date.isoformat(),
-                "open": item_value(row['Open']),
-                "high": item_value(row['High']),
-                "low": item_value(row['Low']),
-                "close": item_value(row['Close']),
-                "volume": int(item_value(row['Volume']))
-            })
+        if fmt == "columnar":
+            formatted_data = _format_columnar(history, interval)
+        else:
+            formatted_data = _format_rows(history)
         
-        # Cache the result
-        history_cache[cache_key] = formatted_data
-        logger.debug(f"Cached history for {symbol} ({period})")
+        # Cache the encoded result
+        payload = CachedPayload.encode(formatted_data)
+        history_cache[cache_key] = payload
+        logger.debug(f"Cached history for {symbol} ({period}, {fmt})")
         
-        return formatted_data
+        return payload
         
     except Exception as e:
         logger.error(f"Error fetching history for {symbol}: {e}")
-        return []
+        return None
+
+
+def _format_rows(history: pd.DataFrame) -> list:
+    """One {date, open, high, low, close, volume} dict per bar, NaNs as 0"""
+    columns = {
+        field: history[column].fillna(0).astype(float).tolist()
+        for field, column in (("open", "Open"), ("high", "High"), ("low", "Low"), ("close", "Close"))
+    }
+    volumes = history['Volume'].fillna(0).astype('int64').tolist()
+    return [
+        {"date": date, "open": o, "high": h, "low": l, "close": c, "volume": v}
+        for date, o, h, l, c, v in zip(
+            [d.isoformat() for d in history.index],
+            columns["open"], columns["high"], columns["low"], columns["close"], volumes
+        )
+    ]
+
+
+def _format_columnar(history: pd.DataFrame, interval: str) -> dict:
+    """
+    Parallel arrays instead of per-bar objects.
+    Bar i is at epoch second `start + t[i] * step`; `step` is the bar
+    interval, or 1 when the bars don't sit on a whole number of intervals
+    from the first one. NaNs are sent as 0 like the row format.
+    """
+    index = history.index
+    if getattr(index, "tz", None) is not None:
+        tz = str(index.tz)
+        index = index.tz_convert("UTC").tz_localize(None)
+    else:
+        tz = None
+    seconds = index.as_unit("ns").asi8 // 1_000_000_000
+    start = int(seconds[0]) if len(seconds) else 0
+    offsets = seconds - start
+
+    step = HISTORY_INTERVAL_SECONDS.get(interval, 1)
+    if (offsets % step).any():
+        step = 1
+
+    def prices(column):
+        return history[column].fillna(0).astype(float).round(HISTORY_PRICE_DECIMALS).tolist()
+
+    return {
+        "format": "columnar",
+        "interval": interval,
+        "tz": tz,
+        "start": start,
+        "step": step,
+        "t": (offsets // step).tolist(),
+        "open": prices('Open'),
+        "high": prices('High'),
+        "low": prices('Low'),
+        "close": prices('Close'),
+        "volume": history['Volume'].fillna(0).astype('int64').tolist(),
+    }
 
 def item_value(val):
     """Helper to handle numpy/pandas types safely"""
@@ -163,153 +263,218 @@ def item_value(val):
     return float(val)
 
 
-def get_full_stock_data(symbol: str) -> Optional[dict]:
-    """Get complete stock data with technicals and Shariah status"""
+def _build_stock_record(symbol: str, ind, closes) -> dict:
+    """
+    Assemble the scanner payload from one indicator row
+    (calculate_panel_indicators or SymbolIndicatorState.snapshot)
+    """
+    current_price = float(ind['price'])
+    rsi = float(ind['rsi'])
+    
+    # Get Shariah status
+    shariah = get_shariah_status(symbol)
+    
+    signals_map = {
+        'rsi': ind['signal_rsi'],
+        'macd': ind['signal_macd'],
+        'bb': ind['signal_bb'],
+        'ma': ind['signal_ma']
+    }
+    
+    # Final Decision (Respect Shariah compliance)
+    final_signal = ind['label'] if shariah["passed"] else "N/A"
+    final_score = float(ind['score']) if shariah["passed"] else 0
+    
+    # Risk Management
+    sl = calculate_stop_loss(current_price, rsi)
+    tp = calculate_take_profit(current_price, rsi)
+    gain = calculate_potential_gain(current_price, tp)
+    
+    # Price history for sparkline (last 20 points)
+    price_history = [
+        round(float(p), 2)
+        for p in closes[-20:]
+    ]
+    
+    # Get metadata
+    clean_symbol = symbol.replace('.NS', '')
+    meta = stock_metadata.get(clean_symbol, {})
+    
+    return {
+        "symbol": clean_symbol,
+        "name": meta.get('name', clean_symbol),
+        "sector": meta.get('sector', 'Unknown'),
+        "price": round(current_price, 2),
+        "shariahStatus": shariah["status"],
+        "shariah": {
+            "debtRatio": shariah["debtRatio"],
+            "cashRatio": shariah["cashRatio"]
+        },
+        "technicals": {
+            "rsi": round(rsi, 1),
+            "signal": signals_map['rsi'], # Legacy field for table compatibility
+            "label": final_signal, # New Composite Label
+            "score": final_score, # New Composite Score
+            "signals": signals_map, # Detailed breakdown
+            "sl": sl if final_signal in ['Buy', 'Strong Buy'] else None,
+            "tp": tp if final_signal in ['Buy', 'Strong Buy'] else None,
+            "gain": gain if final_signal in ['Buy', 'Strong Buy'] else None,
+            "signalStrength": final_score # Mapped to new score
+        },
+        "analysis": { # FULL ANALYSIS DATA FOR AI
+            "sma20": round(float(ind['sma20']), 2),
+            "sma50": round(float(ind['sma50']), 2),
+            "sma200": round(float(ind['sma200']), 2),
+            "macd": round(float(ind['macd']), 2),
+            "macd_signal": round(float(ind['macd_signal']), 2),
+            "macd_hist": round(float(ind['macd_hist']), 2),
+            "bb_upper": round(float(ind['bb_upper']), 2),
+            "bb_lower": round(float(ind['bb_lower']), 2),
+            "volume": float(ind['volume']),
+            "volume_ma": round(float(ind['volume_ma']), 0)
+        },
+        "priceHistory": price_history
+    }
+
+
+def get_full_stock_data(symbol: str, hist: Optional[pd.DataFrame] = None) -> Optional[dict]:
+    """
+    Get complete stock data with technicals and Shariah status.
+    Pass `hist` to reuse an already downloaded 1y daily history.
+    """
     try:
         # Fetch enough history for 200 SMA
-        hist = current_provider.get_history(symbol, period="1y")
+        if hist is None:
+            hist = current_provider.get_history(symbol, period="1y")
         if hist.empty or len(hist) < 50: # Need at least 50 points for basic analysis
             return None
         
-        current_price = float(hist['Close'].iloc[-1])
-        
-        # Calculate Indicators
-        closes = hist['Close']
-        volumes = hist['Volume']
-        
-        # 1. RSI
-        rsi_series = calculate_rsi(closes)
-        rsi = item_value(rsi_series.iloc[-1]) if len(rsi_series) > 0 else 50
-        
-        # 2. Moving Averages
-        sma20 = item_value(calculate_sma(closes, 20).iloc[-1])
-        sma50 = item_value(calculate_sma(closes, 50).iloc[-1])
-        sma200 = item_value(calculate_sma(closes, 200).iloc[-1])
-        
-        # 3. MACD
-        macd_line, signal_line, histogram = calculate_macd(closes)
-        macd_val = item_value(macd_line.iloc[-1])
-        signal_val = item_value(signal_line.iloc[-1])
-        hist_val = item_value(histogram.iloc[-1])
-        
-        # 4. Bollinger Bands
-        bb_mid, bb_upper, bb_lower = calculate_bollinger_bands(closes)
-        bb_up_val = item_value(bb_upper.iloc[-1])
-        bb_low_val = item_value(bb_lower.iloc[-1])
-        
-        # 5. Volume
-        vol_ma = item_value(calculate_volume_ma(volumes).iloc[-1])
-        current_vol = item_value(volumes.iloc[-1])
-        
-        # Get Shariah status
-        shariah = get_shariah_status(symbol)
-        
-        # --- Advanced Signal Generation ---
-        
-        # 1. RSI Signal
-        rsi_signal = generate_rsi_signal(current_price, rsi, sma50)
-        
-        # 2. MACD Signal (Need previous values for crossover check)
-        prev_macd = item_value(macd_line.iloc[-2]) if len(macd_line) > 1 else None
-        prev_signal_line = item_value(signal_line.iloc[-2]) if len(signal_line) > 1 else None
-        macd_signal = generate_macd_signal(macd_val, signal_val, prev_macd, prev_signal_line)
-        
-        # 3. Bollinger Band Signal
-        bb_signal = generate_bollinger_signal(current_price, bb_low_val, bb_up_val)
-        
-        # 4. MA Signal (Golden Cross / Death Cross context)
-        ma_signal = generate_ma_signal(sma50, sma200)
-        
-        # 5. Composite Score
-        signals_map = {
-            'rsi': rsi_signal,
-            'macd': macd_signal,
-            'bb': bb_signal,
-            'ma': ma_signal
-        }
-        composite = calculate_composite_score(signals_map)
-        
-        # Final Decision (Respect Shariah compliance)
-        final_signal = composite['label'] if shariah["passed"] else "N/A"
-        final_score = composite['score'] if shariah["passed"] else 0
-        
-        # Risk Management
-        sl = calculate_stop_loss(current_price, rsi)
-        tp = calculate_take_profit(current_price, rsi)
-        gain = calculate_potential_gain(current_price, tp)
-        
-        # Price history for sparkline (last 20 points)
-        price_history = [
-            round(float(p), 2)
-            for p in closes.tail(20).values
-        ]
-        
-        # Get metadata
-        clean_symbol = symbol.replace('.NS', '')
-        meta = stock_metadata.get(clean_symbol, {})
-        
-        return {
-            "symbol": clean_symbol,
-            "name": meta.get('name', clean_symbol),
-            "sector": meta.get('sector', 'Unknown'),
-            "price": round(current_price, 2),
-            "shariahStatus": shariah["status"],
-            "shariah": {
-                "debtRatio": shariah["debtRatio"],
-                "cashRatio": shariah["cashRatio"]
-            },
-            "technicals": {
-                "rsi": round(rsi, 1),
-                "signal": rsi_signal, # Legacy field for table compatibility
-                "label": final_signal, # New Composite Label
-                "score": final_score, # New Composite Score
-                "signals": signals_map, # Detailed breakdown
-                "sl": sl if final_signal in ['Buy', 'Strong Buy'] else None,
-                "tp": tp if final_signal in ['Buy', 'Strong Buy'] else None,
-                "gain": gain if final_signal in ['Buy', 'Strong Buy'] else None,
-                "signalStrength": final_score # Mapped to new score
-            },
-            "analysis": { # FULL ANALYSIS DATA FOR AI
-                "sma20": round(sma20, 2),
-                "sma50": round(sma50, 2),
-                "sma200": round(sma200, 2),
-                "macd": round(macd_val, 2),
-                "macd_signal": round(signal_val, 2),
-                "macd_hist": round(hist_val, 2),
-                "bb_upper": round(bb_up_val, 2),
-                "bb_lower": round(bb_low_val, 2),
-                "volume": current_vol,
-                "volume_ma": round(vol_ma, 0)
-            },
-            "priceHistory": price_history
-        }
+        indicators = calculate_panel_indicators(
+            hist['Close'].to_frame(symbol), hist['Volume'].to_frame(symbol)
+        )
+        return _build_stock_record(symbol, indicators.loc[symbol], hist['Close'].to_numpy())
         
     except Exception as e:
         logger.error(f"Error processing stock {symbol}: {e}")
         return None
 
 
+def _seed_indicator_state(symbol: str, closes: pd.Series, volumes: pd.Series):
+    """Keep streaming indicator state so live ticks can refresh technicals"""
+    indicator_states[symbol.replace('.NS', '')] = SymbolIndicatorState.from_history(
+        closes.to_numpy(), volumes.fillna(0).to_numpy(), closes.index[-1].date()
+    )
+
+
+def refresh_live_technicals(prices: Dict[str, float], now: Optional[datetime] = None) -> int:
+    """
+    Advance streaming indicators with live prices and update the cached
+    scan rows in place. O(1) per symbol, cheap enough for every price cycle.
+    A new bar only starts on a new IST trading day while the market is open;
+    weekend, pre-open and post-close prices just update the forming bar.
+    Returns the number of rows refreshed.
+    """
+    now = now or datetime.now(IST)
+    today = now.date() if get_market_status(now)["status"] == "open" else None
+    refreshed = 0
+    for clean_symbol, price in prices.items():
+        state = indicator_states.get(clean_symbol)
+        if state is None or clean_symbol not in cached_stock_data or not price:
+            continue
+        try:
+            state.on_tick(price, today)
+            cached_stock_data[clean_symbol] = _build_stock_record(
+                clean_symbol, state.snapshot(), state.recent_closes()
+            )
+            refreshed += 1
+        except Exception as e:
+            logger.error(f"Live technicals refresh failed for {clean_symbol}: {e}")
+    return refreshed
+
+
+def _shared_panel_indicators(close: FrameRef, volume: FrameRef) -> pd.DataFrame:
+    """Pool task: calculate_panel_indicators on frames passed through shared memory"""
+    return calculate_panel_indicators(shared_frame(close), shared_frame(volume))
+
+
+def _panel_indicators(close: pd.DataFrame, volume: pd.DataFrame) -> pd.DataFrame:
+    """
+    calculate_panel_indicators for a scan chunk. Large chunks run in the
+    compute pool so the indicator math doesn't hold the GIL while the
+    price broadcaster and request handlers need it.
+    """
+    if close.shape[1] < SCAN_POOL_MIN_SYMBOLS:
+        return calculate_panel_indicators(close, volume)
+    with SharedFrames([close, volume]) as shared:
+        return map_in_pool(_shared_panel_indicators, [(shared.ref(0), shared.ref(1))])[0]
+
+
+def _scan_chunk(symbols: list) -> list:
+    """Analyse a chunk of symbols from one grouped history download"""
+    panel = current_provider.get_batch_history(symbols, period="1y")
+    if panel.empty:
+        logger.warning(f"No history returned for batch starting at {symbols[0]}")
+        return [None] * len(symbols)
+    
+    # All indicators for the whole chunk in one vectorized pass
+    close = panel.xs('Close', axis=1, level=1)
+    indicators = _panel_indicators(close, panel.xs('Volume', axis=1, level=1))
+    
+    results = []
+    for symbol in symbols:
+        if symbol not in indicators.index or indicators.at[symbol, 'bars'] < 50:
+            results.append(None)
+            continue
+        try:
+            closes = close[symbol].dropna()
+            results.append(_build_stock_record(symbol, indicators.loc[symbol], closes.to_numpy()))
+            _seed_indicator_state(symbol, closes, panel[symbol]['Volume'].reindex(closes.index))
+        except Exception as e:
+            logger.error(f"Error processing stock {symbol}: {e}")
+            results.append(None)
+    return results
+
+
 def scan_stocks() -> list:
-    """Scan all stocks in active list"""
+    """
+    Scan all stocks in active list.
+    When run as a job, reports symbols done and each chunk's rows as
+    they complete, and stops once the job is cancelled.
+    """
     global cached_stock_data
     
-    symbols = active_stock_list["symbols"]
+    symbols = list(active_stock_list["symbols"])
     logger.info(f"Scanning {len(symbols)} stocks from {active_stock_list['name']}")
     
-    results = []
-    
-    # We can batch fetch prices first if provider supports it, but for full technicals we need history
-    # For now, we iterate (refactor later to async)
+    # Histories are downloaded in grouped chunks, fetched concurrently within
+    # the provider's rate budget; results keep the order of the active list
+    chunks = [symbols[i:i + HISTORY_BATCH_SIZE] for i in range(0, len(symbols), HISTORY_BATCH_SIZE)]
+    context = pool_context.get()
+    scanned_symbols = 0
+
+    def _chunk_done(index: int, rows: Optional[list]):
+        nonlocal scanned_symbols
+        scanned_symbols += len(chunks[index])
+        context.on_task_done(scanned_symbols, len(symbols), rows)
+        context.on_partial([row for row in rows or [] if row])
+        if context.cancelled():
+            raise JobCancelled()
+
+    # The provider draws a rate token per upstream request: one per grouped
+    # download, or one per symbol when it has no grouped download
+    batched = current_provider.batches_history
+    scanned = run_bounded(
+        chunks, _scan_chunk,
+        timeout=SCAN_BATCH_TIMEOUT if batched else SCAN_SYMBOL_TIMEOUT * HISTORY_BATCH_SIZE,
+        on_result=_chunk_done if context is not None else None
+    )
     
-    for symbol in symbols:
-        try:
-            stock_data = get_full_stock_data(symbol)
+    results = []
+    for chunk_results in scanned:
+        for stock_data in chunk_results or []:
             if stock_data:
                 results.append(stock_data)
                 cached_stock_data[stock_data["symbol"]] = stock_data
-        except Exception as e:
-            logger.error(f"Error processing stock {symbol}: {e}")
-            continue
     
     return results
 
@@ -325,27 +490,35 @@ async def fetch_live_prices(custom_symbols: list = None) -> dict:
     # Batch processing
     for i in range(0, len(input_symbols), WS_BATCH_SIZE):
         batch = input_symbols[i:i + WS_BATCH_SIZE]
+        # Pace batches by the provider's request budget (shared with scans)
+        # rather than a fixed delay
+        while (wait := current_rate_budget.try_acquire()) > 0:
+            await asyncio.sleep(wait)
         try:
             # Use Data Provider for batch fetch
-            batch_prices = current_provider.get_batch_prices(batch)
+            batch_prices = await run_blocking(current_provider.get_batch_prices, batch)
             
             # Normalize keys (remove .NS if needed for frontend)
-            for sym, price in batch_prices.items():
-                clean = sym.replace('.NS', '')
-                prices[clean] = price
-                live_prices[clean] = price
+            batch_clean = {sym.replace('.NS', ''): price for sym, price in batch_prices.items()}
+            prices.update(batch_clean)
+            # One write per batch; only the table's writer stores to a shared table
+            if live_prices.writer:
+                live_prices.update(batch_clean)
                 
         except Exception as e:
             logger.error(f"Batch price fetch error: {e}")
-        
-        # Small delay between batches
-        if i + WS_BATCH_SIZE < len(input_symbols):
-            await asyncio.sleep(0.5)
     
     return prices
 
 
 
+def get_universe_key() -> str:
+    """Identifies the active stock list, so stale scan snapshots can be detected"""
+    symbols = active_stock_list["symbols"]
+    digest = hashlib.sha1(",".join(symbols).encode()).hexdigest()[:12]
+    return f"{active_stock_list['name']}:{len(symbols)}:{digest}"
+
+
 def get_stock_list_info() -> dict:
     """Get current active stock list info"""
     return {
@@ -0,0 +1,249 @@
+"""
+Sweep Service - Parameter grid search over one price history
+"""
+import itertools
+import math
+import logging
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..config import SWEEP_MAX_COMBINATIONS, SWEEP_INLINE_MAX, COMPUTE_POOL_SIZE
+from ..utils.indicators import IndicatorCache
+from .backtest_service import (
+    build_strategy_frame, simulate_trades, calculate_metrics,
+    load_price_histories, get_default_params, get_available_strategies
+)
+from .compute_pool import map_in_pool, SharedFrames, FrameRef, shared_frame
+
+logger = logging.getLogger(__name__)
+
+# Metrics a sweep can be ranked by; True means higher is better
+RANK_METRICS = {
+    "totalReturn": True,
+    "outperformance": True,
+    "winRate": True,
+    "finalCapital": True,
+    "sharpeRatio": True,
+    "sortinoRatio": True,
+    "calmarRatio": True,
+    "maxDrawdown": False,
+}
+
+_RESULT_FIELDS = [
+    "totalReturn", "outperformance", "winRate", "maxDrawdown", "totalTrades", "finalCapital",
+    "sharpeRatio", "sortinoRatio", "calmarRatio"
+]
+
+
+def _range_count(spec: Union[list, dict]) -> int:
+    """Values a list or an inclusive {start, stop, step} range holds, without building them"""
+    if not isinstance(spec, dict):
+        return len(spec)
+    step = spec.get("step") or 1
+    if step <= 0:
+        raise ValueError("step must be positive")
+    return max(int(np.floor((spec["stop"] - spec["start"]) / step + 1e-9)) + 1, 0)
+
+
+def _range_values(spec: Union[list, dict], default) -> list:
+    """Expand a list or an inclusive {start, stop, step} range, cast like the default"""
+    cast = int if isinstance(default, int) else float
+    if isinstance(spec, dict):
+        start, step = spec["start"], spec.get("step") or 1
+        values = [start + i * step for i in range(_range_count(spec))]
+    else:
+        values = list(spec)
+    # Round floats so 0.1-steps don't produce 2.3000000000000003
+    values = [cast(round(v, 6)) for v in values]
+    return list(dict.fromkeys(values))
+
+
+def expand_grid(strategy: str, ranges: Dict[str, Union[list, dict]]) -> tuple[List[str], List[dict]]:
+    """
+    Parameter sets to evaluate: the cartesian product of the given ranges,
+    other parameters at their defaults. Crossover pairs where the fast
+    period isn't below the slow one are skipped.
+    Returns (swept parameter names, parameter sets).
+    """
+    defaults = get_default_params()
+    allowed = next((s["params"] for s in get_available_strategies() if s["id"] == strategy), None)
+    if allowed is None:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    for name in ranges:
+        if name not in allowed:
+            raise ValueError(f"Parameter '{name}' does not apply to strategy '{strategy}'")
+
+    names = [name for name in allowed if name in ranges]
+    # Size the grid from the range bounds before expanding any axis
+    counts = [_range_count(ranges[name]) for name in names]
+    if any(count == 0 for count in counts):
+        raise ValueError("Every range needs at least one value")
+    total = math.prod(counts)
+    if total > SWEEP_MAX_COMBINATIONS:
+        raise ValueError(f"Grid has {total} combinations (max {SWEEP_MAX_COMBINATIONS})")
+
+    axes = [_range_values(ranges[name], defaults[name]) for name in names]
+
+    grid = []
+    for combo in itertools.product(*axes):
+        params = {**defaults, **dict(zip(names, combo))}
+        if params["macd_fast"] >= params["macd_slow"] or params["ma_fast"] >= params["ma_slow"]:
+            continue
+        grid.append(params)
+    return names, grid
+
+
+def evaluate_params(
+    hist: pd.DataFrame,
+    strategy: str,
+    params: dict,
+    initial_capital: float,
+    indicators: IndicatorCache,
+    start=None,
+    end=None
+) -> Optional[dict]:
+    """
+    Summary metrics for one parameter set, or None if there is too little data.
+    `start`/`end` restrict trading to a date range; indicators still use the
+    bars before `start` for warm-up.
+    """
+    frame, _ = build_strategy_frame(hist, strategy, params, indicators)
+    if frame is not None and (start is not None or end is not None):
+        frame = frame.loc[start:end]
+    if frame is None or len(frame) < 10:
+        return None
+    trades, equity_curve = simulate_trades(frame, strategy, params, initial_capital)
+    metrics = calculate_metrics(trades, equity_curve, initial_capital, frame)
+    return {field: metrics[field] for field in _RESULT_FIELDS}
+
+
+def _evaluate_chunk(
+    hist: Union[pd.DataFrame, FrameRef],
+    strategy: str,
+    grid: List[dict],
+    initial_capital: float
+) -> List[Optional[dict]]:
+    """Backtest each parameter set, sharing indicator series across the chunk"""
+    hist = shared_frame(hist)
+    indicators = IndicatorCache(hist['Close'])
+    return [evaluate_params(hist, strategy, params, initial_capital, indicators) for params in grid]
+
+
+def _chunks(grid: List[dict]) -> List[List[dict]]:
+    """Contiguous slices of the grid, a few per worker for load balancing"""
+    if len(grid) <= SWEEP_INLINE_MAX:
+        return [grid]
+    count = min(len(grid), max(1, COMPUTE_POOL_SIZE) * 4)
+    size = -(-len(grid) // count)
+    return [grid[i:i + size] for i in range(0, len(grid), size)]
+
+
+def rank_key(metric: str):
+    """Sort key putting the best value first and missing (non-finite) values last"""
+    sign = -1.0 if RANK_METRICS[metric] else 1.0
+    return lambda row: (row[metric] is None, sign * row[metric] if row[metric] is not None else 0.0)
+
+
+def _heatmap(rows: List[dict], x: str, y: str, metric: str) -> dict:
+    """Best metric value for each (x, y) cell across the other swept parameters"""
+    higher = RANK_METRICS[metric]
+    x_values = sorted({row["params"][x] for row in rows})
+    y_values = sorted({row["params"][y] for row in rows})
+    x_pos = {v: i for i, v in enumerate(x_values)}
+    y_pos = {v: i for i, v in enumerate(y_values)}
+
+    values = [[None] * len(x_values) for _ in y_values]
+    for row in rows:
+        i, j = y_pos[row["params"][y]], x_pos[row["params"][x]]
+        current = values[i][j]
+        if row[metric] is None:
+            continue
+        if current is None or (row[metric] > current if higher else row[metric] < current):
+            values[i][j] = row[metric]
+
+    return {"x": x, "y": y, "metric": metric, "xValues": x_values, "yValues": y_values, "values": values}
+
+
+def run_parameter_sweep(
+    symbol: str,
+    period: str = "1y",
+    strategy: str = "rsi_sma",
+    initial_capital: float = 100000,
+    ranges: Optional[Dict[str, Union[list, dict]]] = None,
+    rank_by: str = "totalReturn",
+    top: int = 50,
+    heatmap_x: Optional[str] = None,
+    heatmap_y: Optional[str] = None
+) -> dict:
+    """
+    Backtest every parameter combination in `ranges` against one fetched
+    history and rank them.
+
+    Args:
+        ranges: param name -> list of values or {"start", "stop", "step"} (inclusive)
+        rank_by: metric to sort by (see RANK_METRICS)
+        top: number of ranked rows to return
+        heatmap_x/heatmap_y: swept params for the heatmap axes
+            (default: the first two swept params)
+
+    Returns:
+        Ranked result table and heatmap matrix
+    """
+    if rank_by not in RANK_METRICS:
+        return {"success": False, "error": f"Unknown rank metric: {rank_by}"}
+
+    try:
+        names, grid = expand_grid(strategy, ranges or {})
+    except (ValueError, KeyError, TypeError) as e:
+        return {"success": False, "error": str(e)}
+    if not grid:
+        return {"success": False, "error": "No valid parameter combinations"}
+
+    try:
+        hist = load_price_histories([symbol], period)[symbol]
+        if len(hist) < 60:
+            return {"success": False, "error": "Not enough historical data (need 60+ days)"}
+
+        chunks = _chunks(grid)
+        if len(chunks) == 1:
+            chunk_results = [_evaluate_chunk(hist, strategy, grid, initial_capital)]
+        else:
+            # Workers read the history from shared memory instead of one pickle per chunk
+            with SharedFrames([hist]) as shared:
+                chunk_results = map_in_pool(
+                    _evaluate_chunk, [(shared.ref(), strategy, chunk, initial_capital) for chunk in chunks]
+                )
+    except Exception as e:
+        logger.error(f"Sweep failed for {symbol}: {e}")
+        return {"success": False, "error": str(e)}
+
+    rows = []
+    for chunk, results in zip(chunks, chunk_results):
+        for params, result in zip(chunk, results):
+            if result is not None:
+                rows.append({"params": {name: params[name] for name in names}, **result})
+
+    rows.sort(key=rank_key(rank_by))
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+
+    swept = [name for name in names if len({row["params"][name] for row in rows}) > 1]
+    heatmap_x = heatmap_x or (swept[0] if swept else None)
+    heatmap_y = heatmap_y or (swept[1] if len(swept) > 1 else None)
+    heatmap = None
+    if heatmap_x in names and heatmap_y in names and heatmap_x != heatmap_y and rows:
+        heatmap = _heatmap(rows, heatmap_x, heatmap_y, rank_by)
+
+    return {
+        "success": True,
+        "symbol": symbol.replace(".NS", ""),
+        "period": period,
+        "strategy": strategy,
+        "rankBy": rank_by,
+        "combinations": len(grid),
+        "evaluated": len(rows),
+        "results": rows[:max(1, top)],
+        "heatmap": heatmap
+    }
@@ -0,0 +1,236 @@
+"""
+Universe Backtest Service - One strategy over the whole active stock list
+with shared capital, equal-weight sizing and daily rebalancing.
+"""
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config import UNIVERSE_INLINE_MAX, COMPUTE_POOL_SIZE, BACKTEST_EQUITY_POINTS
+from . import stock_service
+from ..utils.downsample import lttb_indices
+from ..utils.indicators import IndicatorCache
+from ..utils.metrics import performance_metrics
+from .backtest_service import (
+    build_strategy_frame, generate_signals,
+    load_price_histories, get_default_params
+)
+from .compute_pool import map_in_pool, SharedFrames, shared_frame
+
+logger = logging.getLogger(__name__)
+
+
+def position_state(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    """
+    Whether a position is held after each bar, using the single-symbol
+    rules: enter on a buy while flat, exit on a sell while holding.
+    """
+    held = np.zeros(len(buy), dtype=bool)
+    holding = False
+    start = 0
+    for i in np.flatnonzero(buy | sell):
+        if not holding and buy[i]:
+            holding, start = True, i
+        elif holding and sell[i]:
+            held[start:i] = True
+            holding = False
+    if holding:
+        held[start:] = True
+    return held
+
+
+def _symbol_positions(items: List[tuple], strategy: str, params: dict) -> List[Optional[pd.Series]]:
+    """Held/flat series per (symbol, history), on each history's own dates"""
+    results = []
+    for _, hist in items:
+        hist = shared_frame(hist)
+        if hist.empty or len(hist) < 60:
+            results.append(None)
+            continue
+        frame, _ = build_strategy_frame(hist, strategy, params, IndicatorCache(hist['Close']))
+        if frame is None or len(frame) < 10:
+            results.append(None)
+            continue
+        buy, sell = generate_signals(frame, strategy, params)
+        results.append(pd.Series(position_state(buy, sell), index=frame.index))
+    return results
+
+
+def universe_symbols(halal_only: bool = False) -> List[str]:
+    """Active stock list, optionally only the Shariah-compliant names"""
+    symbols = list(stock_service.active_stock_list["symbols"])
+    if halal_only:
+        symbols = [s for s in symbols if stock_service.get_shariah_status(s)["passed"]]
+    return symbols
+
+
+def simulate_portfolio(
+    close: pd.DataFrame,
+    held: pd.DataFrame,
+    initial_capital: float,
+    position_size: Optional[float] = None
+) -> dict:
+    """
+    Daily-rebalanced portfolio on an aligned price matrix.
+
+    At each close every held symbol is set to an equal weight (capped at
+    `position_size` of equity when given; the rest stays in cash). Those
+    weights earn the next bar's close-to-close return.
+
+    Returns equity, daily turnover and per-symbol P&L arrays.
+    """
+    prices = close.to_numpy(dtype=float)
+    active = held.to_numpy(dtype=bool) & ~np.isnan(prices)
+    count = active.sum(axis=1, keepdims=True)
+    weight = np.divide(1.0, count, out=np.zeros_like(count, dtype=float), where=count > 0)
+    if position_size is not None:
+        weight = np.minimum(weight, position_size)
+    weights = active * weight
+
+    returns = np.zeros_like(prices)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns[1:] = prices[1:] / prices[:-1] - 1
+    returns[~np.isfinite(returns)] = 0.0
+
+    # Weights chosen at close t-1 earn bar t's return
+    contrib_ret = np.zeros_like(prices)
+    contrib_ret[1:] = weights[:-1] * returns[1:]
+    port_ret = contrib_ret.sum(axis=1)
+    equity = initial_capital * np.cumprod(1 + port_ret)
+    prev_equity = np.concatenate([[initial_capital], equity[:-1]])
+    pnl = contrib_ret * prev_equity[:, None]
+
+    # Turnover: weight traded to get from drifted to target weights
+    drifted = np.zeros_like(weights)
+    drifted[1:] = weights[:-1] * (1 + returns[1:]) / (1 + port_ret[1:, None])
+    turnover = np.abs(weights - drifted).sum(axis=1)
+
+    return {"equity": equity, "returns": port_ret, "turnover": turnover, "pnl": pnl, "weights": weights}
+
+
+def run_universe_backtest(
+    period: str = "1y",
+    strategy: str = "rsi_sma",
+    initial_capital: float = 100000,
+    params: Optional[dict] = None,
+    halal_only: bool = False,
+    position_size: Optional[float] = None,
+    points: int = BACKTEST_EQUITY_POINTS
+) -> dict:
+    """
+    Run a strategy over every symbol in the active list with shared capital.
+
+    Args:
+        period: Historical period (1mo, 3mo, 6mo, 1y, 2y, 5y)
+        strategy: Strategy type (rsi_sma, macd, bollinger, ma_crossover)
+        initial_capital: Starting capital shared by all symbols
+        params: Strategy-specific parameters
+        halal_only: Only trade symbols passing the Shariah screen
+        position_size: Max fraction of equity per position (default: equal weight)
+        points: Equity curve points to return (LTTB-downsampled; 0 = every bar)
+
+    Returns:
+        Aggregate equity curve and metrics, turnover and per-symbol contributions
+    """
+    if params is None:
+        params = get_default_params()
+    if position_size is not None and not 0 < position_size <= 1:
+        return {"success": False, "error": "position_size must be in (0, 1]"}
+
+    symbols = universe_symbols(halal_only)
+    if not symbols:
+        return {"success": False, "error": "No symbols in universe"}
+
+    try:
+        histories = load_price_histories(symbols, period)
+        items = [(s, histories[s]) for s in symbols]
+
+        # Signals are independent per symbol: fan out in chunks
+        if len(items) <= UNIVERSE_INLINE_MAX:
+            positions = _symbol_positions(items, strategy, params)
+        else:
+            size = -(-len(items) // max(1, COMPUTE_POOL_SIZE))
+            with SharedFrames([hist for _, hist in items]) as shared:
+                refs = [(s, shared.ref(i)) for i, s in enumerate(symbols)]
+                chunks = [(refs[i:i + size], strategy, params) for i in range(0, len(refs), size)]
+                positions = [p for chunk in map_in_pool(_symbol_positions, chunks) for p in chunk]
+    except Exception as e:
+        logger.error(f"Universe backtest failed: {e}")
+        return {"success": False, "error": str(e)}
+
+    tradable = {s: p for s, p in zip(symbols, positions) if p is not None}
+    if not tradable:
+        return {"success": False, "error": f"Unknown strategy or not enough data: {strategy}"}
+
+    # Aligned price matrix over the union of dates; symbols not listed yet stay NaN
+    close = pd.DataFrame({s: histories[s]['Close'] for s in tradable}).sort_index()
+    close = close.ffill()
+    held = pd.DataFrame(tradable).reindex(close.index).ffill().fillna(False).astype(bool)
+
+    sim = simulate_portfolio(close, held, initial_capital, position_size)
+    equity = sim["equity"]
+    dates = close.index.strftime('%Y-%m-%d')
+
+    exposure = sim["weights"].sum(axis=1)
+    risk = performance_metrics(equity, exposure > 0)
+    final_capital = float(equity[-1])
+    total_return = (final_capital - initial_capital) / initial_capital * 100
+
+    # Equal-weight buy & hold of the same universe, rebalanced daily
+    all_held = pd.DataFrame(True, index=close.index, columns=close.columns)
+    benchmark = simulate_portfolio(close, all_held, initial_capital)["equity"]
+    buy_hold_return = (benchmark[-1] - initial_capital) / initial_capital * 100
+
+    weights = sim["weights"]
+    entries = (np.diff(weights > 0, axis=0, prepend=False) & (weights > 0)).sum(axis=0)
+    contributions = sorted([
+        {
+            "symbol": symbol.replace(".NS", ""),
+            "pnl": round(float(sim["pnl"][:, j].sum()), 2),
+            "contributionPct": round(float(sim["pnl"][:, j].sum()) / initial_capital * 100, 2),
+            "daysHeld": int((weights[:, j] > 0).sum()),
+            "entries": int(entries[j]),
+        }
+        for j, symbol in enumerate(close.columns)
+    ], key=lambda c: c["pnl"], reverse=True)
+
+    keep = range(len(equity))
+    if points and points < len(equity):
+        keep = lttb_indices(equity, points)
+    return {
+        "success": True,
+        "period": period,
+        "strategy": strategy,
+        "halalOnly": halal_only,
+        "symbols": len(tradable),
+        "skipped": [s.replace(".NS", "") for s in symbols if s not in tradable],
+        "summary": {
+            "initialCapital": initial_capital,
+            "finalCapital": round(final_capital, 2),
+            "totalReturn": round(total_return, 2),
+            "buyHoldReturn": round(float(buy_hold_return), 2),
+            "outperformance": round(total_return - float(buy_hold_return), 2),
+            "maxDrawdown": risk["maxDrawdown"],
+            "maxDrawdownDuration": risk["maxDrawdownDuration"],
+            "cagr": risk["cagr"],
+            "volatility": risk["volatility"],
+            "sharpeRatio": risk["sharpeRatio"],
+            "sortinoRatio": risk["sortinoRatio"],
+            "calmarRatio": risk["calmarRatio"],
+            "investedPct": risk["exposure"],
+            "rollingReturns": risk["rollingReturns"],
+            "totalTurnover": round(float(sim["turnover"].sum()), 2),
+            "avgDailyTurnover": round(float(sim["turnover"].mean()) * 100, 2),
+            "avgExposure": round(float(exposure.mean()) * 100, 2),
+            "startDate": dates[0],
+            "endDate": dates[-1]
+        },
+        "contributions": contributions,
+        "equityCurve": [
+            {"date": dates[i], "equity": round(float(equity[i]), 2), "positions": int((weights[i] > 0).sum())}
+            for i in keep
+        ],
+        "equityPoints": len(equity)
+    }
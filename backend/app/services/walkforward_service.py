@@ -0,0 +1,233 @@
+"""
+Walk-forward Service - Out-of-sample validation of strategy parameters.
+History is split into rolling train/test windows; parameters are chosen on
+each train slice and scored on the test slice that follows it.
+"""
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ..config import WALK_FORWARD_TRAIN_BARS, WALK_FORWARD_TEST_BARS, COMPUTE_POOL_SIZE
+from ..utils.indicators import IndicatorCache
+from .backtest_service import load_price_histories
+from .compute_pool import map_in_pool, SharedFrames, FrameRef, shared_frame
+from .sweep_service import RANK_METRICS, expand_grid, evaluate_params, rank_key
+from .universe_backtest_service import universe_symbols
+
+logger = logging.getLogger(__name__)
+
+# Grid searched on each train window when the request gives no ranges
+DEFAULT_WALK_FORWARD_RANGES = {
+    "rsi_sma": {"rsi_oversold": [25, 30, 35], "rsi_overbought": [65, 70, 75]},
+    "macd": {"macd_fast": [8, 12], "macd_slow": [21, 26], "macd_signal": [7, 9]},
+    "bollinger": {"bb_period": [15, 20, 25], "bb_std": [1.5, 2.0, 2.5]},
+    "ma_crossover": {"ma_fast": [5, 10, 20], "ma_slow": [30, 50, 100]},
+}
+
+
+def make_windows(n_bars: int, train_bars: int, test_bars: int) -> List[tuple]:
+    """(train_start, train_end, test_end) bar positions, end-exclusive, stepping by test_bars"""
+    windows = []
+    start = 0
+    while start + train_bars < n_bars:
+        test_end = min(start + train_bars + test_bars, n_bars)
+        windows.append((start, start + train_bars, test_end))
+        start += test_bars
+    return windows
+
+
+def _walk_forward_unit(
+    hist: Union[pd.DataFrame, FrameRef],
+    strategy: str,
+    names: List[str],
+    grid: List[dict],
+    windows: List[tuple],
+    initial_capital: float,
+    rank_by: str
+) -> List[dict]:
+    """
+    Optimise on each train slice, score the following test slice.
+    Indicators are causal, so one cache over the history serves every
+    window in the unit.
+    """
+    hist = shared_frame(hist)
+    indicators = IndicatorCache(hist['Close'])
+    key = rank_key(rank_by)
+    index = hist.index
+    results = []
+
+    for train_start, train_end, test_end in windows:
+        train_range = (index[train_start], index[train_end - 1])
+        test_range = (index[train_end], index[test_end - 1])
+
+        best_params, best_train = None, None
+        for params in grid:
+            scored = evaluate_params(hist, strategy, params, initial_capital, indicators, *train_range)
+            if scored is None:
+                continue
+            # Same ordering as sweep rankings: best first, missing metrics last
+            if best_train is None or key(scored) < key(best_train):
+                best_params, best_train = params, scored
+
+        test = None
+        if best_params is not None:
+            test = evaluate_params(hist, strategy, best_params, initial_capital, indicators, *test_range)
+
+        results.append({
+            "trainStart": train_range[0].strftime('%Y-%m-%d'),
+            "trainEnd": train_range[1].strftime('%Y-%m-%d'),
+            "testStart": test_range[0].strftime('%Y-%m-%d'),
+            "testEnd": test_range[1].strftime('%Y-%m-%d'),
+            "trainBars": train_end - train_start,
+            "testBars": test_end - train_end,
+            "params": {name: best_params[name] for name in names} if best_params else None,
+            "inSample": best_train,
+            "outOfSample": test,
+        })
+    return results
+
+
+def _summarize(windows: List[dict]) -> Optional[dict]:
+    """Chained out-of-sample return and in- vs out-of-sample comparison"""
+    scored = [w for w in windows if w["inSample"] and w["outOfSample"]]
+    if not scored:
+        return None
+
+    oos = np.array([w["outOfSample"]["totalReturn"] for w in scored]) / 100
+    ins = np.array([w["inSample"]["totalReturn"] for w in scored]) / 100
+    test_bars = np.array([w["testBars"] for w in scored])
+    train_bars = np.array([w["trainBars"] for w in scored])
+
+    # Walk-forward efficiency: out-of-sample return per bar relative to in-sample
+    ins_rate = ins.sum() / train_bars.sum()
+    oos_rate = oos.sum() / test_bars.sum()
+    efficiency = oos_rate / ins_rate if ins_rate > 0 else None
+
+    params = Counter(tuple(sorted(w["params"].items())) for w in scored)
+    stable, count = params.most_common(1)[0]
+    return {
+        "windows": len(scored),
+        "oosReturn": round(float(np.prod(1 + oos) - 1) * 100, 2),
+        "avgInSampleReturn": round(float(ins.mean()) * 100, 2),
+        "avgOutOfSampleReturn": round(float(oos.mean()) * 100, 2),
+        "positiveWindowsPct": round(float((oos > 0).mean()) * 100, 1),
+        "worstWindowReturn": round(float(oos.min()) * 100, 2),
+        "efficiency": round(float(efficiency), 2) if efficiency is not None else None,
+        "mostChosenParams": dict(stable),
+        "paramStability": round(count / len(scored) * 100, 1),
+    }
+
+
+def run_walk_forward(
+    symbol: Optional[str] = None,
+    period: str = "5y",
+    strategy: str = "rsi_sma",
+    initial_capital: float = 100000,
+    ranges: Optional[Dict[str, Union[list, dict]]] = None,
+    train_bars: int = WALK_FORWARD_TRAIN_BARS,
+    test_bars: int = WALK_FORWARD_TEST_BARS,
+    rank_by: str = "totalReturn",
+    halal_only: bool = False
+) -> dict:
+    """
+    Walk-forward validation for one symbol, or the whole active list when
+    symbol is None.
+
+    Args:
+        ranges: grid optimised on each train window (default: DEFAULT_WALK_FORWARD_RANGES)
+        train_bars/test_bars: window lengths in daily bars; windows step by test_bars
+        rank_by: metric used to pick parameters on the train slice
+
+    Returns:
+        Per-window chosen params with in/out-of-sample metrics and a summary
+        per symbol plus across the universe
+    """
+    if rank_by not in RANK_METRICS:
+        return {"success": False, "error": f"Unknown rank metric: {rank_by}"}
+    if train_bars < 20 or test_bars < 10:
+        return {"success": False, "error": "Need train_bars >= 20 and test_bars >= 10"}
+
+    try:
+        names, grid = expand_grid(strategy, ranges or DEFAULT_WALK_FORWARD_RANGES.get(strategy, {}))
+    except (ValueError, KeyError, TypeError) as e:
+        return {"success": False, "error": str(e)}
+    if not grid:
+        return {"success": False, "error": "No valid parameter combinations"}
+
+    symbols = [symbol] if symbol else universe_symbols(halal_only)
+    if not symbols:
+        return {"success": False, "error": "No symbols in universe"}
+
+    try:
+        histories = load_price_histories(symbols, period)
+
+        # Work units of (symbol, some windows): a single symbol spreads its
+        # windows over the pool, a universe runs one symbol per unit
+        units = []
+        for s in symbols:
+            hist = histories[s]
+            windows = make_windows(len(hist), train_bars, test_bars)
+            if not windows:
+                continue
+            per_unit = -(-len(windows) // max(1, COMPUTE_POOL_SIZE)) if len(symbols) == 1 else len(windows)
+            for i in range(0, len(windows), per_unit):
+                # Each unit only needs history up to the end of its last test window
+                unit_windows = windows[i:i + per_unit]
+                units.append((s, hist.iloc[:unit_windows[-1][2]], unit_windows))
+
+        if not units:
+            return {"success": False, "error": f"Not enough history for {train_bars}+{test_bars} bar windows"}
+
+        args = [(h, strategy, names, grid, w, initial_capital, rank_by) for _, h, w in units]
+        if len(args) == 1:
+            unit_results = [_walk_forward_unit(*args[0])]
+        else:
+            # One shared copy per symbol; each unit reads the prefix it needs
+            unit_symbols = list(dict.fromkeys(s for s, _, _ in units))
+            with SharedFrames([histories[s] for s in unit_symbols]) as shared:
+                args = [
+                    (shared.ref(unit_symbols.index(s), len(h)), *rest)
+                    for (s, h, _), (_, *rest) in zip(units, args)
+                ]
+                unit_results = map_in_pool(_walk_forward_unit, args)
+    except Exception as e:
+        logger.error(f"Walk-forward failed: {e}")
+        return {"success": False, "error": str(e)}
+
+    by_symbol: Dict[str, list] = {}
+    for (s, _, _), windows in zip(units, unit_results):
+        by_symbol.setdefault(s, []).extend(windows)
+
+    results = []
+    for s, windows in by_symbol.items():
+        results.append({
+            "symbol": s.replace(".NS", ""),
+            "summary": _summarize(windows),
+            "windows": windows,
+        })
+
+    summaries = [r["summary"] for r in results if r["summary"]]
+    universe = None
+    if summaries:
+        universe = {
+            "symbols": len(summaries),
+            "avgOosReturn": round(float(np.mean([x["oosReturn"] for x in summaries])), 2),
+            "avgInSampleReturn": round(float(np.mean([x["avgInSampleReturn"] for x in summaries])), 2),
+            "avgOutOfSampleReturn": round(float(np.mean([x["avgOutOfSampleReturn"] for x in summaries])), 2),
+            "positiveSymbolsPct": round(float(np.mean([x["oosReturn"] > 0 for x in summaries])) * 100, 1),
+        }
+
+    return {
+        "success": True,
+        "period": period,
+        "strategy": strategy,
+        "rankBy": rank_by,
+        "trainBars": train_bars,
+        "testBars": test_bars,
+        "gridSize": len(grid),
+        "summary": universe,
+        "results": results,
+    }
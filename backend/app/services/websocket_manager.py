@@ -1,37 +1,226 @@
 """
 WebSocket Manager Service
-Handles WebSocket connections and broadcasting.
+Handles WebSocket connections, per-client symbol subscriptions and broadcasting.
+
+Each client has its own outbox drained by its own sender task, so one slow
+socket never delays the others. Price updates are filtered and serialized
+once per distinct subscription set.
+
+Prices go out as deltas: each publish carries only the symbols whose price
+changed since the last one, under a sequence number that increases by one
+per publish. A client gets a full snapshot of its subscription on connect,
+after changing it, when it falls behind (an unsent delta would be
+overtaken) and when it asks to resync after seeing a gap in the sequence.
 """
+import asyncio
+import json
 import logging
+from collections import deque
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
 from fastapi import WebSocket
-from typing import List
+
+from ..config import WS_CLIENT_QUEUE_SIZE, WS_SEND_TIMEOUT
+from ..utils.serialization import dumps
 
 logger = logging.getLogger(__name__)
 
+
+def _normalize(symbols: Iterable[str]) -> FrozenSet[str]:
+    """Subscription symbols in the form live prices are keyed by (RELIANCE, not reliance.NS)"""
+    return frozenset(str(s).strip().upper().replace('.NS', '') for s in symbols if str(s).strip())
+
+
+class ClientConnection:
+    """One socket, its subscription and its outgoing messages"""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.symbols: Optional[FrozenSet[str]] = None   # None: every symbol
+        self.outbox: deque = deque()
+        self.pending_prices: Optional[str] = None       # unsent price delta
+        self.needs_snapshot = True                      # send a snapshot before the next delta
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+        self.coalesced = 0
+        self.sender: Optional[asyncio.Task] = None
+
+    def enqueue(self, text: str):
+        if len(self.outbox) >= WS_CLIENT_QUEUE_SIZE:
+            self.outbox.popleft()
+            self.dropped += 1
+        self.outbox.append(text)
+        self.wakeup.set()
+
+    def enqueue_prices(self, text: str):
+        if self.pending_prices is not None:
+            # Behind by two deltas: replace both with one snapshot, built when
+            # the sender gets to it so it reflects the latest prices
+            self.coalesced += 1
+            self.pending_prices = None
+            self.needs_snapshot = True
+        elif not self.needs_snapshot:
+            self.pending_prices = text
+        self.wakeup.set()
+
+    def resync(self):
+        self.pending_prices = None
+        self.needs_snapshot = True
+        self.wakeup.set()
+
+
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.clients: Dict[WebSocket, ClientConnection] = {}
+        self.dropped = 0
+        self.coalesced = 0
+        self.seq = 0
+        self.last_prices: Dict[str, float] = {}   # last value sent per symbol
+
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.clients)
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket client connected. Total: {len(self.active_connections)}")
+        client = ClientConnection(websocket)
+        client.sender = asyncio.create_task(self._send_loop(client))
+        self.clients[websocket] = client
+        client.wakeup.set()     # initial snapshot
+        logger.info(f"WebSocket client connected. Total: {len(self.clients)}")
 
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        logger.info(f"WebSocket client disconnected. Total: {len(self.active_connections)}")
+        client = self.clients.pop(websocket, None)
+        if client is not None:
+            self.dropped += client.dropped
+            self.coalesced += client.coalesced
+            if client.sender is not None and client.sender is not asyncio.current_task():
+                client.sender.cancel()
+        logger.info(f"WebSocket client disconnected. Total: {len(self.clients)}")
 
-    async def broadcast(self, message: dict):
-        disconnected = []
-        for connection in self.active_connections:
+    async def _send_loop(self, client: ClientConnection):
+        try:
+            while True:
+                await client.wakeup.wait()
+                client.wakeup.clear()
+                while (text := self._next_message(client)) is not None:
+                    await asyncio.wait_for(client.websocket.send_text(text), WS_SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket client too slow, disconnecting")
+            self.disconnect(client.websocket)
             try:
-                await connection.send_json(message)
+                await client.websocket.close()
             except Exception:
-                disconnected.append(connection)
-        
-        for conn in disconnected:
-            self.disconnect(conn)
+                pass
+        except Exception:
+            self.disconnect(client.websocket)
+
+    def _next_message(self, client: ClientConnection) -> Optional[str]:
+        if client.outbox:
+            return client.outbox.popleft()
+        if client.needs_snapshot:
+            client.needs_snapshot = False
+            return self.snapshot(client.symbols)
+        text, client.pending_prices = client.pending_prices, None
+        return text
+
+    def snapshot(self, symbols: Optional[FrozenSet[str]] = None) -> str:
+        """Every last-sent price (of `symbols` if given) at the current sequence number"""
+        prices = self.last_prices
+        data = prices if symbols is None else {s: prices[s] for s in symbols if s in prices}
+        return dumps({
+            "type": "price_snapshot",
+            "seq": self.seq,
+            "timestamp": datetime.now().isoformat(),
+            "data": data
+        }).decode()
+
+    async def handle_message(self, websocket: WebSocket, text: str):
+        """
+        Apply a client message:
+        {"action": "subscribe" | "unsubscribe", "symbols": [...]} adds or
+        removes symbols; "set" replaces the subscription. Until a client
+        subscribes it receives every symbol. Replies with the current set,
+        followed by a snapshot of it.
+        {"action": "resync"} asks for a snapshot after a sequence gap.
+        """
+        client = self.clients.get(websocket)
+        if client is None:
+            return
+        try:
+            message = json.loads(text)
+            action = message.get("action")
+            symbols = _normalize(message.get("symbols") or [])
+        except (ValueError, AttributeError, TypeError):
+            return
+
+        if action == "resync":
+            client.resync()
+            return
+
+        current = client.symbols or frozenset()
+        if action == "subscribe":
+            client.symbols = current | symbols
+        elif action == "unsubscribe":
+            client.symbols = current - symbols
+        elif action == "set":
+            client.symbols = symbols
+        else:
+            return
+        client.enqueue(dumps({"type": "subscribed", "symbols": sorted(client.symbols)}).decode())
+        client.resync()
+
+    async def broadcast(self, message: dict):
+        """Send the same message to every client, serialized once"""
+        text = dumps(message).decode()
+        for client in list(self.clients.values()):
+            client.enqueue(text)
+
+    async def publish_prices(self, prices: Dict[str, float]) -> int:
+        """
+        Send each client the prices that changed since the last publish,
+        among the symbols it subscribes to. Nothing is sent when no price
+        changed. Every group gets the new sequence number, even with no
+        changes of its own, so clients can tell a missed delta from a quiet one.
+        Returns the number of distinct payloads serialized.
+        """
+        changed = {s: p for s, p in prices.items() if self.last_prices.get(s) != p}
+        if not changed:
+            return 0
+        self.seq += 1
+        self.last_prices.update(changed)
+
+        groups: Dict[Optional[FrozenSet[str]], List[ClientConnection]] = {}
+        for client in list(self.clients.values()):
+            groups.setdefault(client.symbols, []).append(client)
+
+        timestamp = datetime.now().isoformat()
+        serialized = 0
+        for symbols, clients in groups.items():
+            data = changed if symbols is None else {s: changed[s] for s in symbols if s in changed}
+            text = dumps({"type": "price_update", "seq": self.seq, "timestamp": timestamp, "data": data}).decode()
+            serialized += 1
+            for client in clients:
+                client.enqueue_prices(text)
+        return serialized
+
+    def subscribed_symbols(self) -> FrozenSet[str]:
+        """Symbols some client explicitly subscribed to"""
+        return frozenset().union(*(c.symbols for c in list(self.clients.values()) if c.symbols))
+
+    def stats(self) -> dict:
+        clients = list(self.clients.values())
+        return {
+            "connections": len(clients),
+            "seq": self.seq,
+            "subscriptions": len({c.symbols for c in clients}),
+            "queued": sum(len(c.outbox) + (c.pending_prices is not None) for c in clients),
+            "dropped": self.dropped + sum(c.dropped for c in clients),
+            "coalesced": self.coalesced + sum(c.coalesced for c in clients),
+        }
 
 # Global instance to be shared across the app
 manager = ConnectionManager()
@@ -0,0 +1,51 @@
+"""
+Async Utils
+Keeps blocking provider / LLM work off the event loop and measures loop lag.
+"""
+import asyncio
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config import BLOCKING_POOL_SIZE
+
+# Dedicated pool so slow provider calls can't starve FastAPI's own threadpool
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_POOL_SIZE, thread_name_prefix="blocking")
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking callable in the managed executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(func, *args, **kwargs))
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed sleep"""
+
+    def __init__(self, interval: float = 0.5, window: int = 240):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            self.samples.append(max(0.0, lag) * 1000)
+
+    def stats(self) -> dict:
+        """Lag in milliseconds over the recent window"""
+        if not self.samples:
+            return {"current_ms": 0.0, "avg_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        ordered = sorted(self.samples)
+        return {
+            "current_ms": round(self.samples[-1], 2),
+            "avg_ms": round(sum(ordered) / len(ordered), 2),
+            "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 2),
+            "max_ms": round(ordered[-1], 2),
+        }
+
+
+# Global instance started with the app
+loop_lag_monitor = LoopLagMonitor()
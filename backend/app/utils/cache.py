@@ -1,7 +1,10 @@
 """
 Simplified cache using cachetools
 """
-from cachetools import TTLCache
+from cachetools import TTLCache, LRUCache
+
+from ..config import BACKTEST_CACHE_MAX_BYTES
+from .serialization import dumps
 
 # Simple TTL caches - dict-like interface with automatic expiration
 # cachetools TTLCache uses dict-style access: cache[key] = value, value = cache.get(key)
@@ -9,3 +12,7 @@ from cachetools import TTLCache
 stock_data_cache = TTLCache(maxsize=500, ttl=60)     # 1 minute for stock data
 history_cache = TTLCache(maxsize=200, ttl=300)       # 5 minutes for historical data
 ai_cache = TTLCache(maxsize=100, ttl=600)            # 10 minutes for AI responses
+
+# Backtest results keyed by data fingerprint, so new bars make old entries
+# unreachable instead of expiring them; LRU-evicted by encoded size in bytes
+backtest_cache = LRUCache(maxsize=BACKTEST_CACHE_MAX_BYTES, getsizeof=lambda result: len(dumps(result)))
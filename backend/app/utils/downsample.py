@@ -0,0 +1,76 @@
+"""
+Downsampling for chart payloads
+Reduce long series to a fixed number of points while keeping their visual
+shape: Largest-Triangle-Three-Buckets for lines (equity curves) and
+per-bucket OHLC aggregation for candles, so peaks, troughs and wicks
+survive where stride sampling would drop them.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(y: np.ndarray, points: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Indices of the points Largest-Triangle-Three-Buckets keeps.
+
+    The first and last points are always kept. The rest are split into
+    points - 2 buckets, and from each bucket the point forming the largest
+    triangle with the previously kept point and the next bucket's average
+    is chosen. Returns every index when the series is already short enough.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if points >= n or points < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # Bucket b covers [edges[b], edges[b + 1]); the last edge is the final point
+    every = (n - 2) / (points - 2)
+    edges = np.floor(np.arange(points - 1) * every).astype(int) + 1
+    edges = np.append(edges, n)
+
+    kept = np.empty(points, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for b in range(points - 2):
+        start, end = edges[b], edges[b + 1]
+        next_start, next_end = edges[b + 1], edges[b + 2]
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        kept[b + 1] = a
+    return kept
+
+
+def bucket_ohlcv(history: pd.DataFrame, points: int) -> pd.DataFrame:
+    """
+    Merge consecutive bars into at most `points` candles: first open,
+    highest high, lowest low, last close, summed volume, stamped with the
+    bucket's first bar. Returns history unchanged when it is short enough.
+    """
+    n = len(history)
+    if points >= n or points < 1:
+        return history
+
+    size = -(-n // points)
+    starts = np.arange(0, n, size)
+    stop = np.append(starts[1:], n) - 1
+
+    def values(name):
+        return history[name].to_numpy(dtype=float)
+
+    data = {
+        'Open': values('Open')[starts],
+        'High': np.fmax.reduceat(values('High'), starts),
+        'Low': np.fmin.reduceat(values('Low'), starts),
+        'Close': values('Close')[stop],
+        'Volume': np.add.reduceat(np.nan_to_num(values('Volume')), starts),
+    }
+    return pd.DataFrame(data, index=history.index[starts])
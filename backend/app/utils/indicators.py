@@ -1,6 +1,9 @@
 """
 Technical Indicators for Trading Analysis
 """
+from dataclasses import dataclass
+from typing import Optional
+
 import numpy as np
 import pandas as pd
 
@@ -102,125 +105,6 @@ def calculate_bollinger_bands(
     return sma, upper, lower
 
 
-def generate_rsi_signal(
-    price: float,
-    rsi: float,
-    sma: float,
-    oversold: int = 30,
-    overbought: int = 70
-) -> str:
-    """
-    Generate trading signal based on RSI + SMA strategy
-    """
-    if price > sma and rsi < oversold:
-        return 'Buy'
-    elif rsi > overbought or price < sma:
-        return 'Sell'
-    return 'Hold'
-
-
-def generate_macd_signal(
-    macd: float,
-    signal: float,
-    prev_macd: float = None,
-    prev_signal: float = None
-) -> str:
-    """
-    Generate MACD signal (Crossover)
-    """
-    # Bullish Crossover: MACD crosses above Signal
-    if prev_macd is not None and prev_signal is not None:
-        if prev_macd < prev_signal and macd > signal:
-            return 'Buy'
-        if prev_macd > prev_signal and macd < signal:
-            return 'Sell'
-    
-    # Trend confirmation
-    if macd > signal and macd > 0:
-        return 'Buy' # Strong trend
-    if macd < signal and macd < 0:
-        return 'Sell'
-        
-    return 'Hold'
-
-
-def generate_bollinger_signal(
-    price: float,
-    lower_band: float,
-    upper_band: float
-) -> str:
-    """
-    Generate Bollinger Band signal (Reversal)
-    """
-    if price <= lower_band:
-        return 'Buy' # Potential oversold bounce
-    if price >= upper_band:
-        return 'Sell' # Potential overbought rejection
-    return 'Hold'
-
-
-def generate_ma_signal(
-    sma_fast: float, # e.g. 50
-    sma_slow: float  # e.g. 200
-) -> str:
-    """
-    Generate Moving Average signal (Golden/Death Cross context)
-    """
-    if sma_fast > sma_slow:
-        return 'Buy' # Uptrend
-    return 'Sell' # Downtrend
-
-
-def calculate_composite_score(
-    signals: dict,
-    weights: dict = None
-) -> dict:
-    """
-    Calculate a composite score (0-100) and final signal
-    """
-    if weights is None:
-        weights = {
-            'rsi': 0.3,
-            'macd': 0.3,
-            'ma': 0.2,
-            'bb': 0.2
-        }
-    
-    score = 50 # Neutral start
-    
-    # RSI Contribution
-    if signals['rsi'] == 'Buy': score += 20 * weights['rsi']
-    elif signals['rsi'] == 'Sell': score -= 20 * weights['rsi']
-    
-    # MACD Contribution
-    if signals['macd'] == 'Buy': score += 20 * weights['macd']
-    elif signals['macd'] == 'Sell': score -= 20 * weights['macd']
-    
-    # MA Contribution
-    if signals['ma'] == 'Buy': score += 20 * weights['ma']
-    elif signals['ma'] == 'Sell': score -= 20 * weights['ma']
-    
-    # BB Contribution
-    if signals['bb'] == 'Buy': score += 20 * weights['bb']
-    elif signals['bb'] == 'Sell': score -= 20 * weights['bb']
-    
-    # Normalize limits
-    score = max(0, min(100, score))
-    
-    # Determine Final Label
-    if score >= 80: label = 'Strong Buy'
-    elif score >= 60: label = 'Buy'
-    elif score <= 20: label = 'Strong Sell'
-    elif score <= 40: label = 'Sell'
-    else: label = 'Hold'
-    
-    return {
-        "score": round(score, 0),
-        "label": label
-    }
-
-
-
 def calculate_stop_loss(price: float, rsi: float) -> float:
     """Calculate stop loss based on RSI"""
     sl_pct = 3 if rsi < 35 else 5
@@ -250,3 +134,58 @@ def calculate_volume_ma(volume: pd.Series, period: int = 20) -> pd.Series:
         Series of Volume MA
     """
     return volume.rolling(window=period).mean()
+
+
+# ====================================================================
+# SHARED INDICATOR CACHE
+# ====================================================================
+
+INDICATOR_FUNCTIONS = {
+    'sma': calculate_sma,
+    'ema': calculate_ema,
+    'rsi': calculate_rsi,
+    'macd': calculate_macd,
+    'bb': calculate_bollinger_bands,
+}
+
+
+@dataclass(frozen=True)
+class IndicatorRef:
+    """
+    One indicator series: INDICATOR_FUNCTIONS[kind](close, *args), and for
+    multi-output indicators (macd, bb) the index of the output to use.
+    """
+    kind: str
+    args: tuple = ()
+    output: Optional[int] = None
+
+
+class IndicatorCache:
+    """
+    Indicator series for one close Series (or dates x symbols DataFrame),
+    memoized by kind and arguments so strategies and scanner signals that
+    share an indicator (e.g. SMA50) compute it only once.
+    """
+
+    def __init__(self, close):
+        self.close = close
+        self._series = {}
+
+    def get(self, ref: IndicatorRef):
+        key = (ref.kind, *ref.args)
+        if key not in self._series:
+            self._series[key] = INDICATOR_FUNCTIONS[ref.kind](self.close, *ref.args)
+        value = self._series[key]
+        return value if ref.output is None else value[ref.output]
+
+    def sma(self, window: int) -> pd.Series:
+        return self.get(IndicatorRef('sma', (window,)))
+
+    def rsi(self, period: int = 14) -> pd.Series:
+        return self.get(IndicatorRef('rsi', (period,)))
+
+    def macd(self, fast: int, slow: int, signal: int) -> tuple:
+        return self.get(IndicatorRef('macd', (fast, slow, signal)))
+
+    def bollinger(self, period: int, std: float) -> tuple:
+        return self.get(IndicatorRef('bb', (period, std)))
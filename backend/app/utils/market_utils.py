@@ -3,11 +3,14 @@ Market Utils
 Utilities for checking market status and hours (NSE India).
 """
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo
 
-def get_market_status() -> Dict:
-    """Check if Indian market is open"""
-    now = datetime.now()
+IST = ZoneInfo("Asia/Kolkata")
+
+def get_market_status(now: Optional[datetime] = None) -> Dict:
+    """Check if Indian market is open (at `now`, default the current IST time)"""
+    now = now or datetime.now(IST)
     weekday = now.weekday()
     hour = now.hour
     minute = now.minute
@@ -0,0 +1,188 @@
+"""
+Performance Metrics
+Risk and return figures computed from an equity array (and optionally a
+held/flat array and trade fill bars), each in a single vectorized pass.
+Shared by backtests and live-portfolio analytics.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..config import TRADING_DAYS_PER_YEAR, RISK_FREE_RATE, ROLLING_RETURN_WINDOWS
+
+
+def _round(value: Optional[float], digits: int = 2) -> Optional[float]:
+    """Round a float for the API, mapping NaN/inf to None"""
+    if value is None or not np.isfinite(value):
+        return None
+    return round(float(value), digits)
+
+
+def simple_returns(equity: np.ndarray) -> np.ndarray:
+    """Bar-to-bar returns (one shorter than equity)"""
+    equity = np.asarray(equity, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = equity[1:] / equity[:-1] - 1
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+
+def drawdowns(equity: np.ndarray) -> np.ndarray:
+    """Fractional drawdown from the running peak at each bar (0 at a new high)"""
+    equity = np.asarray(equity, dtype=float)
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dd = (peak - equity) / peak
+    return np.nan_to_num(dd, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def max_drawdown_duration(equity: np.ndarray) -> int:
+    """Longest run of bars spent below a previous peak"""
+    underwater = drawdowns(equity) > 0
+    if not underwater.any():
+        return 0
+    # Length of each run of True: distance between the run's edges
+    edges = np.diff(np.concatenate([[0], underwater.astype(np.int8), [0]]))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return int((ends - starts).max())
+
+
+def cagr(equity: np.ndarray, periods_per_year: int = TRADING_DAYS_PER_YEAR) -> float:
+    """Compound annual growth rate over the whole curve"""
+    equity = np.asarray(equity, dtype=float)
+    bars = len(equity) - 1
+    if bars <= 0 or equity[0] <= 0 or equity[-1] <= 0:
+        return 0.0
+    return float((equity[-1] / equity[0]) ** (periods_per_year / bars) - 1)
+
+
+def rolling_returns(
+    equity: np.ndarray,
+    windows: Dict[str, int] = ROLLING_RETURN_WINDOWS
+) -> Dict[str, dict]:
+    """
+    Returns over every rolling window of each length, in percent.
+    Windows longer than the curve are left out.
+    """
+    equity = np.asarray(equity, dtype=float)
+    result = {}
+    for label, bars in windows.items():
+        if bars >= len(equity):
+            continue
+        with np.errstate(invalid='ignore', divide='ignore'):
+            window = equity[bars:] / equity[:-bars] - 1
+        window = window[np.isfinite(window)]
+        if not len(window):
+            continue
+        result[label] = {
+            "latest": _round(window[-1] * 100),
+            "best": _round(window.max() * 100),
+            "worst": _round(window.min() * 100),
+            "average": _round(window.mean() * 100),
+            "positivePct": _round((window > 0).mean() * 100, 1),
+        }
+    return result
+
+
+def position_from_fills(n_bars: int, entries: np.ndarray, exits: np.ndarray) -> np.ndarray:
+    """
+    Held/flat per bar from entry and exit fill bars: held from the close
+    of the entry bar until the close of the exit bar.
+    """
+    change = np.zeros(n_bars + 1, dtype=np.int64)
+    np.add.at(change, np.asarray(entries, dtype=int), 1)
+    np.add.at(change, np.asarray(exits, dtype=int), -1)
+    return np.cumsum(change[:-1]) > 0
+
+
+def trade_excursions(
+    entries: np.ndarray,
+    exits: np.ndarray,
+    entry_prices: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Maximum adverse and favourable excursion of each long trade, in percent
+    of the entry price, over the bars after the entry fill up to the exit.
+
+    Returns (mae, mfe); mae is <= 0 and mfe >= 0.
+    """
+    entries = np.asarray(entries, dtype=int)
+    exits = np.asarray(exits, dtype=int)
+    entry_prices = np.asarray(entry_prices, dtype=float)
+    if not len(entries):
+        return np.zeros(0), np.zeros(0)
+
+    # Each trade's window is [entry + 1, exit]; reduceat over the window
+    # starts and (exclusive) ends, keeping every other segment
+    starts = np.minimum(entries + 1, exits)
+    bounds = np.column_stack([starts, exits + 1]).ravel()
+    high = np.append(np.asarray(high, dtype=float), np.nan)   # sentinel so exit + 1 is a valid index
+    low = np.append(np.asarray(low, dtype=float), np.nan)
+    worst = np.minimum.reduceat(low, bounds)[::2]
+    best = np.maximum.reduceat(high, bounds)[::2]
+
+    mae = np.minimum(worst / entry_prices - 1, 0) * 100
+    mfe = np.maximum(best / entry_prices - 1, 0) * 100
+    return mae, mfe
+
+
+def performance_metrics(
+    equity: np.ndarray,
+    held: Optional[np.ndarray] = None,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+    risk_free_rate: float = RISK_FREE_RATE
+) -> dict:
+    """
+    Risk-adjusted return figures for an equity curve.
+
+    Args:
+        equity: Portfolio value per bar
+        held: Optional bool per bar, whether capital was invested (for exposure)
+        periods_per_year: Bars per year used to annualize
+        risk_free_rate: Annual risk-free rate subtracted for Sharpe/Sortino
+
+    Returns:
+        Dict with cagr, volatility, sharpeRatio, sortinoRatio, calmarRatio,
+        maxDrawdown (percent, positive), maxDrawdownDuration (bars),
+        exposure (percent of bars held) and rollingReturns
+    """
+    equity = np.asarray(equity, dtype=float)
+    returns = simple_returns(equity)
+    excess = returns - risk_free_rate / periods_per_year
+    ann = np.sqrt(periods_per_year)
+
+    volatility = returns.std(ddof=1) * ann if len(returns) > 1 else 0.0
+    std = excess.std(ddof=1) if len(excess) > 1 else 0.0
+    sharpe = excess.mean() / std * ann if std > 0 else 0.0
+    downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2)) if len(excess) else 0.0
+    sortino = excess.mean() / downside * ann if downside > 0 else 0.0
+
+    growth = cagr(equity, periods_per_year)
+    max_dd = float(drawdowns(equity).max()) if len(equity) else 0.0
+    calmar = growth / max_dd if max_dd > 0 else 0.0
+
+    return {
+        "cagr": _round(growth * 100),
+        "volatility": _round(volatility * 100),
+        "sharpeRatio": _round(sharpe),
+        "sortinoRatio": _round(sortino),
+        "calmarRatio": _round(calmar),
+        "maxDrawdown": _round(max_dd * 100),
+        "maxDrawdownDuration": max_drawdown_duration(equity),
+        "exposure": _round(np.mean(held) * 100, 1) if held is not None and len(held) else None,
+        "rollingReturns": rolling_returns(equity),
+    }
+
+
+def beta(returns: np.ndarray, benchmark_returns: np.ndarray) -> Optional[float]:
+    """Sensitivity of returns to the benchmark's, None without enough variance"""
+    returns = np.asarray(returns, dtype=float)
+    benchmark_returns = np.asarray(benchmark_returns, dtype=float)
+    if len(returns) < 2:
+        return None
+    var = benchmark_returns.var(ddof=1)
+    if var <= 0:
+        return None
+    return float(np.cov(returns, benchmark_returns, ddof=1)[0, 1] / var)
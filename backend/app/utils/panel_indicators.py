@@ -0,0 +1,70 @@
+"""
+Panel Indicators
+The scanner's cross-sectional engine: every registered scanner signal's
+indicators, labels and composite score for a whole (dates x symbols) block
+in one vectorized pass per indicator.
+"""
+import numpy as np
+import pandas as pd
+
+from .indicators import IndicatorCache, calculate_volume_ma
+from .signals import calculate_panel_composite_score
+from .strategies import scanner_columns, label_scanner_signals, scanner_weights
+
+
+def _right_align_order(values: np.ndarray) -> np.ndarray:
+    """
+    Row order that moves each column's NaN padding to the top while keeping
+    the valid values in their original order, so the last row of every
+    column is that symbol's latest bar.
+    """
+    return np.argsort(~np.isnan(values), axis=0, kind="stable")
+
+
+def calculate_panel_indicators(
+    close: pd.DataFrame,
+    volume: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Calculate every scanner indicator for all symbols at once
+
+    Each indicator is one vectorized pass over the whole (dates x symbols)
+    block rather than a separate Series per symbol. Symbols with missing
+    bars are right-aligned first, so results match the single-Series
+    functions applied to each symbol's own history.
+
+    Args:
+        close: DataFrame of closing prices (dates x symbols)
+        volume: DataFrame of volumes with the same shape
+
+    Returns:
+        DataFrame indexed by symbol with last-bar indicator values, the
+        signal labels ('signal_rsi', 'signal_macd', 'signal_bb',
+        'signal_ma') and the composite 'score' and 'label'.
+        Missing indicator values are reported as 0, like item_value().
+    """
+    order = _right_align_order(close.to_numpy(dtype=float))
+    closes = pd.DataFrame(np.take_along_axis(close.to_numpy(dtype=float), order, axis=0), columns=close.columns)
+    volumes = pd.DataFrame(np.take_along_axis(volume.to_numpy(dtype=float), order, axis=0), columns=close.columns)
+
+    # Every indicator the scanner signals depend on, each computed once
+    indicators = IndicatorCache(closes)
+    series = {name: indicators.get(ref) for name, ref in scanner_columns().items()}
+    has_prev = len(closes) > 1
+
+    last = pd.DataFrame({
+        'price': closes.iloc[-1],
+        **{name: values.iloc[-1] for name, values in series.items()},
+        'prev_macd': series['macd'].iloc[-2] if has_prev else np.nan,
+        'prev_macd_signal': series['macd_signal'].iloc[-2] if has_prev else np.nan,
+        'volume': volumes.iloc[-1],
+        'volume_ma': calculate_volume_ma(volumes).iloc[-1],
+    }).fillna(0)
+    last['bars'] = closes.notna().sum()
+
+    signals = label_scanner_signals({column: last[column].to_numpy() for column in last.columns})
+    for key, labels in signals.items():
+        last[f'signal_{key}'] = labels
+    last['score'], last['label'] = calculate_panel_composite_score(signals, scanner_weights())
+
+    return last
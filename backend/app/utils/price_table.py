@@ -0,0 +1,224 @@
+"""
+Price Table
+Live prices in a fixed-layout buffer that other processes can map.
+
+Layout (one block, all fields 8-byte aligned):
+    header      int64[2]          sequence counter, slots in use
+    symbols     S32[capacity]     symbol of each slot, append-only
+    prices      float64[capacity]
+    timestamps  float64[capacity] epoch seconds of each price
+
+A single writer updates it under a seqlock: the counter is odd while a
+write is in progress. Readers copy what they need and retry a few times if
+the counter moved, then fall back to the last prices they read consistently,
+so reads never block and never see a half-written batch. Slots are never
+reassigned, so each reader keeps its own symbol -> slot index and only
+extends it when the slot count grows.
+"""
+import logging
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, Mapping, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SYMBOL_BYTES = 32
+_SEQ, _COUNT = 0, 1
+# Times a read retries around an unfinished write before using its last good copy
+_READ_ATTEMPTS = 100
+
+
+def _table_size(capacity: int) -> int:
+    return 16 + capacity * (SYMBOL_BYTES + 16)
+
+
+class PriceTable(Mapping):
+    """
+    symbol -> latest price, readable as a dict. Shared between processes
+    when opened by name, private to this process otherwise.
+
+    Only one process may write a shared table; `writer` says whether this
+    process is it (private tables are always writable).
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        self.capacity = capacity
+        self.name = name
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        size = _table_size(capacity)
+
+        if name is None:
+            buffer = bytearray(size)
+        else:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                # The table outlives any one worker: don't let this process's
+                # resource tracker unlink it when the process exits
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name)
+                if self._shm.size < size:
+                    self._shm.close()
+                    raise ValueError(f"Shared price table {name} is smaller than {capacity} slots")
+            buffer = self._shm.buf
+
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=buffer)
+        self._symbols = np.ndarray((capacity,), dtype=f"S{SYMBOL_BYTES}", buffer=buffer, offset=16)
+        offset = 16 + capacity * SYMBOL_BYTES
+        self._prices = np.ndarray((capacity,), dtype=np.float64, buffer=buffer, offset=offset)
+        self._timestamps = np.ndarray((capacity,), dtype=np.float64, buffer=buffer, offset=offset + capacity * 8)
+
+        self._writer = name is None
+        self._slots: Dict[str, int] = {}
+        # Last consistently read prices, served while a write is unfinished
+        self._last: Dict[str, float] = {}
+        self._full_warned = False
+        self._stale_warned = False
+
+    @property
+    def shared(self) -> bool:
+        return self._shm is not None
+
+    @property
+    def writer(self) -> bool:
+        return self._writer
+
+    @writer.setter
+    def writer(self, value: bool):
+        if value and not self._writer and self.shared:
+            # A previous writer that died mid-batch left the counter odd;
+            # round it up so this writer's own increments keep the parity
+            seq = int(self._header[_SEQ])
+            if seq & 1:
+                self._header[_SEQ] = seq + 1
+        self._writer = value
+
+    # ----------------------------------------------------------------
+    # Reading
+    # ----------------------------------------------------------------
+
+    def _sync_slots(self):
+        """Add slots appended since the last call to the local index"""
+        count = int(self._header[_COUNT])
+        known = len(self._slots)
+        if count > known:
+            for slot in range(known, count):
+                self._slots[self._symbols[slot].decode()] = slot
+
+    def _read(self, fn):
+        """
+        fn() run without a write overlapping it, or None if a write is still
+        unfinished after a few attempts. Never waits for the writer.
+        """
+        for _ in range(_READ_ATTEMPTS):
+            before = int(self._header[_SEQ])
+            if not before & 1:
+                result = fn()
+                if int(self._header[_SEQ]) == before:
+                    self._stale_warned = False
+                    return result
+            # Let the writer (possibly a thread of this process) finish
+            time.sleep(0)
+        if not self._stale_warned:
+            logger.warning("Price table write unfinished; serving the last prices read")
+            self._stale_warned = True
+        return None
+
+    def __getitem__(self, symbol: str) -> float:
+        self._sync_slots()
+        slot = self._slots[symbol]
+        price = self._read(lambda: float(self._prices[slot]))
+        if price is None:
+            return self._last[symbol]
+        self._last[symbol] = price
+        return price
+
+    def __contains__(self, symbol) -> bool:
+        self._sync_slots()
+        return symbol in self._slots
+
+    def __iter__(self) -> Iterator[str]:
+        self._sync_slots()
+        return iter(list(self._slots))
+
+    def __len__(self) -> int:
+        return int(self._header[_COUNT])
+
+    def snapshot(self) -> Dict[str, float]:
+        """Every price as a plain dict, read consistently"""
+        def read():
+            count = int(self._header[_COUNT])
+            return self._symbols[:count].copy(), self._prices[:count].copy()
+        result = self._read(read)
+        if result is None:
+            return dict(self._last)
+        symbols, prices = result
+        self._last = {s.decode(): float(p) for s, p in zip(symbols, prices)}
+        return dict(self._last)
+
+    copy = snapshot
+
+    def updated_at(self, symbol: str) -> Optional[float]:
+        """When the symbol's price was last written (epoch seconds)"""
+        self._sync_slots()
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return None
+        return self._read(lambda: float(self._timestamps[slot]))
+
+    # ----------------------------------------------------------------
+    # Writing (single writer)
+    # ----------------------------------------------------------------
+
+    def update(self, prices: Mapping[str, float]):
+        """Write a batch of prices; readers see all of it or none of it"""
+        if not prices:
+            return
+        if not self.writer:
+            raise PermissionError("This process does not write the shared price table")
+        self._sync_slots()
+        now = time.time()
+
+        self._header[_SEQ] += 1
+        try:
+            count = int(self._header[_COUNT])
+            for symbol, price in prices.items():
+                slot = self._slots.get(symbol)
+                if slot is None:
+                    if count >= self.capacity or len(symbol.encode()) > SYMBOL_BYTES:
+                        if not self._full_warned:
+                            logger.warning(f"Price table full or symbol too long, not storing {symbol}")
+                            self._full_warned = True
+                        continue
+                    slot = count
+                    self._symbols[slot] = symbol.encode()
+                    self._slots[symbol] = slot
+                    count += 1
+                self._prices[slot] = price
+                self._timestamps[slot] = now
+            # Publish new slots only once their symbol and price are in place
+            self._header[_COUNT] = count
+        finally:
+            self._header[_SEQ] += 1
+
+    def __setitem__(self, symbol: str, price: float):
+        self.update({symbol: price})
+
+    def close(self):
+        if self._shm is not None:
+            # The array views pin the buffer; drop them before unmapping
+            self._header = self._symbols = self._prices = self._timestamps = None
+            self._shm.close()
+            self._shm = None
+
+
+def open_price_table(capacity: int, name: Optional[str] = None) -> PriceTable:
+    """The shared table called `name`, or a private one if name is None or it can't be opened"""
+    if name is not None:
+        try:
+            return PriceTable(capacity, name)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Shared price table unavailable, using a private one: {e}")
+    return PriceTable(capacity)
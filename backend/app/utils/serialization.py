@@ -0,0 +1,70 @@
+"""
+Serialization Utils
+Encode hot payloads once and serve the cached bytes directly, skipping
+jsonable_encoder and per-request GZip on cache hits.
+"""
+import gzip
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request, Response
+
+from ..config import GZIP_MIN_SIZE, GZIP_LEVEL
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Compact JSON bytes (numpy scalars/arrays supported)"""
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, default=str, option=option)
+
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+class CachedPayload:
+    """
+    A JSON body encoded once. The gzip variant is built on first request
+    from a client that accepts it and reused afterwards.
+    """
+
+    __slots__ = ("body", "_gzipped")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._gzipped: Optional[bytes] = None
+
+    @classmethod
+    def encode(cls, obj: Any, sort_keys: bool = False) -> "CachedPayload":
+        return cls(dumps(obj, sort_keys=sort_keys))
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            # mtime=0 keeps the bytes stable for identical bodies
+            self._gzipped = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+        return self._gzipped
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def data(self) -> Any:
+        """Decoded Python value, for non-HTTP callers"""
+        return loads(self.body)
+
+
+def payload_response(request: Request, payload: CachedPayload, headers: Optional[dict] = None) -> Response:
+    """
+    Raw JSON response for a cached payload, pre-compressed when the client
+    accepts gzip. GZipMiddleware leaves responses with Content-Encoding alone.
+    """
+    headers = dict(headers or {})
+    body = payload.body
+    if len(body) >= GZIP_MIN_SIZE:
+        headers["Vary"] = "Accept-Encoding"
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            body = payload.gzipped
+            headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,52 @@
+"""
+Scanner Signal Labels
+Vectorized Buy/Sell/Hold labelling and the composite score built from the
+labels. Shared by the strategy registry, the panel engine and the
+streaming indicators.
+"""
+import numpy as np
+
+
+def label_signals(conditions: list, labels: list) -> np.ndarray:
+    """Vectorized if/elif chain returning 'Hold' when nothing matches"""
+    return np.select(conditions, labels, default='Hold')
+
+
+def calculate_panel_composite_score(
+    signals: dict,
+    weights: dict = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Composite score (0-100) and final label over arrays of signal labels
+
+    Each 'Buy' adds and each 'Sell' subtracts 20 * weight from a neutral 50.
+
+    Args:
+        signals: Dict of label arrays keyed by signal name
+        weights: Per-signal weights; only signals listed here are scored
+            (default: rsi 0.3, macd 0.3, ma 0.2, bb 0.2)
+
+    Returns:
+        Tuple of (score, label) arrays
+    """
+    if weights is None:
+        weights = {
+            'rsi': 0.3,
+            'macd': 0.3,
+            'ma': 0.2,
+            'bb': 0.2
+        }
+
+    score = np.full(len(next(iter(signals.values()))), 50.0)
+    for key, weight in weights.items():
+        labels = np.asarray(signals[key])
+        score = score + np.where(labels == 'Buy', 20 * weight, 0.0)
+        score = score - np.where(labels == 'Sell', 20 * weight, 0.0)
+
+    score = np.clip(score, 0, 100)
+    label = np.select(
+        [score >= 80, score >= 60, score <= 20, score <= 40],
+        ['Strong Buy', 'Buy', 'Strong Sell', 'Sell'],
+        default='Hold'
+    )
+    return np.round(score, 0), label
@@ -0,0 +1,269 @@
+"""
+Strategy Registry
+Backtest strategies and scanner signals declare their parameters, the
+indicators they depend on and a vectorized signal function. Engines
+compute the declared indicators through a shared IndicatorCache, so an
+indicator used by several strategies or signals is computed once.
+
+Adding a strategy is one register_strategy() call; the backtest engine,
+sweeps and /api/strategies pick it up from here.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .indicators import IndicatorRef
+from .signals import label_signals
+
+Arrays = Dict[str, np.ndarray]
+
+
+@dataclass(frozen=True)
+class Strategy:
+    """
+    A backtest strategy.
+
+    indicators(params) maps frame column -> IndicatorRef; signals(columns,
+    params) gets those columns plus 'Close' as arrays and returns (buy, sell)
+    bool arrays; info(value, params) formats the readout recorded on a
+    trade, where value(column) reads that bar's column value.
+    """
+    id: str
+    name: str
+    description: str
+    params: Tuple[str, ...]
+    indicators: Callable[[dict], Dict[str, IndicatorRef]]
+    signals: Callable[[Arrays, dict], Tuple[np.ndarray, np.ndarray]]
+    info: Callable[[Callable[[str], float], dict], str]
+    title: Callable[[dict], str]
+
+
+@dataclass(frozen=True)
+class ScannerSignal:
+    """
+    One Buy/Sell/Hold label in the scanner's composite score.
+
+    indicators maps panel column -> IndicatorRef; label(columns) gets the
+    latest-bar panel columns as arrays (one entry per symbol).
+    """
+    key: str
+    weight: float
+    indicators: Dict[str, IndicatorRef]
+    label: Callable[[Arrays], np.ndarray]
+
+
+STRATEGIES: Dict[str, Strategy] = {}
+SCANNER_SIGNALS: Dict[str, ScannerSignal] = {}
+
+# Panel columns shown in scanner results that no signal depends on
+SCANNER_DISPLAY_COLUMNS = {'sma20': IndicatorRef('sma', (20,))}
+
+
+def register_strategy(strategy: Strategy) -> Strategy:
+    STRATEGIES[strategy.id] = strategy
+    return strategy
+
+
+def register_scanner_signal(signal: ScannerSignal) -> ScannerSignal:
+    SCANNER_SIGNALS[signal.key] = signal
+    return signal
+
+
+def get_strategy(strategy_id: str) -> Optional[Strategy]:
+    return STRATEGIES.get(strategy_id)
+
+
+def list_strategies() -> List[dict]:
+    """Strategy descriptions for the API"""
+    return [
+        {"id": s.id, "name": s.name, "description": s.description, "params": list(s.params)}
+        for s in STRATEGIES.values()
+    ]
+
+
+def scanner_columns() -> Dict[str, IndicatorRef]:
+    """Union of the indicator columns every scanner signal (and the display) needs"""
+    columns = {}
+    for signal in SCANNER_SIGNALS.values():
+        columns.update(signal.indicators)
+    for name, ref in SCANNER_DISPLAY_COLUMNS.items():
+        columns.setdefault(name, ref)
+    # Stable display order: the classic scanner columns first
+    order = ['rsi', 'sma20', 'sma50', 'sma200', 'macd', 'macd_signal', 'macd_hist', 'bb_upper', 'bb_lower']
+    return dict(sorted(columns.items(), key=lambda item: order.index(item[0]) if item[0] in order else len(order)))
+
+
+def label_scanner_signals(columns: Arrays) -> Arrays:
+    """Label arrays for every registered scanner signal"""
+    return {key: signal.label(columns) for key, signal in SCANNER_SIGNALS.items()}
+
+
+def scanner_weights() -> Dict[str, float]:
+    return {key: signal.weight for key, signal in SCANNER_SIGNALS.items()}
+
+
+def _prev(values: np.ndarray) -> np.ndarray:
+    """values shifted one bar later; the first bar has no previous value"""
+    out = np.empty_like(values)
+    out[0] = np.nan
+    out[1:] = values[:-1]
+    return out
+
+
+# ====================================================================
+# SHARED INDICATORS
+# ====================================================================
+
+SMA50 = IndicatorRef('sma', (50,))
+SMA200 = IndicatorRef('sma', (200,))
+RSI14 = IndicatorRef('rsi', (14,))
+
+
+def _macd(fast: int, slow: int, signal: int, output: int) -> IndicatorRef:
+    return IndicatorRef('macd', (fast, slow, signal), output)
+
+
+def _bb(period: int, std: float, output: int) -> IndicatorRef:
+    return IndicatorRef('bb', (period, std), output)
+
+
+# ====================================================================
+# BACKTEST STRATEGIES
+# ====================================================================
+
+def _rsi_sma_signals(c: Arrays, p: dict):
+    buy = (c['Close'] > c['SMA50']) & (c['RSI'] < p['rsi_oversold'])
+    sell = (c['RSI'] > p['rsi_overbought']) | (c['Close'] < c['SMA50'])
+    return buy, sell
+
+
+def _macd_signals(c: Arrays, p: dict):
+    prev_hist = _prev(c['MACD_Hist'])
+    return (prev_hist < 0) & (c['MACD_Hist'] > 0), (prev_hist > 0) & (c['MACD_Hist'] < 0)
+
+
+def _bollinger_signals(c: Arrays, p: dict):
+    close = c['Close']
+    return close <= c['BB_Lower'], (close >= c['BB_Upper']) | (close < c['BB_Mid'])
+
+
+def _bollinger_info(value, p: dict) -> str:
+    current_price, lower, upper = value('Close'), value('BB_Lower'), value('BB_Upper')
+    bb_pct = ((current_price - lower) / (upper - lower) * 100) if upper != lower else 50
+    return f"BB%: {bb_pct:.1f}"
+
+
+def _ma_crossover_signals(c: Arrays, p: dict):
+    fast, slow = c['MA_Fast'], c['MA_Slow']
+    prev_fast, prev_slow = _prev(fast), _prev(slow)
+    return (prev_fast <= prev_slow) & (fast > slow), (prev_fast >= prev_slow) & (fast < slow)
+
+
+register_strategy(Strategy(
+    id="rsi_sma",
+    name="RSI + SMA50",
+    description="Buy when RSI is oversold and price > SMA50, sell when RSI overbought",
+    params=("rsi_oversold", "rsi_overbought"),
+    indicators=lambda p: {'SMA50': SMA50, 'RSI': RSI14},
+    signals=_rsi_sma_signals,
+    info=lambda value, p: f"RSI: {value('RSI'):.1f}",
+    title=lambda p: "RSI + SMA50",
+))
+
+register_strategy(Strategy(
+    id="macd",
+    name="MACD Crossover",
+    description="Buy on bullish MACD histogram crossover, sell on bearish crossover",
+    params=("macd_fast", "macd_slow", "macd_signal"),
+    indicators=lambda p: {
+        name: _macd(p['macd_fast'], p['macd_slow'], p['macd_signal'], i)
+        for i, name in enumerate(('MACD', 'MACD_Signal', 'MACD_Hist'))
+    },
+    signals=_macd_signals,
+    info=lambda value, p: f"MACD: {value('MACD'):.2f}",
+    title=lambda p: f"MACD ({p['macd_fast']},{p['macd_slow']},{p['macd_signal']})",
+))
+
+register_strategy(Strategy(
+    id="bollinger",
+    name="Bollinger Bands",
+    description="Buy when price touches lower band, sell at upper band",
+    params=("bb_period", "bb_std"),
+    indicators=lambda p: {
+        name: _bb(p['bb_period'], p['bb_std'], i)
+        for i, name in enumerate(('BB_Mid', 'BB_Upper', 'BB_Lower'))
+    },
+    signals=_bollinger_signals,
+    info=_bollinger_info,
+    title=lambda p: f"Bollinger Bands ({p['bb_period']}, {p['bb_std']}σ)",
+))
+
+register_strategy(Strategy(
+    id="ma_crossover",
+    name="Moving Average Crossover",
+    description="Golden cross buy, death cross sell",
+    params=("ma_fast", "ma_slow"),
+    indicators=lambda p: {
+        'MA_Fast': IndicatorRef('sma', (p['ma_fast'],)),
+        'MA_Slow': IndicatorRef('sma', (p['ma_slow'],)),
+    },
+    signals=_ma_crossover_signals,
+    info=lambda value, p: f"Fast: {value('MA_Fast'):.1f}",
+    title=lambda p: f"MA Crossover ({p['ma_fast']}/{p['ma_slow']})",
+))
+
+
+# ====================================================================
+# SCANNER SIGNALS (composite score, in scoring order)
+# ====================================================================
+
+register_scanner_signal(ScannerSignal(
+    key='rsi',
+    weight=0.3,
+    indicators={'rsi': RSI14, 'sma50': SMA50},
+    label=lambda c: label_signals(
+        [(c['price'] > c['sma50']) & (c['rsi'] < 30), (c['rsi'] > 70) | (c['price'] < c['sma50'])],
+        ['Buy', 'Sell']
+    ),
+))
+
+
+def _macd_label(c: Arrays) -> np.ndarray:
+    macd, signal = c['macd'], c['macd_signal']
+    prev_macd, prev_signal = c['prev_macd'], c['prev_macd_signal']
+    crossover_ready = c['bars'] > 1
+    return label_signals(
+        [
+            crossover_ready & (prev_macd < prev_signal) & (macd > signal),
+            crossover_ready & (prev_macd > prev_signal) & (macd < signal),
+            (macd > signal) & (macd > 0),
+            (macd < signal) & (macd < 0),
+        ],
+        ['Buy', 'Sell', 'Buy', 'Sell']
+    )
+
+
+register_scanner_signal(ScannerSignal(
+    key='macd',
+    weight=0.3,
+    indicators={name: _macd(12, 26, 9, i) for i, name in enumerate(('macd', 'macd_signal', 'macd_hist'))},
+    label=_macd_label,
+))
+
+register_scanner_signal(ScannerSignal(
+    key='ma',
+    weight=0.2,
+    indicators={'sma50': SMA50, 'sma200': SMA200},
+    label=lambda c: np.where(c['sma50'] > c['sma200'], 'Buy', 'Sell'),
+))
+
+register_scanner_signal(ScannerSignal(
+    key='bb',
+    weight=0.2,
+    indicators={'bb_upper': _bb(20, 2.0, 1), 'bb_lower': _bb(20, 2.0, 2)},
+    label=lambda c: label_signals(
+        [c['price'] <= c['bb_lower'], c['price'] >= c['bb_upper']],
+        ['Buy', 'Sell']
+    ),
+))
@@ -0,0 +1,282 @@
+"""
+Streaming Technical Indicators
+O(1) per-bar updates that track the batch functions in indicators.py and
+panel_indicators.py, so
+live ticks can refresh scanner technicals without recomputing ~250 bars.
+
+Every indicator supports `update(x)` (commit a finished bar) and
+`preview(x)` (value if the bar closed at x now, without changing state).
+"""
+import math
+from collections import deque
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .signals import calculate_panel_composite_score
+from .strategies import label_scanner_signals, scanner_weights
+
+NAN = float('nan')
+
+
+class StreamingEMA:
+    """EMA matching prices.ewm(span=period, adjust=False).mean()"""
+
+    def __init__(self, period: int, value: Optional[float] = None):
+        self.alpha = 2 / (period + 1)
+        self.value = value
+
+    def preview(self, x: float) -> float:
+        if self.value is None:
+            return x
+        return self.alpha * x + (1 - self.alpha) * self.value
+
+    def update(self, x: float) -> float:
+        self.value = self.preview(x)
+        return self.value
+
+
+class RollingStats:
+    """Rolling mean / sample std via running sums (matches .rolling(period))"""
+
+    def __init__(self, period: int, values: Sequence[float] = ()):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self._ref = None
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._updates = 0
+        for x in values[-period:]:
+            self.update(x)
+
+    def _resync(self):
+        # Re-sum from the buffer once per window to stop float drift
+        self._ref = self.window[0] if self.window else None
+        self._sum = sum(x - self._ref for x in self.window) if self.window else 0.0
+        self._sumsq = sum((x - self._ref) ** 2 for x in self.window) if self.window else 0.0
+        self._updates = 0
+
+    def _sums_with(self, x: float) -> tuple[int, float, float]:
+        """(count, sum, sumsq) of the window after pushing x, shifted by _ref"""
+        ref = self._ref if self._ref is not None else x
+        s, sq, n = self._sum + (x - ref), self._sumsq + (x - ref) ** 2, len(self.window) + 1
+        if len(self.window) == self.period:
+            oldest = self.window[0]
+            s -= oldest - ref
+            sq -= (oldest - ref) ** 2
+            n -= 1
+        return n, s, sq
+
+    def update(self, x: float):
+        if self._ref is None:
+            self._ref = x
+        _, self._sum, self._sumsq = self._sums_with(x)
+        self.window.append(x)
+        self._updates += 1
+        if self._updates >= self.period:
+            self._resync()
+
+    def _mean_std(self, n: int, s: float, sq: float) -> tuple[float, float]:
+        if n < self.period:
+            return NAN, NAN
+        ref = self._ref if self._ref is not None else 0.0
+        mean = ref + s / n
+        var = max(0.0, (sq - s * s / n) / (n - 1)) if n > 1 else NAN
+        return mean, math.sqrt(var)
+
+    def mean(self) -> float:
+        return self._mean_std(len(self.window), self._sum, self._sumsq)[0]
+
+    def preview(self, x: float) -> tuple[float, float]:
+        """(mean, std) if x were pushed"""
+        if self._ref is None:
+            return NAN, NAN
+        return self._mean_std(*self._sums_with(x))
+
+
+class StreamingRSI:
+    """
+    RSI matching calculate_rsi: simple rolling means of gains and losses.
+    (calculate_rsi is not Wilder-smoothed, so neither is this.)
+    """
+
+    def __init__(self, period: int = 14, closes: Sequence[float] = ()):
+        self.gains = RollingStats(period)
+        self.losses = RollingStats(period)
+        self.last = None
+        for x in closes[-(period + 1):]:
+            self.update(x)
+
+    def _move(self, x: float) -> tuple[float, float]:
+        # First bar has no delta; calculate_rsi counts it as 0 gain / 0 loss
+        delta = 0.0 if self.last is None else x - self.last
+        return max(delta, 0.0), max(-delta, 0.0)
+
+    @staticmethod
+    def _rsi(gain: float, loss: float) -> float:
+        if math.isnan(gain) or math.isnan(loss) or (gain == 0 and loss == 0):
+            return NAN
+        if loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+    def preview(self, x: float) -> float:
+        gain, loss = self._move(x)
+        return self._rsi(self.gains.preview(gain)[0], self.losses.preview(loss)[0])
+
+    def update(self, x: float) -> float:
+        value = self.preview(x)
+        gain, loss = self._move(x)
+        self.gains.update(gain)
+        self.losses.update(loss)
+        self.last = x
+        return value
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram matching calculate_macd"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.macd = None
+
+    def preview(self, x: float) -> tuple[float, float, float]:
+        macd = self.fast.preview(x) - self.slow.preview(x)
+        signal = self.signal.preview(macd)
+        return macd, signal, macd - signal
+
+    def update(self, x: float) -> tuple[float, float, float]:
+        self.macd = self.fast.update(x) - self.slow.update(x)
+        signal = self.signal.update(self.macd)
+        return self.macd, signal, self.macd - signal
+
+
+def _nz(value: float) -> float:
+    """NaN -> 0, like item_value()"""
+    return 0.0 if value is None or math.isnan(value) else float(value)
+
+
+class SymbolIndicatorState:
+    """
+    All scanner indicators for one symbol.
+
+    Committed state covers finished bars; the latest (possibly still forming)
+    bar is kept aside so intraday ticks replace its close instead of adding
+    a new bar. A tick dated after the current bar rolls it into the state.
+    """
+
+    def __init__(self):
+        self.rsi = StreamingRSI(14)
+        self.sma20 = RollingStats(20)
+        self.sma50 = RollingStats(50)
+        self.sma200 = RollingStats(200)
+        self.bb = RollingStats(20)
+        self.macd = StreamingMACD(12, 26, 9)
+        self.volume_ma = RollingStats(20)
+        self.prev_macd = (NAN, NAN)
+        self.bars = 0
+        self.recent = deque(maxlen=20)
+        self.current_close = None
+        self.current_volume = 0.0
+        self.current_date = None
+
+    @classmethod
+    def from_history(cls, closes: Sequence[float], volumes: Sequence[float], last_date) -> "SymbolIndicatorState":
+        """Seed from a daily history whose last bar may still be forming"""
+        closes = np.asarray(closes, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+        state = cls()
+        committed = closes[:-1]
+
+        # Windows only need their last `period` values; EMAs are seeded
+        # from one vectorized ewm pass over the committed bars
+        state.rsi = StreamingRSI(14, committed)
+        state.sma20 = RollingStats(20, committed)
+        state.sma50 = RollingStats(50, committed)
+        state.sma200 = RollingStats(200, committed)
+        state.bb = RollingStats(20, committed)
+        state.volume_ma = RollingStats(20, volumes[:-1])
+
+        if len(committed):
+            series = pd.Series(committed)
+            fast = series.ewm(span=12, adjust=False).mean()
+            slow = series.ewm(span=26, adjust=False).mean()
+            macd = fast - slow
+            signal = macd.ewm(span=9, adjust=False).mean()
+            state.macd.fast.value = float(fast.iloc[-1])
+            state.macd.slow.value = float(slow.iloc[-1])
+            state.macd.signal.value = float(signal.iloc[-1])
+            state.macd.macd = float(macd.iloc[-1])
+            state.prev_macd = (float(macd.iloc[-1]), float(signal.iloc[-1]))
+
+        state.bars = len(committed)
+        state.recent.extend(committed[-19:])
+        state.current_close = float(closes[-1])
+        state.current_volume = float(volumes[-1])
+        state.current_date = last_date
+        return state
+
+    def _commit(self, close: float, volume: float):
+        self.rsi.update(close)
+        for window in (self.sma20, self.sma50, self.sma200, self.bb):
+            window.update(close)
+        self.volume_ma.update(volume)
+        macd, signal, _ = self.macd.update(close)
+        self.prev_macd = (macd, signal)
+        self.recent.append(close)
+        self.bars += 1
+
+    def on_bar(self, close: float, volume: float, date):
+        """Start a new bar, committing the previous one"""
+        if self.current_close is not None:
+            self._commit(self.current_close, self.current_volume)
+        self.current_close = float(close)
+        self.current_volume = float(volume)
+        self.current_date = date
+
+    def on_tick(self, price: float, date=None):
+        """Update the forming bar's close; rolls over when `date` is a new bar"""
+        if date is not None and self.current_date is not None and date > self.current_date:
+            self.on_bar(price, 0.0, date)
+        else:
+            self.current_close = float(price)
+
+    def snapshot(self) -> dict:
+        """Indicator row in the same shape as calculate_panel_indicators"""
+        price = self.current_close
+        macd, signal, hist = self.macd.preview(price)
+        bb_mid, bb_std = self.bb.preview(price)
+        row = {
+            'price': price,
+            'rsi': _nz(self.rsi.preview(price)),
+            'sma20': _nz(self.sma20.preview(price)[0]),
+            'sma50': _nz(self.sma50.preview(price)[0]),
+            'sma200': _nz(self.sma200.preview(price)[0]),
+            'macd': _nz(macd),
+            'macd_signal': _nz(signal),
+            'macd_hist': _nz(hist),
+            'prev_macd': _nz(self.prev_macd[0]),
+            'prev_macd_signal': _nz(self.prev_macd[1]),
+            'bb_upper': _nz(bb_mid + 2.0 * bb_std),
+            'bb_lower': _nz(bb_mid - 2.0 * bb_std),
+            'volume': _nz(self.current_volume),
+            'volume_ma': _nz(self.volume_ma.preview(self.current_volume)[0]),
+            'bars': self.bars + 1,
+        }
+
+        # Scanner signals from the shared registry, on one-element arrays
+        columns = {name: np.array([value]) for name, value in row.items()}
+        signals = label_scanner_signals(columns)
+        score, label = calculate_panel_composite_score(signals, scanner_weights())
+        for key, labels in signals.items():
+            row[f'signal_{key}'] = str(labels[0])
+        row['score'] = float(score[0])
+        row['label'] = str(label[0])
+        return row
+
+    def recent_closes(self) -> list:
+        """Last 20 closes including the forming bar"""
+        return list(self.recent)[-19:] + [self.current_close]
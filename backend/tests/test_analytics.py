@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from sqlmodel import SQLModel, Session, create_engine
+from app.models import Transaction
+from app.services import analytics_service
+from app.services.data_provider.base import make_panel
+
+class _Provider:
+    """Flat prices; INFY only starts trading on the sixth day"""
+    def get_batch_history(self, symbols, period="1y", interval="1d"):
+        dates = pd.date_range("2024-01-01", periods=20, freq="B")
+        tcs = pd.DataFrame({"Close": 50.0, "Volume": 1.0}, index=dates)
+        infy = pd.DataFrame({"Close": 100.0, "Volume": 1.0}, index=dates[5:])
+        return make_panel({"TCS": tcs, "INFY": infy})
+
+def _session(*transactions):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    session.add_all(transactions)
+    session.commit()
+    return session
+
+def test_risk_metrics_without_prices_or_benchmark(monkeypatch):
+    monkeypatch.setattr(analytics_service, "current_provider", _Provider())
+    assert analytics_service.calculate_risk_metrics(_session())["beta"] is None
+
+    session = _session(
+        Transaction(symbol="TCS", type="BUY", quantity=10, price=50.0, date="2024-01-01"),
+        Transaction(symbol="INFY", type="BUY", quantity=10, price=100.0, date="2024-01-01"),
+    )
+    risk = analytics_service.calculate_risk_metrics(session)
+    # INFY joins the portfolio at its first price instead of jumping from 0
+    assert risk["volatility"] == 0 and risk["maxDrawdown"] == 0
+    assert risk["beta"] is None and risk["tradingDays"] == 19
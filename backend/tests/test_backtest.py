@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from app.services.backtest_service import simulate_trades, calculate_metrics, get_default_params
+
+def _crossing_hist():
+    index = pd.date_range("2024-01-01", periods=8, freq="D")
+    close = [100.0, 101.0, 102.0, 104.0, 103.0, 99.0, 98.0, 101.0]
+    fast = [1.0, 1.0, 3.0, 3.0, 3.0, 1.0, 1.0, 3.0]   # crosses above slow at bars 2 and 7
+    slow = [2.0] * 8                                  # and below it at bar 5
+    return pd.DataFrame({"Close": close, "MA_Fast": fast, "MA_Slow": slow}, index=index)
+
+def test_simulate_trades_crossover_fills_and_equity():
+    hist = _crossing_hist()
+    trades, equity = simulate_trades(hist, "ma_crossover", get_default_params(), 10000)
+
+    assert [(t["type"], t["date"]) for t in trades] == [
+        ("BUY", "2024-01-03"), ("SELL", "2024-01-06"), ("BUY", "2024-01-08"), ("SELL (End)", "2024-01-08")
+    ]
+    shares = int(10000 * 0.95 / 102.0)
+    assert trades[0]["shares"] == shares
+    assert trades[1]["profit"] == round((99.0 - 102.0) * shares, 2)
+
+    # Equity is marked before the bar's own fill
+    cash = 10000 - shares * 102.0
+    assert equity[2]["equity"] == 10000
+    assert equity[3]["equity"] == round(cash + shares * 104.0, 2)
+    assert equity[6]["equity"] == round(cash + shares * 99.0, 2)
+    assert len(equity) == len(hist)
+
+def test_metrics_drawdown_from_equity_curve():
+    hist = _crossing_hist()
+    trades, equity = simulate_trades(hist, "ma_crossover", get_default_params(), 10000)
+    metrics = calculate_metrics(trades, equity, 10000, hist)
+
+    values = np.array([e["equity"] for e in equity])
+    peak = np.maximum.accumulate(values)
+    assert metrics["maxDrawdown"] == round(((peak - values) / peak * 100).max(), 2)
+    assert metrics["totalTrades"] == 2
+
+def test_backtest_cache_follows_stored_bars(tmp_path, monkeypatch):
+    from app.services import backtest_service
+    from app.services.ohlcv_store import OHLCVStore
+    from app.services.data_provider.base import history_fingerprint
+    from app.services.data_provider.stored_provider import StoredHistoryProvider
+    from app.utils.cache import backtest_cache
+    from tests.test_ohlcv_store import CountingProvider
+
+    inner = CountingProvider()
+    store = OHLCVStore(tmp_path)
+    provider = StoredHistoryProvider(inner, store)
+    monkeypatch.setattr(backtest_service, "current_provider", provider)
+    backtest_cache.clear()
+
+    first = backtest_service.run_backtest("TCS", "1y", "ma_crossover")
+    assert store.fingerprint("TCS", "1y") == history_fingerprint(store.read("TCS", "1y"))
+    # Unchanged bars: served from the cache without reading history again
+    monkeypatch.setattr(backtest_service, "load_price_histories", lambda *a: 1 / 0)
+    assert backtest_service.run_backtest("TCS", "1y", "ma_crossover") == first
+    monkeypatch.undo()
+    monkeypatch.setattr(backtest_service, "current_provider", provider)
+
+    # A moved forming bar changes the fingerprint
+    bars = store.read("TCS", "1y").iloc[-1:].copy()
+    bars["Close"] += 50
+    store.update("TCS", bars)
+    again = backtest_service.run_backtest("TCS", "1y", "ma_crossover")
+    assert again["summary"]["buyHoldReturn"] != first["summary"]["buyHoldReturn"]
+    backtest_cache.clear()
+
+def test_backtest_view_pages_trades_and_downsamples_curve():
+    from app.services.backtest_service import backtest_view
+    trades = [{"type": "BUY", "n": i} for i in range(45)]
+    curve = [{"date": str(i), "equity": 100.0 + i % 7, "price": 1.0} for i in range(300)]
+    full = {"success": True, "trades": trades, "equityCurve": curve}
+
+    last = backtest_view(full, points=60)
+    assert [t["n"] for t in last["trades"]] == list(range(25, 45))
+    assert last["tradeCount"] == 45 and last["tradeOffset"] == 25
+    assert len(last["equityCurve"]) == 60 and last["equityPoints"] == 300
+
+    page = backtest_view(full, points=0, trades_offset=40, trades_limit=10)
+    assert [t["n"] for t in page["trades"]] == list(range(40, 45))
+    assert page["equityCurve"] == curve
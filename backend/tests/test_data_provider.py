@@ -0,0 +1,59 @@
+import pandas as pd
+from app.services.data_provider.base import make_panel, panel_symbol
+from app.services.data_provider.mock_provider import MockProvider
+
+def test_make_panel_aligns_dates():
+    a = pd.DataFrame({"Close": [1.0, 2.0, 3.0], "Volume": [10, 20, 30]},
+                     index=pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]))
+    b = pd.DataFrame({"Close": [5.0, 6.0], "Volume": [50, 60]},
+                     index=pd.to_datetime(["2024-01-02", "2024-01-03"]))
+    panel = make_panel({"A": a, "B": b, "EMPTY": pd.DataFrame()})
+
+    assert len(panel) == 3
+    assert set(panel.columns.get_level_values(0)) == {"A", "B"}
+    assert panel_symbol(panel, "B")["Close"].tolist() == [5.0, 6.0]
+    assert panel_symbol(panel, "EMPTY").empty
+
+def test_mock_batch_history_matches_single_history():
+    provider = MockProvider()
+    panel = provider.get_batch_history(["TCS.NS", "INFY.NS"], period="1y")
+    single = provider.get_history("INFY.NS", period="1y")
+
+    # Mock dates are anchored on datetime.now(), so compare values only
+    assert panel_symbol(panel, "INFY.NS")["Close"].tolist() == single["Close"].tolist()
+
+def test_yfinance_batch_history_keeps_index_symbols_unsuffixed(monkeypatch):
+    from app.services.data_provider import yfinance_provider
+    requested = []
+
+    def download(tickers, **kwargs):
+        requested.extend(tickers.split())
+        index = pd.date_range("2024-01-01", periods=3, freq="D", tz="Asia/Kolkata")
+        columns = pd.MultiIndex.from_product([tickers.split(), ["Close"]])
+        return pd.DataFrame(1.0, index=index, columns=columns)
+
+    monkeypatch.setattr(yfinance_provider.yf, "download", download)
+    panel = yfinance_provider.YFinanceProvider().get_batch_history(["TCS", "^NSEI"], period="5d")
+    assert requested == ["TCS.NS", "^NSEI"]
+    assert not panel_symbol(panel, "^NSEI").empty
+
+def test_per_symbol_batch_history_takes_a_rate_token_per_request():
+    from app.utils.throttle import TokenBucket
+
+    class CountingBucket(TokenBucket):
+        taken = 0
+
+        def acquire(self, tokens=1, timeout=None):
+            self.taken += tokens
+            return super().acquire(tokens, timeout)
+
+    provider = MockProvider()
+    provider.rate_budget = CountingBucket(1000, 1000)
+    panel = provider.get_batch_history(["TCS.NS", "INFY.NS", "WIPRO.NS"], period="1mo")
+
+    assert provider.rate_budget.taken == 3
+    assert set(panel.columns.get_level_values(0)) == {"TCS.NS", "INFY.NS", "WIPRO.NS"}
+
+    # Single-symbol history (charts, AI, backtests) draws from the same budget
+    provider.get_history("TCS.NS", period="1mo")
+    assert provider.rate_budget.taken == 4
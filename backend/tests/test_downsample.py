@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from app.utils.downsample import lttb_indices, bucket_ohlcv
+
+def test_lttb_keeps_endpoints_and_extremes():
+    y = np.sin(np.linspace(0, 6, 1000)) * 10
+    y[437] = -80.0   # a one-bar drawdown trough stride sampling would miss
+    keep = lttb_indices(y, 50)
+
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+    assert 437 in keep
+    assert 437 not in np.arange(0, 1000, 1000 // 50)
+
+def test_lttb_returns_everything_for_short_series():
+    assert lttb_indices(np.arange(10.0), 50).tolist() == list(range(10))
+
+def test_bucket_ohlcv_merges_bars_into_candles():
+    index = pd.date_range("2024-01-01", periods=7, freq="D")
+    history = pd.DataFrame({
+        "Open": [1, 2, 3, 4, 5, 6, 7.0],
+        "High": [2, 9, 4, 5, 6, 7, 8.0],
+        "Low": [0, 1, 2, -3, 4, 5, 6.0],
+        "Close": [1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5],
+        "Volume": [10, 10, 10, 10, 10, 10, 10.0],
+    }, index=index)
+    candles = bucket_ohlcv(history, 3)
+
+    assert list(candles.index) == [index[0], index[3], index[6]]
+    assert candles["Open"].tolist() == [1, 4, 7]
+    assert candles["High"].tolist() == [9, 7, 8]
+    assert candles["Low"].tolist() == [0, -3, 6]
+    assert candles["Close"].tolist() == [3.5, 6.5, 7.5]
+    assert candles["Volume"].tolist() == [30, 30, 10]
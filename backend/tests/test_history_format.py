@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+from app.services.stock_service import _format_rows, _format_columnar
+
+def _bars(index):
+    close = np.linspace(100, 110, len(index))
+    close[2] = np.nan
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                         "Volume": np.arange(len(index)) * 1000.0}, index=index)
+
+def test_columnar_matches_rows():
+    index = pd.date_range("2024-01-01", periods=6, freq="B", tz="Asia/Kolkata")
+    history = _bars(index)
+    rows = _format_rows(history)
+    cols = _format_columnar(history, "1d")
+
+    assert cols["step"] == 86400 and cols["tz"] == "Asia/Kolkata"
+    for i, row in enumerate(rows):
+        ts = pd.Timestamp(cols["start"] + cols["t"][i] * cols["step"], unit="s", tz="UTC")
+        assert ts == pd.Timestamp(row["date"])
+        assert cols["close"][i] == round(row["close"], 4)
+        assert cols["volume"][i] == row["volume"]
+    # Weekend gap shows up as a jump in t, not a different step
+    assert cols["t"][:6] == [0, 1, 2, 3, 4, 7]
+
+def test_columnar_falls_back_to_seconds_for_irregular_bars():
+    index = pd.DatetimeIndex(["2024-01-01 09:15", "2024-01-01 10:00", "2024-01-01 11:00"])
+    cols = _format_columnar(_bars(index), "1h")
+    assert cols["step"] == 1
+    assert cols["t"] == [0, 2700, 6300]
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from app.utils.indicators import calculate_rsi, calculate_sma, calculate_macd, calculate_bollinger_bands
+from app.utils.panel_indicators import calculate_panel_indicators
+
+# Scalar reference rules for the scanner's signals and composite score
+def _rsi_signal(price, rsi, sma):
+    if price > sma and rsi < 30:
+        return 'Buy'
+    return 'Sell' if rsi > 70 or price < sma else 'Hold'
+
+def _macd_signal(macd, signal, prev_macd, prev_signal):
+    if prev_macd < prev_signal and macd > signal:
+        return 'Buy'
+    if prev_macd > prev_signal and macd < signal:
+        return 'Sell'
+    if macd > signal and macd > 0:
+        return 'Buy'
+    return 'Sell' if macd < signal and macd < 0 else 'Hold'
+
+def _bollinger_signal(price, lower, upper):
+    if price <= lower:
+        return 'Buy'
+    return 'Sell' if price >= upper else 'Hold'
+
+def _composite_score(signals):
+    weights = {'rsi': 0.3, 'macd': 0.3, 'ma': 0.2, 'bb': 0.2}
+    score = 50 + sum(20 * w * ((signals[k] == 'Buy') - (signals[k] == 'Sell')) for k, w in weights.items())
+    score = max(0, min(100, score))
+    if score >= 80: label = 'Strong Buy'
+    elif score >= 60: label = 'Buy'
+    elif score <= 20: label = 'Strong Sell'
+    elif score <= 40: label = 'Sell'
+    else: label = 'Hold'
+    return {"score": round(score, 0), "label": label}
+
+def _random_panel(n_bars=260, symbols=("A", "B", "C")):
+    rng = np.random.RandomState(7)
+    index = pd.date_range("2023-01-01", periods=n_bars, freq="D")
+    close = pd.DataFrame(
+        100 * np.cumprod(1 + rng.normal(0, 0.02, (n_bars, len(symbols))), axis=0),
+        index=index, columns=list(symbols)
+    )
+    volume = pd.DataFrame(rng.randint(1000, 5000, (n_bars, len(symbols))), index=index, columns=list(symbols))
+    return close, volume
+
+def test_panel_indicators_match_series_functions():
+    close, volume = _random_panel()
+    close.iloc[:40, 1] = np.nan          # B listed later
+    close.iloc[100:105, 2] = np.nan      # C suspended for a week
+
+    result = calculate_panel_indicators(close, volume)
+
+    for symbol in close.columns:
+        closes = close[symbol].dropna()
+        macd, signal, _ = calculate_macd(closes)
+        _, upper, lower = calculate_bollinger_bands(closes)
+        row = result.loc[symbol]
+
+        assert row['bars'] == len(closes)
+        assert np.isclose(row['rsi'], calculate_rsi(closes).iloc[-1])
+        assert np.isclose(row['sma50'], calculate_sma(closes, 50).iloc[-1])
+        assert np.isclose(row['macd'], macd.iloc[-1])
+        assert np.isclose(row['bb_upper'], upper.iloc[-1])
+
+        signals = {
+            'rsi': _rsi_signal(closes.iloc[-1], row['rsi'], row['sma50']),
+            'macd': _macd_signal(macd.iloc[-1], signal.iloc[-1], macd.iloc[-2], signal.iloc[-2]),
+            'bb': _bollinger_signal(closes.iloc[-1], lower.iloc[-1], upper.iloc[-1]),
+            'ma': 'Buy' if row['sma50'] > row['sma200'] else 'Sell',
+        }
+        assert row['signal_rsi'] == signals['rsi']
+        assert row['signal_macd'] == signals['macd']
+        assert row['signal_bb'] == signals['bb']
+        assert row['signal_ma'] == signals['ma']
+
+        composite = _composite_score(signals)
+        assert row['score'] == composite['score']
+        assert row['label'] == composite['label']
+
+def test_panel_indicators_short_history_reports_zero():
+    close, volume = _random_panel(n_bars=60)
+    result = calculate_panel_indicators(close, volume)
+    assert (result['sma200'] == 0).all()
+    assert (result['signal_ma'] == 'Buy').all()  # sma50 > 0 like the scalar path
@@ -0,0 +1,110 @@
+import pickle
+import threading
+import time
+import numpy as np
+import pandas as pd
+from app.services import compute_pool, job_service
+from app.services.compute_pool import SharedFrames, shared_frame, map_in_pool
+
+def _wait(job):
+    deadline = time.time() + 5
+    while job.status not in job_service.FINISHED and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+def test_shared_frames_round_trip_through_pickle():
+    index = pd.date_range("2024-01-01", periods=5, freq="D", tz="Asia/Kolkata")
+    df = pd.DataFrame({"Close": np.arange(5.0), "Volume": np.arange(5.0) * 10}, index=index)
+    with SharedFrames([df, pd.DataFrame()]) as shared:
+        ref = pickle.loads(pickle.dumps(shared.ref(0, stop=3)))
+        loaded = shared_frame(ref)
+        assert loaded.equals(df.iloc[:3])
+        assert str(loaded.index.tz) == "Asia/Kolkata"
+        assert shared_frame(shared.ref(1)).empty
+
+def test_job_reports_progress_and_result(monkeypatch):
+    monkeypatch.setattr(compute_pool, "get_compute_pool", lambda: None)
+    job = job_service.submit_job("square", map_in_pool, pow, [(i, 2) for i in range(5)])
+    _wait(job)
+    assert job.status == "done"
+    assert job.result == [0, 1, 4, 9, 16]
+    assert job.to_dict()["progress"] == {"done": 5, "total": 5, "percent": 100.0, "etaSeconds": None}
+
+def test_cancel_stops_job_between_tasks(monkeypatch):
+    monkeypatch.setattr(compute_pool, "get_compute_pool", lambda: None)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(i):
+        started.set()
+        release.wait(5)
+        return i
+
+    job = job_service.submit_job("slow", map_in_pool, slow, [(i,) for i in range(10)])
+    started.wait(5)
+    job_service.cancel_job(job.id)
+    release.set()
+    _wait(job)
+    assert job.status == "cancelled"
+    assert job.tasks_done == 1
+    assert job_service.get_job_stats()["jobs"]["cancelled"] >= 1
+
+def test_scan_job_streams_progress_and_partial_rows(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.api import jobs
+    from app.services import stock_service
+
+    symbols = [f"S{i}.NS" for i in range(5)]
+    monkeypatch.setitem(stock_service.active_stock_list, "symbols", symbols)
+    monkeypatch.setattr(stock_service, "HISTORY_BATCH_SIZE", 2)
+    monkeypatch.setattr(stock_service, "_scan_chunk", lambda chunk: [{"symbol": s[:-3]} for s in chunk])
+    monkeypatch.setattr(jobs, "JOB_EVENT_INTERVAL", 0.01)
+
+    job = job_service.submit_job("scan", stock_service.scan_stocks)
+    _wait(job)
+    assert job.status == "done"
+    assert sorted(row["symbol"] for row in job.partial) == ["S0", "S1", "S2", "S3", "S4"]
+    assert (job.tasks_done, job.tasks_total) == (5, 5)
+
+    app = FastAPI()
+    app.include_router(jobs.router)
+    client = TestClient(app)
+    partial = client.get(f"/api/jobs/{job.id}/partial", params={"offset": 3}).json()
+    assert partial["partialResults"] == 5 and len(partial["results"]) == 2
+
+    body = client.get(f"/api/jobs/{job.id}/events", headers={"Last-Event-ID": "4"}).text
+    assert "event: rows\nid: 5\n" in body
+    assert '"offset":4' in body
+    assert body.rstrip().splitlines()[-2] == "event: end"
+
+def test_job_cancelled_before_it_starts_is_finished():
+    job = job_service.Job("scan")
+    job._cancel.set()
+    job_service._run_job(job, pow, (2, 2), {})
+    assert job.status == "cancelled" and job.finished_at is not None
+    assert job.result is None
+
+def test_scan_job_shares_a_scan_already_running(monkeypatch):
+    from app.services import background_tasks
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def scan():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return [{"symbol": "TCS"}]
+
+    monkeypatch.setattr(background_tasks, "scan_stocks", scan)
+    scheduled = threading.Thread(target=background_tasks.scan_and_publish)
+    scheduled.start()
+    started.wait(5)
+    job = job_service.submit_job("scan", background_tasks.scan_and_publish)
+    time.sleep(0.05)
+    release.set()
+    scheduled.join(5)
+    _wait(job)
+    assert job.status == "done"
+    assert len(calls) == 1
+    assert [r["symbol"] for r in job.result.results] == ["TCS"]
@@ -0,0 +1,37 @@
+import numpy as np
+from app.utils.metrics import (
+    performance_metrics, max_drawdown_duration, position_from_fills, trade_excursions, rolling_returns
+)
+
+def test_drawdown_duration_counts_longest_underwater_run():
+    equity = np.array([100, 110, 105, 100, 108, 111, 109, 112.0])
+    assert max_drawdown_duration(equity) == 3
+    assert max_drawdown_duration(np.array([1.0, 2.0, 3.0])) == 0
+
+def test_sharpe_and_sortino_match_definition():
+    rng = np.random.RandomState(0)
+    returns = rng.normal(0.001, 0.01, 500)
+    equity = 100 * np.cumprod(np.concatenate([[1.0], 1 + returns]))
+    metrics = performance_metrics(equity, risk_free_rate=0.0)
+
+    r = equity[1:] / equity[:-1] - 1
+    assert metrics["sharpeRatio"] == round(r.mean() / r.std(ddof=1) * np.sqrt(252), 2)
+    downside = np.sqrt(np.mean(np.minimum(r, 0) ** 2))
+    assert metrics["sortinoRatio"] == round(r.mean() / downside * np.sqrt(252), 2)
+    assert set(metrics["rollingReturns"]) == {"1M", "3M", "6M", "1Y"}
+
+def test_position_and_excursions_from_fills():
+    held = position_from_fills(8, np.array([1, 5]), np.array([3, 8]))
+    assert held.tolist() == [False, True, True, False, False, True, True, True]
+
+    high = np.array([10, 10, 12, 11, 10, 10, 13, 10.0])
+    low = np.array([10, 10, 9, 10, 10, 10, 10, 8.0])
+    mae, mfe = trade_excursions(np.array([1, 5]), np.array([3, 7]), np.array([10.0, 10.0]), high, low)
+    assert np.allclose(mae, [-10.0, -20.0])
+    assert np.allclose(mfe, [20.0, 30.0])
+
+def test_rolling_returns_skip_windows_longer_than_curve():
+    equity = np.linspace(100, 130, 40)
+    result = rolling_returns(equity, {"1M": 21, "3M": 63})
+    assert list(result) == ["1M"]
+    assert result["1M"]["positivePct"] == 100.0
@@ -0,0 +1,81 @@
+import time
+import numpy as np
+import pandas as pd
+from app.services.ohlcv_store import OHLCVStore
+from app.services.data_provider.base import panel_symbol
+from app.services.data_provider.mock_provider import MockProvider
+from app.services.data_provider.stored_provider import StoredHistoryProvider
+
+class CountingProvider(MockProvider):
+    """Deterministic daily bars ending today; records every upstream request"""
+
+    def __init__(self):
+        self.calls = []
+
+    def _bars(self, period):
+        days = {"5d": 5, "1mo": 30, "1y": 365}[period]
+        end = pd.Timestamp.now(tz="Asia/Kolkata").normalize()
+        index = pd.date_range(end=end, periods=days, freq="D")
+        close = np.arange(len(index), dtype=float) + (index.dayofyear.to_numpy() * 10.0)
+        return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                             "Volume": np.full(len(index), 100.0)}, index=index)
+
+    def get_history(self, symbol, period="1y", interval="1d"):
+        self.calls.append((symbol, period))
+        return self._bars(period)
+
+def test_store_serves_repeat_requests_locally(tmp_path):
+    inner = CountingProvider()
+    provider = StoredHistoryProvider(inner, OHLCVStore(tmp_path, refresh_seconds=300))
+
+    first = provider.get_history("TCS", "1y")
+    second = provider.get_history("TCS", "1y")
+
+    assert inner.calls == [("TCS", "1y")]
+    assert len(first) == len(second) > 300
+    assert str(second.index.tz) == "Asia/Kolkata"
+    assert second["Close"].tolist() == first["Close"].tolist()
+
+def test_store_fetches_only_delta_after_refresh_window(tmp_path):
+    inner = CountingProvider()
+    store = OHLCVStore(tmp_path, refresh_seconds=300)
+    provider = StoredHistoryProvider(inner, store)
+    provider.get_history("TCS", "1y")
+
+    # Pretend the last refresh happened an hour ago, then reload from disk
+    store._meta["TCS"]["fetched_at"] = time.time() - 3600
+    restarted = OHLCVStore(tmp_path, refresh_seconds=300)
+    restarted._meta["TCS"] = store._meta["TCS"]
+    provider = StoredHistoryProvider(inner, restarted)
+
+    hist = provider.get_history("TCS", "1y")
+    assert inner.calls[-1] == ("TCS", "5d")
+    assert not hist.index.duplicated().any()
+
+def test_store_batch_history_groups_requests(tmp_path):
+    inner = CountingProvider()
+    provider = StoredHistoryProvider(inner, OHLCVStore(tmp_path))
+
+    panel = provider.get_batch_history(["A", "B"], "1y")
+    assert len(inner.calls) == 2
+    assert not panel_symbol(panel, "B").empty
+
+    provider.get_batch_history(["A", "B"], "1y")
+    assert len(inner.calls) == 2
+
+def test_naive_delta_merges_onto_aware_bars_by_trading_date(tmp_path):
+    store = OHLCVStore(tmp_path)
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=30, freq="D")
+    aware = pd.DataFrame({"Close": np.arange(30.0), "Volume": 1.0}, index=dates.tz_localize("Asia/Kolkata"))
+    store.update("TCS.NS", aware, span_days=30)
+
+    # A download delta: the same last 5 trading days, tz-naive midnight
+    delta = pd.DataFrame({"Close": np.arange(5.0) + 100, "Volume": 2.0}, index=dates[-5:])
+    store.update("TCS.NS", delta)
+
+    stored = store.read("TCS.NS", "1mo")
+    assert len(stored) == 30
+    assert str(stored.index.tz) == "Asia/Kolkata"
+    assert (stored.index == dates.tz_localize("Asia/Kolkata")).all()
+    assert stored["Close"].iloc[-5:].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert stored["Close"].iloc[0] == 0.0
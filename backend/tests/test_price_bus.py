@@ -0,0 +1,75 @@
+import asyncio
+import tempfile
+from pathlib import Path
+from app.services.price_bus import PriceBus, UnixSocketPriceBus
+
+async def _eventually(check, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not check() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+    return check()
+
+def _recorder(store):
+    async def handler(prices):
+        store.append(prices)
+    return handler
+
+def test_local_bus_delivers_to_own_handlers():
+    async def run():
+        bus, got = PriceBus(), []
+        bus.subscribe(_recorder(got))
+        assert await bus.elect()
+        await bus.publish({"TCS": 1.0})
+        return got
+    assert asyncio.run(run()) == [{"TCS": 1.0}]
+
+def test_unix_bus_elects_one_producer_and_fails_over():
+    async def run(path):
+        first, second = UnixSocketPriceBus(path, retry=0.05), UnixSocketPriceBus(path, retry=0.05)
+        got_first, got_second = [], []
+        first.subscribe(_recorder(got_first))
+        second.subscribe(_recorder(got_second))
+        await first.start()
+        await second.start()
+        assert first.is_producer and not await second.elect()
+
+        assert await _eventually(lambda: len(first._followers) == 1)
+        await first.publish({"TCS": 1.0})
+        assert await _eventually(lambda: got_second == [{"TCS": 1.0}])
+        assert got_first == [{"TCS": 1.0}]
+
+        # Producer goes away: the follower takes the lock and carries on
+        await first.stop()
+        assert await _eventually(lambda: second.is_producer)
+        await second.publish({"TCS": 2.0})
+        await second.stop()
+        return got_second
+
+    with tempfile.TemporaryDirectory() as tmp:
+        got = asyncio.run(run(str(Path(tmp) / "bus.sock")))
+    assert got == [{"TCS": 1.0}, {"TCS": 2.0}]
+
+def test_unix_bus_hands_scans_to_followers_only():
+    async def run(path):
+        first, second = UnixSocketPriceBus(path, retry=0.05), UnixSocketPriceBus(path, retry=0.05)
+        scans_first, scans_second, prices_second = [], [], []
+        first.subscribe_scans(_recorder(scans_first))
+        second.subscribe_scans(_recorder(scans_second))
+        second.subscribe(_recorder(prices_second))
+        await first.start()
+        await second.start()
+        assert await _eventually(lambda: len(first._followers) == 1)
+
+        # Far longer than asyncio's default line limit
+        scan = {"universe": "u", "marketStatus": "open", "results": [{"symbol": f"S{i}", "rsi": 50.0} for i in range(5000)]}
+        await first.publish_scan(scan)
+        await first.publish({"TCS": 1.0})
+        assert await _eventually(lambda: prices_second == [{"TCS": 1.0}])
+        await second.stop()
+        await first.stop()
+        return scans_first, scans_second
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scans_first, scans_second = asyncio.run(run(str(Path(tmp) / "bus.sock")))
+    assert scans_first == [] and len(scans_second) == 1
+    assert scans_second[0]["results"][-1] == {"symbol": "S4999", "rsi": 50.0}
@@ -0,0 +1,36 @@
+from app.services.price_scheduler import PollScheduler, clean_symbol, provider_symbol
+
+INTERVALS = {
+    "open": {"hot": 5, "cold": 30},
+    "closed": {"hot": 3600, "cold": 21600},
+}
+
+def test_hot_symbols_polled_more_often_while_open():
+    scheduler = PollScheduler(INTERVALS)
+    symbols = ["TCS", "INFY", "WIPRO"]
+
+    due = scheduler.plan("open", symbols, {"INFY"}, now=0)
+    assert due == ["INFY", "TCS", "WIPRO"]
+    scheduler.mark_polled(due, now=0)
+
+    assert scheduler.plan("open", symbols, {"INFY"}, now=4) == []
+    assert scheduler.next_delay(now=4) == 1
+    assert scheduler.plan("open", symbols, {"INFY"}, now=5) == ["INFY"]
+    assert scheduler.plan("open", symbols, {"INFY"}, now=30) == ["INFY", "TCS", "WIPRO"]
+
+def test_status_change_polls_everything_once_then_backs_off():
+    scheduler = PollScheduler(INTERVALS)
+    symbols = ["TCS", "INFY"]
+    scheduler.mark_polled(scheduler.plan("open", symbols, set(), now=0), now=0)
+
+    # Market closes: closing prices fetched once, then hourly at most
+    due = scheduler.plan("closed", symbols, {"TCS"}, now=10)
+    assert due == ["TCS", "INFY"]
+    scheduler.mark_polled(due, now=10)
+    assert scheduler.plan("closed", symbols, {"TCS"}, now=600) == []
+    assert scheduler.next_delay(now=600) == 3600 + 10 - 600
+
+def test_symbol_forms():
+    assert clean_symbol("reliance.NS") == "RELIANCE"
+    assert provider_symbol("RELIANCE") == "RELIANCE.NS"
+    assert provider_symbol("^NSEI") == "^NSEI"
@@ -0,0 +1,77 @@
+import threading
+import uuid
+from multiprocessing import shared_memory
+import pytest
+from app.utils.price_table import PriceTable, open_price_table
+
+def test_private_table_reads_like_a_dict():
+    table = PriceTable(capacity=2)
+    table.update({"TCS": 1.0, "INFY": 2.0})
+    table["TCS"] = 1.5
+    table["WIPRO"] = 3.0    # over capacity: not stored
+    assert dict(table) == table.snapshot() == {"TCS": 1.5, "INFY": 2.0}
+    assert "INFY" in table and "WIPRO" not in table
+    assert table.get("WIPRO", 0) == 0
+    assert table.updated_at("TCS") > 0
+
+def test_shared_table_single_writer_visible_to_other_handles():
+    name = f"test_prices_{uuid.uuid4().hex[:8]}"
+    writer = open_price_table(16, name)
+    reader = PriceTable(16, name)
+    try:
+        assert writer.shared and not reader.writer
+        writer.writer = True
+        writer.update({"TCS": 1.0})
+        assert reader["TCS"] == 1.0
+        writer.update({"TCS": 2.0, "INFY": 3.0})
+        assert reader.snapshot() == {"TCS": 2.0, "INFY": 3.0}
+        with pytest.raises(PermissionError):
+            reader.update({"TCS": 0.0})
+    finally:
+        reader.close()
+        writer.close()
+        shared_memory.SharedMemory(name=name).unlink()
+
+def test_snapshot_never_sees_a_partial_batch():
+    table = PriceTable(capacity=64)
+    symbols = [f"S{i}" for i in range(64)]
+    table.update({s: 0.0 for s in symbols})
+    stop = threading.Event()
+
+    def write():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            table.update({s: float(i) for s in symbols})
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    try:
+        for _ in range(500):
+            assert len(set(table.snapshot().values())) == 1
+    finally:
+        stop.set()
+        thread.join()
+
+def test_writer_that_died_mid_batch_does_not_stall_readers():
+    name = f"test_prices_{uuid.uuid4().hex[:8]}"
+    dead = PriceTable(16, name)
+    reader = PriceTable(16, name)
+    try:
+        dead.writer = True
+        dead.update({"TCS": 1.0})
+        assert reader.snapshot() == {"TCS": 1.0}
+        dead._header[0] += 1    # died between the opening and closing increments
+
+        # Readers serve their last consistent prices instead of waiting
+        assert reader["TCS"] == 1.0 and reader.snapshot() == {"TCS": 1.0}
+
+        # The next writer restores the parity when it takes over
+        reader.writer = True
+        reader.update({"TCS": 2.0})
+        assert int(reader._header[0]) % 2 == 0
+        assert reader["TCS"] == 2.0 and dead.snapshot() == {"TCS": 2.0}
+    finally:
+        reader.close()
+        dead.close()
+        shared_memory.SharedMemory(name=name).unlink()
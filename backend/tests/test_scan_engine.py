@@ -0,0 +1,47 @@
+import time
+from app.services.scan_engine import run_bounded
+from app.utils.throttle import TokenBucket
+
+def test_run_bounded_keeps_input_order():
+    def worker(n):
+        time.sleep(0.01 * (5 - n))  # later items finish first
+        return n * 10
+
+    assert run_bounded([0, 1, 2, 3, 4], worker, concurrency=5) == [0, 10, 20, 30, 40]
+
+def test_run_bounded_failures_and_timeouts_yield_none():
+    def worker(n):
+        if n == 1:
+            raise ValueError("boom")
+        if n == 2:
+            time.sleep(1.5)
+        return n
+
+    assert run_bounded([0, 1, 2, 3], worker, concurrency=4, timeout=0.3) == [0, None, None, 3]
+
+def test_run_bounded_hung_tasks_hand_their_slot_to_later_items():
+    def worker(n):
+        if n < 2:
+            time.sleep(1.5)
+        return n
+
+    start = time.monotonic()
+    assert run_bounded(list(range(6)), worker, concurrency=2, timeout=0.2, max_hung=2) == [None, None, 2, 3, 4, 5]
+    assert time.monotonic() - start < 1.0
+
+    # Past max_hung, items not yet started are given up instead of waiting
+    start = time.monotonic()
+    assert run_bounded([0, 1, 6], worker, concurrency=1, timeout=0.2, max_hung=1) == [None, None, None]
+    assert time.monotonic() - start < 1.0
+
+def test_run_bounded_runs_concurrently():
+    start = time.monotonic()
+    run_bounded(list(range(8)), lambda n: time.sleep(0.1), concurrency=8)
+    assert time.monotonic() - start < 0.5
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() > 0
+    assert bucket.acquire(timeout=0.5)
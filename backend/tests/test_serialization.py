@@ -0,0 +1,33 @@
+import gzip
+import numpy as np
+from fastapi import FastAPI, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+from app.utils.serialization import CachedPayload, payload_response, dumps
+
+def test_cached_payload_encodes_numpy_and_gzips_once():
+    payload = CachedPayload.encode([{"close": np.float64(1.5), "volume": np.int64(10)}] * 200)
+    assert payload.data()[0] == {"close": 1.5, "volume": 10}
+    assert gzip.decompress(payload.gzipped) == payload.body
+    assert payload.gzipped is payload.gzipped
+
+def test_sorted_dumps_is_stable():
+    assert dumps({"b": 1, "a": 2}, sort_keys=True) == dumps({"a": 2, "b": 1}, sort_keys=True)
+
+def test_payload_response_is_not_recompressed_by_middleware():
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    payload = CachedPayload.encode([{"date": "2024-01-01", "close": 100.0}] * 200)
+
+    @app.get("/history")
+    def history(request: Request):
+        return payload_response(request, payload)
+
+    client = TestClient(app)
+    zipped = client.get("/history", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.json() == payload.data()
+
+    plain = client.get("/history", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == payload.body
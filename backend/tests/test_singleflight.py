@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+from app.utils.singleflight import SingleFlight, AsyncSingleFlight
+
+def test_singleflight_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def slow_fetch(x):
+        calls.append(x)
+        time.sleep(0.2)
+        return x * 2
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow_fetch, 21)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == [21]
+    assert results == [42] * 5
+    assert flight.in_flight() == 0
+
+def test_singleflight_propagates_errors_and_retries():
+    flight = SingleFlight()
+
+    def boom():
+        raise ValueError("upstream down")
+
+    try:
+        flight.do("k", boom)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    assert flight.do("k", lambda: "ok") == "ok"
+
+def test_async_singleflight_shares_one_task():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def analyse(symbol):
+        calls.append(symbol)
+        await asyncio.sleep(0.05)
+        return {"symbol": symbol}
+
+    async def main():
+        return await asyncio.gather(*[flight.do("TCS", analyse, "TCS") for _ in range(4)])
+
+    results = asyncio.run(main())
+    assert calls == ["TCS"]
+    assert all(r == {"symbol": "TCS"} for r in results)
+    assert flight.in_flight() == 0
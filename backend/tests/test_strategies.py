@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+from app.utils.indicators import IndicatorCache, IndicatorRef
+from app.utils.strategies import STRATEGIES, Strategy, register_strategy, SMA50
+from app.services.backtest_service import build_strategy_frame, generate_signals, get_available_strategies
+
+def _hist(n=120):
+    index = pd.date_range("2024-01-01", periods=n, freq="D")
+    close = 100 + np.sin(np.arange(n) / 5.0) * 10
+    return pd.DataFrame({"Close": close}, index=index)
+
+def test_indicator_cache_shares_series():
+    cache = IndicatorCache(_hist()["Close"])
+    assert cache.get(SMA50) is cache.get(IndicatorRef('sma', (50,)))
+    assert cache.sma(50) is cache.get(SMA50)
+
+def test_registered_strategy_runs_through_backtest_engine():
+    register_strategy(Strategy(
+        id="above_sma",
+        name="Above SMA",
+        description="Hold while price is above its SMA",
+        params=("ma_fast",),
+        indicators=lambda p: {'MA': IndicatorRef('sma', (p['ma_fast'],))},
+        signals=lambda c, p: (c['Close'] > c['MA'], c['Close'] < c['MA']),
+        info=lambda value, p: f"MA: {value('MA'):.1f}",
+        title=lambda p: f"Above SMA ({p['ma_fast']})",
+    ))
+    try:
+        assert "above_sma" in [s["id"] for s in get_available_strategies()]
+        hist = _hist()
+        frame, name = build_strategy_frame(hist, "above_sma", {"ma_fast": 10})
+        assert name == "Above SMA (10)"
+        buy, sell = generate_signals(frame, "above_sma", {"ma_fast": 10})
+        ma = hist["Close"].rolling(10).mean().loc[frame.index]
+        assert np.array_equal(buy, (frame["Close"] > ma).to_numpy())
+        assert np.array_equal(sell, (frame["Close"] < ma).to_numpy())
+    finally:
+        STRATEGIES.pop("above_sma", None)
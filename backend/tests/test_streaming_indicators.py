@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from app.utils.indicators import (
+    calculate_rsi, calculate_ema, calculate_macd, calculate_bollinger_bands,
+    calculate_volume_ma
+)
+from app.utils.panel_indicators import calculate_panel_indicators
+from app.utils.streaming_indicators import (
+    StreamingEMA, StreamingRSI, StreamingMACD, RollingStats, SymbolIndicatorState
+)
+
+def _prices(n=300, seed=3):
+    rng = np.random.RandomState(seed)
+    return 1000 * np.cumprod(1 + rng.normal(0, 0.02, n)), rng.randint(1000, 9000, n).astype(float)
+
+def test_streaming_indicators_match_batch_series():
+    closes, volumes = _prices()
+    series = pd.Series(closes)
+    ema, rsi, macd = StreamingEMA(12), StreamingRSI(14), StreamingMACD()
+    bb, vol = RollingStats(20), RollingStats(20)
+
+    macd_line, signal_line, hist = calculate_macd(series)
+    _, upper, lower = calculate_bollinger_bands(series)
+    batch_rsi = calculate_rsi(series)
+    batch_vol = calculate_volume_ma(pd.Series(volumes))
+
+    for i, (close, volume) in enumerate(zip(closes, volumes)):
+        mean, std = bb.preview(close)
+        np.testing.assert_allclose(rsi.update(close), batch_rsi.iloc[i], rtol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(ema.update(close), calculate_ema(series).iloc[i], rtol=1e-12)
+        np.testing.assert_allclose(macd.update(close), (macd_line.iloc[i], signal_line.iloc[i], hist.iloc[i]), rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(mean + 2 * std, upper.iloc[i], rtol=1e-9, equal_nan=True)
+        np.testing.assert_allclose(vol.preview(volume)[0], batch_vol.iloc[i], rtol=1e-9, equal_nan=True)
+        bb.update(close)
+        vol.update(volume)
+
+def test_symbol_state_tracks_panel_engine_bar_by_bar():
+    closes, volumes = _prices()
+    dates = pd.date_range("2024-01-01", periods=len(closes)).date
+    state = SymbolIndicatorState.from_history(closes[:150], volumes[:150], dates[149])
+
+    for k in range(150, len(closes) + 1):
+        batch = calculate_panel_indicators(
+            pd.DataFrame({"X": closes[:k]}), pd.DataFrame({"X": volumes[:k]})
+        ).loc["X"]
+        snap = state.snapshot()
+        for key in ("rsi", "sma50", "sma200", "macd", "prev_macd", "bb_lower", "volume_ma", "score"):
+            assert np.isclose(snap[key], batch[key], rtol=1e-9), (k, key)
+        for key in ("signal_rsi", "signal_macd", "signal_bb", "signal_ma", "label"):
+            assert snap[key] == batch[key], (k, key)
+        if k < len(closes):
+            state.on_bar(closes[k], volumes[k], dates[k])
+
+def test_tick_replaces_forming_bar_close():
+    closes, volumes = _prices()
+    dates = pd.date_range("2024-01-01", periods=len(closes)).date
+    state = SymbolIndicatorState.from_history(closes, volumes, dates[-1])
+
+    state.on_tick(closes[-1] * 1.03, dates[-1])
+    ticked = closes.copy()
+    ticked[-1] *= 1.03
+    batch = calculate_panel_indicators(pd.DataFrame({"X": ticked}), pd.DataFrame({"X": volumes})).loc["X"]
+
+    assert state.bars == len(closes) - 1
+    assert np.isclose(state.snapshot()["rsi"], batch["rsi"])
+    assert state.recent_closes()[-1] == ticked[-1]
+
+def test_live_refresh_rolls_bars_only_on_open_ist_trading_days(monkeypatch):
+    from datetime import datetime
+    from app.services import stock_service
+    from app.utils.market_utils import IST
+
+    closes, volumes = _prices()
+    friday = datetime(2024, 3, 1, 15, 0, tzinfo=IST)
+    state = SymbolIndicatorState.from_history(closes, volumes, friday.date())
+    monkeypatch.setitem(stock_service.indicator_states, "XYZ", state)
+    monkeypatch.setitem(stock_service.cached_stock_data, "XYZ", {})
+
+    # Saturday and Monday pre-open prices update the forming bar in place
+    for now in (datetime(2024, 3, 2, 11, 0, tzinfo=IST), datetime(2024, 3, 4, 8, 0, tzinfo=IST)):
+        assert stock_service.refresh_live_technicals({"XYZ": 101.0}, now) == 1
+        assert state.bars == len(closes) - 1 and state.current_date == friday.date()
+
+    # Monday after the open starts a new bar
+    monday = datetime(2024, 3, 4, 9, 30, tzinfo=IST)
+    stock_service.refresh_live_technicals({"XYZ": 102.0}, monday)
+    assert state.bars == len(closes) and state.current_date == monday.date()
+    assert state.recent_closes()[-2:] == [101.0, 102.0]
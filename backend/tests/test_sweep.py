@@ -0,0 +1,60 @@
+import pytest
+from app.services import sweep_service, backtest_service
+from app.services.data_provider.mock_provider import MockProvider
+from app.services.sweep_service import expand_grid, run_parameter_sweep
+
+def test_expand_grid_ranges_and_skips_invalid_pairs():
+    names, grid = expand_grid("ma_crossover", {"ma_fast": {"start": 5, "stop": 15, "step": 5}, "ma_slow": [10, 20]})
+    assert names == ["ma_fast", "ma_slow"]
+    assert [(p["ma_fast"], p["ma_slow"]) for p in grid] == [(5, 10), (5, 20), (10, 20), (15, 20)]
+
+    _, grid = expand_grid("bollinger", {"bb_std": {"start": 1.0, "stop": 1.5, "step": 0.1}})
+    assert [p["bb_std"] for p in grid] == [1.0, 1.1, 1.2, 1.3, 1.4, 1.5]
+
+def test_expand_grid_rejects_huge_ranges_before_building_them():
+    with pytest.raises(ValueError, match="combinations"):
+        expand_grid("rsi_sma", {"rsi_oversold": {"start": 0, "stop": 1e12, "step": 1}})
+    with pytest.raises(ValueError, match="at least one value"):
+        expand_grid("rsi_sma", {"rsi_oversold": {"start": 40, "stop": 20}})
+
+def test_sweep_ranks_and_matches_single_backtest(monkeypatch):
+    hist = MockProvider().get_history("TCS.NS", period="1y")
+    load = lambda symbols, period="1y": {s: hist.copy() for s in symbols}
+    monkeypatch.setattr(sweep_service, "load_price_histories", load)
+    monkeypatch.setattr(backtest_service, "load_price_histories", load)
+
+    result = run_parameter_sweep("TCS.NS", "1y", "ma_crossover", 100000,
+                                 {"ma_fast": [5, 10, 20], "ma_slow": [30, 50]})
+    assert result["success"] and result["evaluated"] == 6
+    returns = [row["totalReturn"] for row in result["results"]]
+    assert returns == sorted(returns, reverse=True)
+
+    best = result["results"][0]
+    single = backtest_service.run_backtest("TCS.NS", "1y", "ma_crossover", 100000,
+                                           {**backtest_service.get_default_params(), **best["params"]})
+    assert single["summary"]["totalReturn"] == best["totalReturn"]
+
+    heatmap = result["heatmap"]
+    assert (heatmap["x"], heatmap["y"]) == ("ma_fast", "ma_slow")
+    assert len(heatmap["values"]) == 2 and len(heatmap["values"][0]) == 3
+    assert max(v for row in heatmap["values"] for v in row) == best["totalReturn"]
+
+def test_sweep_rejects_params_of_other_strategies():
+    result = run_parameter_sweep("TCS.NS", "1y", "rsi_sma", 100000, {"ma_fast": [5]})
+    assert not result["success"]
+
+def test_sweep_ranks_non_finite_metrics_last(monkeypatch):
+    hist = MockProvider().get_history("TCS.NS", period="1y")
+    monkeypatch.setattr(sweep_service, "load_price_histories", lambda symbols, period="1y": {s: hist for s in symbols})
+    sortino = {5: 1.5, 10: None, 20: 0.5, 30: 2.0}
+    monkeypatch.setattr(
+        sweep_service, "evaluate_params",
+        lambda hist, strategy, params, capital, indicators: {"sortinoRatio": sortino[params["ma_fast"]]}
+    )
+
+    result = run_parameter_sweep("TCS.NS", "1y", "ma_crossover", 100000,
+                                 {"ma_fast": [5, 10, 20, 30], "ma_slow": [50, 60]}, rank_by="sortinoRatio")
+    assert result["success"]
+    ranked = [row["sortinoRatio"] for row in result["results"]]
+    assert ranked == [2.0, 2.0, 1.5, 1.5, 0.5, 0.5, None, None]
+    assert result["heatmap"]["values"][0] == [1.5, None, 0.5, 2.0]
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from app.services.universe_backtest_service import position_state, simulate_portfolio
+
+def test_position_state_follows_single_symbol_rules():
+    buy = np.array([False, True, True, False, False, True, False])
+    sell = np.array([True, False, False, True, True, False, False])
+    # Sold at the close of bar 3, re-entered at bar 5 and still held at the end
+    assert position_state(buy, sell).tolist() == [False, True, True, False, False, True, True]
+
+def test_simulate_portfolio_equal_weights_and_contributions():
+    index = pd.date_range("2024-01-01", periods=4, freq="D")
+    close = pd.DataFrame({"A": [100.0, 110.0, 121.0, 121.0], "B": [50.0, 50.0, 45.0, 45.0]}, index=index)
+    held = pd.DataFrame({"A": [True, True, False, False], "B": [True, True, True, False]}, index=index)
+
+    sim = simulate_portfolio(close, held, 1000.0)
+    # Bar 1: 50/50 -> +5%; bar 2: 50/50 -> +10% * .5 - 10% * .5 = 0; bar 3: only B, flat
+    assert np.allclose(sim["equity"], [1000.0, 1050.0, 1050.0, 1050.0])
+    assert np.isclose(sim["pnl"].sum(), 50.0)
+    assert np.isclose(sim["pnl"][:, 0].sum(), 50.0 + 52.5)
+
+    capped = simulate_portfolio(close, held, 1000.0, position_size=0.25)
+    assert np.isclose(capped["equity"][1], 1025.0)
+
+def test_universe_equity_curve_is_lttb_downsampled(monkeypatch):
+    from app.services import universe_backtest_service
+    from app.services.data_provider.mock_provider import MockProvider
+    from app.utils.downsample import lttb_indices
+
+    hists = {s: MockProvider().get_history(s, period="1y") for s in ("TCS.NS", "INFY.NS")}
+    monkeypatch.setattr(universe_backtest_service, "universe_symbols", lambda halal_only: list(hists))
+    monkeypatch.setattr(universe_backtest_service, "load_price_histories", lambda symbols, period: hists)
+
+    full = universe_backtest_service.run_universe_backtest(points=0)
+    assert full["success"] and len(full["equityCurve"]) == full["equityPoints"]
+
+    result = universe_backtest_service.run_universe_backtest(points=40)
+    keep = lttb_indices([e["equity"] for e in full["equityCurve"]], 40)
+    assert result["equityCurve"] == [full["equityCurve"][i] for i in keep]
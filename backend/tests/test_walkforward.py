@@ -0,0 +1,40 @@
+from app.services import walkforward_service
+from app.services.data_provider.mock_provider import MockProvider
+from app.services.walkforward_service import make_windows, run_walk_forward
+
+def test_make_windows_rolls_by_test_length():
+    assert make_windows(300, 200, 50) == [(0, 200, 250), (50, 250, 300)]
+    # A short final test window is kept; no window without test bars
+    assert make_windows(260, 200, 50) == [(0, 200, 250), (50, 250, 260)]
+    assert make_windows(200, 200, 50) == []
+
+def test_walk_forward_picks_params_on_train_and_scores_test(monkeypatch):
+    hist = MockProvider().get_history("TCS.NS", period="1y")
+    monkeypatch.setattr(walkforward_service, "load_price_histories",
+                        lambda symbols, period="5y": {s: hist.copy() for s in symbols})
+
+    result = run_walk_forward("TCS.NS", "1y", "ma_crossover", 100000,
+                              {"ma_fast": [5, 10], "ma_slow": [20, 30]}, train_bars=120, test_bars=60)
+    assert result["success"]
+    windows = result["results"][0]["windows"]
+    assert len(windows) == len(make_windows(len(hist), 120, 60))
+    for window in windows:
+        assert window["testStart"] > window["trainEnd"]
+        assert set(window["params"]) == {"ma_fast", "ma_slow"}
+    assert result["results"][0]["summary"]["windows"] <= len(windows)
+
+def test_walk_forward_ranks_missing_metrics_last(monkeypatch):
+    hist = MockProvider().get_history("TCS.NS", period="1y")
+    monkeypatch.setattr(walkforward_service, "load_price_histories",
+                        lambda symbols, period="5y": {s: hist.copy() for s in symbols})
+    sortino = {5: None, 10: 0.5, 20: 1.5}
+    monkeypatch.setattr(
+        walkforward_service, "evaluate_params",
+        lambda hist, strategy, params, capital, indicators, start=None, end=None:
+            {"sortinoRatio": sortino[params["ma_fast"]], "totalReturn": 1.0}
+    )
+
+    result = run_walk_forward("TCS.NS", "1y", "ma_crossover", 100000, {"ma_fast": [5, 10, 20], "ma_slow": [50]},
+                              train_bars=120, test_bars=60, rank_by="sortinoRatio")
+    assert result["success"]
+    assert all(window["params"]["ma_fast"] == 20 for window in result["results"][0]["windows"])
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from app.services.websocket_manager import ConnectionManager
+
+class FakeSocket:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self):
+        pass
+
+def test_prices_filtered_per_subscription_and_serialized_per_group():
+    async def run():
+        manager = ConnectionManager()
+        a, b, c, everything = FakeSocket(), FakeSocket(), FakeSocket(), FakeSocket()
+        for ws in (a, b, c, everything):
+            await manager.connect(ws)
+        await manager.handle_message(a, json.dumps({"action": "subscribe", "symbols": ["tcs.NS", "INFY"]}))
+        await manager.handle_message(b, json.dumps({"action": "set", "symbols": ["INFY", "TCS"]}))
+        await manager.handle_message(c, json.dumps({"action": "subscribe", "symbols": ["WIPRO"]}))
+        await manager.handle_message(c, json.dumps({"action": "unsubscribe", "symbols": ["WIPRO"]}))
+
+        serialized = await manager.publish_prices({"TCS": 1.0, "INFY": 2.0, "RELIANCE": 3.0})
+        await asyncio.sleep(0.05)
+        return manager, serialized, a, b, c, everything
+
+    manager, serialized, a, b, c, everything = asyncio.run(run())
+    assert serialized == 3    # a and b share one payload
+    assert a.sent[0] == {"type": "subscribed", "symbols": ["INFY", "TCS"]}
+    assert a.sent[-1]["data"] == b.sent[-1]["data"] == {"TCS": 1.0, "INFY": 2.0}
+    assert [m["type"] for m in c.sent] == ["subscribed", "subscribed", "price_snapshot"]
+    assert c.sent[-1]["data"] == {}
+    assert everything.sent[-1]["data"] == {"TCS": 1.0, "INFY": 2.0, "RELIANCE": 3.0}
+    assert manager.stats()["subscriptions"] == 3
+
+def test_slow_client_gets_coalesced_prices_without_delaying_others():
+    async def run():
+        manager = ConnectionManager()
+        slow, fast = FakeSocket(delay=0.1), FakeSocket()
+        await manager.connect(slow)
+        await manager.connect(fast)
+        for i in range(5):
+            await manager.publish_prices({"TCS": float(i)})
+            await asyncio.sleep(0.01)
+        fast_done = len(fast.sent)
+        await asyncio.sleep(0.3)
+        return manager, slow, fast, fast_done
+
+    manager, slow, fast, fast_done = asyncio.run(run())
+    assert fast_done == 5     # connect snapshot (with the first prices) + 4 deltas
+    assert [m["seq"] for m in fast.sent] == [1, 2, 3, 4, 5]
+    assert len(slow.sent) < 5
+    assert slow.sent[-1]["data"] == {"TCS": 4.0}
+    assert manager.stats()["coalesced"] >= 1
+
+def test_deltas_carry_changes_with_sequence_and_resync_sends_snapshot():
+    async def run():
+        manager = ConnectionManager()
+        ws = FakeSocket()
+        await manager.connect(ws)
+        await asyncio.sleep(0.01)
+        await manager.publish_prices({"TCS": 1.0, "INFY": 2.0})
+        await asyncio.sleep(0.01)
+        unchanged = await manager.publish_prices({"TCS": 1.0, "INFY": 2.0})
+        await manager.publish_prices({"TCS": 1.5, "INFY": 2.0})
+        await asyncio.sleep(0.01)
+        await manager.handle_message(ws, json.dumps({"action": "resync"}))
+        await asyncio.sleep(0.01)
+        return ws, unchanged
+
+    ws, unchanged = asyncio.run(run())
+    assert unchanged == 0
+    assert [(m["type"], m["seq"], m["data"]) for m in ws.sent] == [
+        ("price_snapshot", 0, {}),
+        ("price_update", 1, {"TCS": 1.0, "INFY": 2.0}),
+        ("price_update", 2, {"TCS": 1.5}),
+        ("price_snapshot", 2, {"TCS": 1.5, "INFY": 2.0}),
+    ]
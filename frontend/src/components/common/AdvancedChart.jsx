@@ -38,32 +38,36 @@ const AdvancedChart = ({
         setError(null);
 
         try {
-            const res = await fetch(API.STOCK_HISTORY(symbol, period));
+            const res = await fetch(API.STOCK_HISTORY(symbol, period, 'columnar'));
             if (!res.ok) throw new Error('Failed to fetch data');
 
             const data = await res.json();
 
-            if (!Array.isArray(data) || data.length === 0) {
+            if (!data || !Array.isArray(data.t) || data.t.length === 0) {
                 setError('No data available');
                 setChartData([]);
                 return;
             }
 
-            // Transform data - lightweight-charts needs time as YYYY-MM-DD string
-            const transformed = data.map(d => {
-                const date = new Date(d.date);
+            // Columnar payload: bar i is at epoch second start + t[i] * step.
+            // lightweight-charts needs time as YYYY-MM-DD string
+            const transformed = [];
+            for (let i = 0; i < data.t.length; i++) {
+                const close = Number(data.close[i]) || 0;
+                if (close <= 0) continue;
+                const date = new Date((data.start + data.t[i] * data.step) * 1000);
                 const year = date.getFullYear();
                 const month = String(date.getMonth() + 1).padStart(2, '0');
                 const day = String(date.getDate()).padStart(2, '0');
-                return {
+                transformed.push({
                     time: `${year}-${month}-${day}`,
-                    open: Number(d.open) || 0,
-                    high: Number(d.high) || 0,
-                    low: Number(d.low) || 0,
-                    close: Number(d.close) || 0,
-                    volume: Number(d.volume) || 0,
-                };
-            }).filter(d => d.close > 0);
+                    open: Number(data.open[i]) || 0,
+                    high: Number(data.high[i]) || 0,
+                    low: Number(data.low[i]) || 0,
+                    close,
+                    volume: Number(data.volume[i]) || 0,
+                });
+            }
 
             // Remove duplicates (same date)
             const uniqueData = [];
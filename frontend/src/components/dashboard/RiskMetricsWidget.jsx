@@ -18,11 +18,11 @@ const RiskMetricsWidget = () => {
                         sharpeRatio: 0,
                         maxDrawdown: 0,
                         volatility: 0,
-                        beta: 0
+                        beta: null
                     });
                 }
             } catch {
-                setData({ sharpeRatio: 0, maxDrawdown: 0, volatility: 0, beta: 0 });
+                setData({ sharpeRatio: 0, maxDrawdown: 0, volatility: 0, beta: null });
             } finally {
                 setLoading(false);
             }
@@ -77,7 +77,7 @@ const RiskMetricsWidget = () => {
                             <Activity size={12} className="text-blue-400" />
                         </div>
                         <div className="text-xl font-mono text-white">
-                            {data?.beta}
+                            {data?.beta ?? '—'}
                         </div>
                         <div className="text-[10px] text-gray-500 mt-1">vs NIFTY 50</div>
                     </div>
@@ -8,9 +8,16 @@ import { ExportButton } from '../common';
 const TelegramButton = lazy(() => import('../settings/TelegramSettings').then(m => ({ default: m.TelegramButton })));
 const StockListButton = lazy(() => import('../settings/StockListSettings').then(m => ({ default: m.StockListButton })));
 
+// "Scanning 120/500 · ~30s" while a scan job reports progress
+const scanLabel = (progress) => {
+    if (!progress?.total) return 'Scanning...';
+    const eta = progress.etaSeconds != null ? ` · ~${Math.ceil(progress.etaSeconds)}s` : '';
+    return `Scanning ${progress.done}/${progress.total}${eta}`;
+};
+
 const Header = ({
     showHalalOnly, setShowHalalOnly,
-    isScanning, handleScan,
+    isScanning, scanProgress, handleScan,
     wsConnected, wsConnecting, lastUpdate,
     watchlistCount, onOpenWatchlist,
     telegramEnabled, onOpenTelegram,
@@ -126,7 +133,7 @@ const Header = ({
                         className="flex-1 sm:flex-none flex items-center justify-center gap-2 px-5 py-2.5 rounded-xl font-bold text-white shadow-lg transition-all transform hover:scale-105 active:scale-95 disabled:opacity-50 disabled:cursor-not-allowed bg-gradient-to-r from-emerald-600 to-teal-600 shadow-emerald-900/20"
                     >
                         {isScanning ? <RefreshCw className="w-4 h-4 animate-spin" /> : <Search className="w-4 h-4" />}
-                        <span>{isScanning ? 'Scanning...' : 'Scan'}</span>
+                        <span>{isScanning ? scanLabel(scanProgress) : 'Scan'}</span>
                     </button>
                 </div>
             </div>
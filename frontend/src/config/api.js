@@ -54,13 +54,19 @@ export const API = {
   STOCKS_UPLOAD: `${API_BASE}/api/stocks/upload`,
   STOCKS_RESET: `${API_BASE}/api/stocks/reset`,
   STOCKS_CUSTOM: `${API_BASE}/api/stocks/custom`,
-  STOCK_HISTORY: (symbol, period) => `${API_BASE}/api/stocks/history/${symbol}?period=${period}`,
+  STOCK_HISTORY: (symbol, period, format, points) =>
+    `${API_BASE}/api/stocks/history/${symbol}?period=${period}${format ? `&format=${format}` : ''}${points ? `&points=${points}` : ''}`,
 
   // Backtest endpoints
   BACKTEST: `${API_BASE}/api/backtest`,
   QUICK_BACKTEST: (symbol) => `${API_BASE}/api/backtest/${symbol}`,
   STRATEGIES: `${API_BASE}/api/strategies`,
 
+  // Background jobs
+  JOB_SCAN: `${API_BASE}/api/jobs/scan`,
+  JOB: (id) => `${API_BASE}/api/jobs/${id}`,
+  JOB_EVENTS: (id) => `${API_BASE}/api/jobs/${id}/events`,
+
   // Telegram endpoints
   TELEGRAM_CONFIG: `${API_BASE}/api/telegram/config`,
   TELEGRAM_TEST: `${API_BASE}/api/telegram/test`,
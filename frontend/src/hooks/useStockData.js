@@ -5,6 +5,7 @@ import { useToast } from '../components/common/Toast';
 export const useStockData = (useLiveMode = true) => {
     const [stocks, setStocks] = useState([]);
     const [isScanning, setIsScanning] = useState(false);
+    const [scanProgress, setScanProgress] = useState(null);
     const [wsConnected, setWsConnected] = useState(false);
     const [wsConnecting, setWsConnecting] = useState(false);
     const [lastUpdate, setLastUpdate] = useState(null);
@@ -12,9 +13,21 @@ export const useStockData = (useLiveMode = true) => {
     const [errorMsg, setErrorMsg] = useState('');
     
     const wsRef = useRef(null);
+    const seqRef = useRef(null);
     const reconnectTimeoutRef = useRef(null);
     const toast = useToast();
 
+    // Merge { SYMBOL: price } from a snapshot or delta into the stock list
+    const applyPrices = useCallback((message) => {
+        const prices = message.data || {};
+        if (!Object.keys(prices).length) return;
+        setLastUpdate(message.timestamp);
+        setPriceUpdates(prev => prev + 1);
+        setStocks(prevStocks => prevStocks.map(stock =>
+            stock.symbol in prices ? { ...stock, price: prices[stock.symbol] } : stock
+        ));
+    }, []);
+
     // WebSocket connection handler
     const connectWebSocket = useCallback(() => {
         if (wsRef.current && (wsRef.current.readyState === WebSocket.OPEN || wsRef.current.readyState === WebSocket.CONNECTING)) {
@@ -29,6 +42,7 @@ export const useStockData = (useLiveMode = true) => {
             wsRef.current = ws;
 
             ws.onopen = () => {
+                seqRef.current = null;
                 setWsConnected(true);
                 setWsConnecting(false);
                 setErrorMsg('');
@@ -41,27 +55,22 @@ export const useStockData = (useLiveMode = true) => {
                     if (message.type === 'initial') {
                         setStocks(message.data);
                     }
+                    else if (message.type === 'price_snapshot') {
+                        seqRef.current = message.seq;
+                        applyPrices(message);
+                    }
                     else if (message.type === 'price_update') {
-                        setLastUpdate(message.timestamp);
-                        setPriceUpdates(prev => prev + 1);
-
-                        setStocks(prevStocks => {
-                            const updatedStocks = [...prevStocks];
-                            if (Array.isArray(message.data)) {
-                                message.data.forEach(update => {
-                                    const stockIndex = updatedStocks.findIndex(s => s.symbol === update.symbol);
-                                    if (stockIndex !== -1) {
-                                        updatedStocks[stockIndex] = {
-                                            ...updatedStocks[stockIndex],
-                                            price: update.price,
-                                            priceChange: update.change,
-                                            priceChangePercent: update.changePercent
-                                        };
-                                    }
-                                });
-                            }
-                            return updatedStocks;
-                        });
+                        // Deltas: only changed symbols, numbered consecutively.
+                        // Until a snapshot arrives (null) or when already covered, skip
+                        if (seqRef.current === null || message.seq <= seqRef.current) return;
+                        if (message.seq !== seqRef.current + 1) {
+                            // Missed a delta: ask for a snapshot and wait for it
+                            seqRef.current = null;
+                            ws.send(JSON.stringify({ action: 'resync' }));
+                            return;
+                        }
+                        seqRef.current = message.seq;
+                        applyPrices(message);
                     }
                 } catch (err) {
                     console.error('[WS] Message parse error:', err);
@@ -93,7 +102,7 @@ export const useStockData = (useLiveMode = true) => {
             setErrorMsg('Failed to connect to WebSocket');
             setWsConnecting(false);
         }
-    }, [useLiveMode]);
+    }, [useLiveMode, applyPrices]);
 
     const disconnectWebSocket = useCallback(() => {
         if (reconnectTimeoutRef.current) {
@@ -115,11 +124,46 @@ export const useStockData = (useLiveMode = true) => {
         };
     }, [connectWebSocket, disconnectWebSocket]);
 
+    // Follow a scan job's event stream, showing rows as chunks complete
+    const streamScanJob = (jobId) => new Promise((resolve, reject) => {
+        const source = new EventSource(API.JOB_EVENTS(jobId));
+        let rows = [];
+
+        source.addEventListener('rows', (event) => {
+            rows = rows.concat(JSON.parse(event.data).rows);
+            setStocks(rows);
+        });
+        source.addEventListener('progress', (event) => {
+            setScanProgress(JSON.parse(event.data).progress);
+        });
+        source.addEventListener('end', (event) => {
+            source.close();
+            const job = JSON.parse(event.data);
+            if (job.status === 'done') resolve(job);
+            else reject(new Error(job.error || `Scan ${job.status}`));
+        });
+        source.onerror = () => {
+            // EventSource retries on its own (resuming from the last rows event);
+            // give up only once it has closed for good
+            if (source.readyState === EventSource.CLOSED) {
+                reject(new Error('Scan progress stream closed'));
+            }
+        };
+    });
+
     const handleScan = async () => {
         setIsScanning(true);
+        setScanProgress(null);
         setErrorMsg('');
 
         try {
+            const jobResponse = await fetch(API.JOB_SCAN, { method: 'POST' });
+            if (jobResponse.ok) {
+                const job = await jobResponse.json();
+                await streamScanJob(job.jobId);
+            }
+
+            // The finished job published a fresh snapshot: load it in list order
             const response = await fetch(API.SCAN);
             if (!response.ok) throw new Error('Failed to connect to backend');
 
@@ -135,12 +179,14 @@ export const useStockData = (useLiveMode = true) => {
             toast.error('Scan Failed', 'Could not connect to backend server');
         } finally {
             setIsScanning(false);
+            setScanProgress(null);
         }
     };
 
     return {
         stocks,
         isScanning,
+        scanProgress,
         wsConnected,
         wsConnecting,
         lastUpdate,
@@ -20,6 +20,7 @@ export const ScannerPage = ({
     stocks,
     displayedStocks, // Filtered list
     isScanning,
+    scanProgress,
     handleScan,
     wsConnected,
     wsConnecting,
@@ -90,6 +91,7 @@ export const ScannerPage = ({
                 showHalalOnly={showHalalOnly}
                 setShowHalalOnly={setShowHalalOnly}
                 isScanning={isScanning}
+                scanProgress={scanProgress}
                 handleScan={handleScan}
                 wsConnected={wsConnected}
                 wsConnecting={wsConnecting}